@@ -118,6 +118,9 @@ Q_CLUSTER = {
     'orm': 'default'
 }
 
+# number of pre-generated maps per map size and map type
+MAP_POOL_SIZE = 2
+
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
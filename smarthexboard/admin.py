@@ -1,8 +1,9 @@
 """admin module description"""
 from django.contrib import admin
 
-from smarthexboard.models import GameGenerationData, GameData
+from smarthexboard.models import MapPoolData, GameData, GameTurnData
 
 # Register your models here.
-admin.site.register(GameGenerationData)
+admin.site.register(MapPoolData)
 admin.site.register(GameData)
+admin.site.register(GameTurnData)
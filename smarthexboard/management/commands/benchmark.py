@@ -0,0 +1,155 @@
+import json
+import multiprocessing
+import random
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.core.management import BaseCommand, CommandError
+
+from smarthexboard.smarthexboardlib.game.ai.homeland import HomelandAI
+from smarthexboard.smarthexboardlib.game.ai.tactics import TacticalAI
+from smarthexboard.smarthexboardlib.game.baseTypes import HandicapType
+from smarthexboard.smarthexboardlib.game.cities import City
+from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
+from smarthexboard.smarthexboardlib.game.game import GameModel
+from smarthexboard.smarthexboardlib.game.generation import GameGenerator, UserInterfaceImpl
+from smarthexboard.smarthexboardlib.game.playerMechanics import DiplomaticAI
+from smarthexboard.smarthexboardlib.game.players import DangerPlotsAI
+from smarthexboard.smarthexboardlib.map.generation import MapOptions, MapGenerator
+from smarthexboard.smarthexboardlib.map.types import MapSize, MapType
+
+# subsystem => methods whose (inclusive) time is summed up
+SUBSYSTEMS = {
+	'tactical': [(TacticalAI, 'doTurn')],
+	'homeland': [(HomelandAI, 'doTurn')],
+	'diplomacy': [(DiplomaticAI, 'doTurn')],
+	'cities': [(City, 'doTurn')],
+	'danger': [(DangerPlotsAI, 'updateDanger')],
+	'sight': [(GameModel, 'sightAt'), (GameModel, 'concealAt')],
+}
+
+
+@contextmanager
+def measureSubsystems(durations: dict):
+	"""wraps the methods of SUBSYSTEMS while active - nested calls of the same subsystem are counted once"""
+	originals = []
+	depths = {name: 0 for name in SUBSYSTEMS.keys()}
+
+	def wrap(name, method):
+		def wrapper(*args, **kwargs):
+			depths[name] += 1
+			start = time.perf_counter()
+			try:
+				return method(*args, **kwargs)
+			finally:
+				depths[name] -= 1
+				if depths[name] == 0:
+					durations[name] += time.perf_counter() - start
+
+		return wrapper
+
+	for name, methods in SUBSYSTEMS.items():
+		for cls, methodName in methods:
+			method = cls.__dict__[methodName]
+			originals.append((cls, methodName, method))
+			setattr(cls, methodName, wrap(name, method))
+
+	try:
+		yield
+	finally:
+		for cls, methodName, method in originals:
+			setattr(cls, methodName, method)
+
+
+def peakMemory() -> int:
+	"""
+		peak resident set size of the process in KB - it never decreases, so each map size is measured in its own
+		process (see benchmarkInProcess)
+	"""
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def benchmarkInProcess(mapSize: MapSize, turns: int, seed: int) -> dict:
+	"""runs benchmark in a new (forked) process, so that the peak memory only belongs to this map size"""
+	with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('fork')) as executor:
+		return executor.submit(benchmark, mapSize, turns, seed).result()
+
+
+def benchmark(mapSize: MapSize, turns: int, seed: int) -> dict:
+	start = time.perf_counter()
+	options = MapOptions(mapSize=mapSize, mapType=MapType.continents, leader=LeaderType.alexander, seed=seed)
+	mapModel = MapGenerator(options).generate(lambda state: None)
+
+	random.seed(seed)
+	gameModel = GameGenerator().generate(mapModel, HandicapType.chieftain)
+	gameModel.userInterface = UserInterfaceImpl()
+	generationDuration = time.perf_counter() - start
+
+	humanPlayer = gameModel.humanPlayer()
+	durations = {name: 0.0 for name in SUBSYSTEMS.keys()}
+	turnDurations = []
+
+	with measureSubsystems(durations):
+		lastTurn = gameModel.currentTurn
+		turnStart = time.perf_counter()
+
+		while len(turnDurations) < turns:
+			gameModel.update()
+
+			# the human does nothing - only the ai players act
+			if humanPlayer.isTurnActive():
+				humanPlayer.setProcessedAutoMovesTo(True)
+				humanPlayer.setEndTurnTo(True, gameModel)
+				humanPlayer.finishTurn()
+
+			if gameModel.currentTurn != lastTurn:
+				now = time.perf_counter()
+				turnDurations.append(now - turnStart)
+				lastTurn = gameModel.currentTurn
+				turnStart = now
+
+	return {
+		'mapSize': mapSize.value,
+		'seed': seed,
+		'players': len(gameModel.players),
+		'generation': generationDuration,
+		'turns': turnDurations,
+		'subsystems': durations,
+		'peakMemory': peakMemory()
+	}
+
+
+class Command(BaseCommand):
+	help = "Measure full turns of all ai players on generated maps of each map size"
+
+	def add_arguments(self, parser):
+		parser.add_argument('--turns', type=int, default=5)
+		parser.add_argument('--seed', type=int, default=42)
+		sizes = [mapSize.value for mapSize in list(MapSize)]
+		parser.add_argument('--sizes', nargs='+', choices=sizes, default=sizes)
+		parser.add_argument('--json', type=str, default=None, help='file for the results (to compare runs)')
+
+	def handle(self, **options):
+		if options['turns'] < 1:
+			raise CommandError('--turns needs to be at least 1')
+
+		results = []
+
+		for mapSizeName in options['sizes']:
+			mapSize = MapSize(mapSizeName)
+			result = benchmarkInProcess(mapSize, options['turns'], options['seed'])
+			results.append(result)
+
+			turns = result['turns']
+			print(f'{mapSize.title()}: {result["players"]} players, generation {result["generation"]:.2f}s, '
+				  f'{len(turns)} turns {sum(turns):.2f}s ({sum(turns) / len(turns):.2f}s per turn), '
+				  f'peak memory {result["peakMemory"] / 1024:.0f} MB')
+			print(f'   turns: {", ".join(f"{duration:.2f}s" for duration in turns)}')
+			for name, duration in result['subsystems'].items():
+				print(f'   {name}: {duration:.2f}s')
+
+		if options['json'] is not None:
+			with open(options['json'], 'w') as file:
+				json.dump(results, file, indent=2)
@@ -0,0 +1,50 @@
+import timeit
+from contextlib import contextmanager
+
+from django.core.management import BaseCommand
+
+from smarthexboard.smarthexboardlib.game.buildings import BuildingType
+from smarthexboard.smarthexboardlib.game.unitTypes import UnitType
+from smarthexboard.smarthexboardlib.map.types import TerrainType, FeatureType, ResourceType, YieldType
+
+ACCESSORS = [
+	('TerrainType.yields', TerrainType, lambda: TerrainType.grass.yields()),
+	('TerrainType.hillsYieldChange', TerrainType, lambda: TerrainType.plains.hillsYieldChange(YieldType.food)),
+	('TerrainType.domain', TerrainType, lambda: TerrainType.ocean.domain()),
+	('FeatureType.yields', FeatureType, lambda: FeatureType.forest.yields()),
+	('ResourceType.yields', ResourceType, lambda: ResourceType.wheat.yields()),
+	('UnitType.moves', UnitType, lambda: UnitType.warrior.moves()),
+	('UnitType.sight', UnitType, lambda: UnitType.scout.sight()),
+	('BuildingType.productionCost', BuildingType, lambda: BuildingType.library.productionCost()),
+]
+
+
+@contextmanager
+def uncachedData(enumType):
+	"""builds the data objects of enumType on every call (like before the memoization)"""
+	memoized = enumType.__dict__['_data']
+	enumType._data = memoized.__wrapped__
+
+	try:
+		yield
+	finally:
+		enumType._data = memoized
+
+
+class Command(BaseCommand):
+	help = "Compare the enum accessors with and without the memoized data objects"
+
+	def add_arguments(self, parser):
+		parser.add_argument('--number', type=int, default=20000)
+
+	def handle(self, **options):
+		number = options['number']
+
+		for title, enumType, accessor in ACCESSORS:
+			with uncachedData(enumType):
+				uncachedDuration = timeit.timeit(accessor, number=number)
+
+			cachedDuration = timeit.timeit(accessor, number=number)
+
+			print(f'{title}: {uncachedDuration * 1e6 / number:.2f}us -> {cachedDuration * 1e6 / number:.2f}us '
+				  f'({uncachedDuration / cachedDuration:.0f}x)')
@@ -0,0 +1,48 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from django.core.management import BaseCommand
+
+from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
+from smarthexboard.smarthexboardlib.map.generation import MapOptions, MapGenerator
+from smarthexboard.smarthexboardlib.map.types import MapSize, MapType
+
+
+def benchmark(mapSize: MapSize, seed: int, executor: Optional[ProcessPoolExecutor]):
+	stages = []
+	lastTime = time.perf_counter()
+
+	def callbackFunc(state):
+		nonlocal lastTime
+		now = time.perf_counter()
+		# the duration of a stage ends with the state that announces it
+		stages.append((str(state.message), now - lastTime))
+		lastTime = now
+
+	options = MapOptions(mapSize=mapSize, mapType=MapType.continents, leader=LeaderType.trajan, seed=seed)
+	start = time.perf_counter()
+	MapGenerator(options, executor=executor).generate(callbackFunc)
+	duration = time.perf_counter() - start
+
+	print(f'{mapSize.title()}: {duration:.2f}s')
+	for message, stageDuration in stages[1:]:
+		print(f'   {message}: {stageDuration:.3f}s')
+
+
+class Command(BaseCommand):
+	help = "Measure the time of the map generation stages per map size"
+
+	def add_arguments(self, parser):
+		parser.add_argument('--seed', type=int, default=42)
+		parser.add_argument('--workers', type=int, default=0, help='processes for the independent stages')
+
+	def handle(self, **options):
+		executor = ProcessPoolExecutor(max_workers=options['workers']) if options['workers'] > 0 else None
+
+		try:
+			for mapSize in list(MapSize):
+				benchmark(mapSize, options['seed'], executor)
+		finally:
+			if executor is not None:
+				executor.shutdown()
@@ -0,0 +1,54 @@
+import random
+import time
+
+from django.core.management import BaseCommand
+
+from smarthexboard.smarthexboardlib.map.path_finding.finder import AStarPathfinder, MoveTypeIgnoreUnitsOptions, \
+	MoveTypeIgnoreUnitsPathfinderDataSource
+from smarthexboard.smarthexboardlib.map.path_finding.hierarchical import PathHierarchy
+from smarthexboard.smarthexboardlib.map.types import MapSize, TerrainType, FeatureType, UnitMovementType
+from smarthexboard.tests.test_utils import MapModelMock
+
+
+def benchmark(mapSize: MapSize, queries: int, clusterSize: int):
+	random.seed(42)
+	mapModel = MapModelMock(mapSize, TerrainType.grass)
+	for point in mapModel.points():
+		value = random.random()
+		if value < 0.12:
+			mapModel.modifyTerrainAt(point, TerrainType.ocean)
+		elif value < 0.25:
+			mapModel.modifyFeatureAt(point, FeatureType.forest)
+
+	landPoints = [point for point in mapModel.points() if mapModel.tileAt(point).isLand()]
+	routes = [(random.choice(landPoints), random.choice(landPoints)) for _ in range(queries)]
+
+	options = MoveTypeIgnoreUnitsOptions(ignore_sight=True, can_embark=False, can_enter_ocean=False)
+	datasource = MoveTypeIgnoreUnitsPathfinderDataSource(mapModel, UnitMovementType.walk, None, options)
+	hierarchicalDatasource = MoveTypeIgnoreUnitsPathfinderDataSource(mapModel, UnitMovementType.walk, None, options)
+	hierarchicalDatasource.hierarchy = PathHierarchy(mapModel, clusterSize)
+
+	for title, finder in [('A*', AStarPathfinder(datasource)), ('HPA*', AStarPathfinder(hierarchicalDatasource))]:
+		expansions = 0
+		cost = 0.0
+		start = time.perf_counter()
+
+		for fromPoint, toPoint in routes:
+			path = finder.shortestPath(fromPoint, toPoint)
+			expansions += finder.expansions
+			cost += path.cost() if path is not None else 0.0
+
+		duration = time.perf_counter() - start
+		print(f'{mapSize.title()} {title}: {expansions} expansions, path costs {cost:.0f}, {duration:.2f}s')
+
+
+class Command(BaseCommand):
+	help = "Compare the expanded nodes of A* and hierarchical A* on random routes"
+
+	def add_arguments(self, parser):
+		parser.add_argument('--queries', type=int, default=200)
+		parser.add_argument('--cluster-size', type=int, default=10)
+
+	def handle(self, **options):
+		for mapSize in [MapSize.small, MapSize.standard]:
+			benchmark(mapSize, options['queries'], options['cluster_size'])
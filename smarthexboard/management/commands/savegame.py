@@ -0,0 +1,54 @@
+import random
+import time
+
+from django.core.management import BaseCommand
+
+from smarthexboard.smarthexboardlib.game.baseTypes import HandicapType
+from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
+from smarthexboard.smarthexboardlib.game.generation import GameGenerator
+from smarthexboard.smarthexboardlib.map.generation import MapOptions, MapGenerator
+from smarthexboard.smarthexboardlib.map.types import MapSize, MapType
+from smarthexboard.smarthexboardlib.serialisation.binary import GameModelCodec, BinaryCompression, BinaryCodecError
+from smarthexboard.smarthexboardlib.serialisation.game import GameModelSchema
+
+
+def benchmark(mapSize: MapSize):
+	random.seed(42)
+	options = MapOptions(mapSize=mapSize, mapType=MapType.continents, leader=LeaderType.trajan)
+	mapModel = MapGenerator(options).generate(lambda state: None)
+	gameModel = GameGenerator().generate(mapModel, HandicapType.chieftain)
+
+	start = time.perf_counter()
+	content = GameModelSchema().dumps(gameModel)
+	encodeDuration = time.perf_counter() - start
+
+	start = time.perf_counter()
+	GameModelSchema().loads(content)
+	decodeDuration = time.perf_counter() - start
+
+	print(f'{mapSize.title()} json: {len(content)} bytes, encode {encodeDuration:.3f}s, decode {decodeDuration:.3f}s')
+
+	for title, compression in [('zlib', BinaryCompression.zlib), ('zstd', BinaryCompression.zstd)]:
+		try:
+			codec = GameModelCodec(compression)
+		except BinaryCodecError as e:
+			print(f'{mapSize.title()} {title}: {e}')
+			continue
+
+		start = time.perf_counter()
+		content = codec.dumps(gameModel)
+		encodeDuration = time.perf_counter() - start
+
+		start = time.perf_counter()
+		codec.loads(content)
+		decodeDuration = time.perf_counter() - start
+
+		print(f'{mapSize.title()} {title}: {len(content)} bytes, encode {encodeDuration:.3f}s, decode {decodeDuration:.3f}s')
+
+
+class Command(BaseCommand):
+	help = "Compare size and encode / decode time of the json and the binary save format per map size"
+
+	def handle(self, **options):
+		for mapSize in list(MapSize):
+			benchmark(mapSize)
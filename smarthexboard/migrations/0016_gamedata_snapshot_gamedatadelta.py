@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('smarthexboard', '0015_gamedata_delete_gamedatamodel_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamedata',
+            name='sequence',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gamedata',
+            name='snapshot',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.CreateModel(
+            name='GameDataDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.IntegerField()),
+                ('content', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deltas', to='smarthexboard.gamedata')),
+            ],
+            options={
+                'ordering': ['game', 'sequence'],
+                'constraints': [models.UniqueConstraint(fields=('game', 'sequence'), name='unique_delta_sequence')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('smarthexboard', '0016_gamedata_snapshot_gamedatadelta'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameTurnData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(choices=[('OP', 'Open'), ('RU', 'Running'), ('RE', 'Ready')], default='OP', max_length=2)),
+                ('player', models.CharField(default='', max_length=100)),
+                ('phase', models.CharField(default='', max_length=20)),
+                ('progress', models.FloatField(default=0.0)),
+                ('current_turn', models.IntegerField(default=0)),
+                ('current_player', models.CharField(default='', max_length=100)),
+                ('human_active', models.BooleanField(default=False)),
+                ('game', models.BinaryField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.CheckConstraint(condition=models.Q(('state__in', ['OP', 'RU', 'RE'])), name='valid_turn_state')],
+            },
+        ),
+    ]
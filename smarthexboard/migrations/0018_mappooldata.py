@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('smarthexboard', '0017_gameturndata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MapPoolData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('map_size', models.CharField(max_length=20)),
+                ('map_type', models.CharField(max_length=20)),
+                ('content', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.DeleteModel(
+            name='GameGenerationData',
+        ),
+        migrations.AddIndex(
+            model_name='mappooldata',
+            index=models.Index(fields=['map_size', 'map_type'], name='smarthexboa_map_siz_cabd38_idx'),
+        ),
+    ]
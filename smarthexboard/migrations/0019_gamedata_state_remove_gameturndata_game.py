@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('smarthexboard', '0018_mappooldata'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='gameturndata',
+            name='game',
+        ),
+        migrations.AddField(
+            model_name='gamedata',
+            name='state',
+            field=models.BinaryField(null=True),
+        ),
+    ]
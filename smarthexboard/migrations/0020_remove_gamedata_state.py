@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('smarthexboard', '0019_gamedata_state_remove_gameturndata_game'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='gamedata',
+            name='state',
+        ),
+    ]
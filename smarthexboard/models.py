@@ -2,7 +2,7 @@
 import uuid
 
 from django.db import models
-from django.db.models import CheckConstraint, Q
+from django.db.models import CheckConstraint, Q, UniqueConstraint
 
 
 class GameGenerationState(models.TextChoices):
@@ -11,25 +11,50 @@ class GameGenerationState(models.TextChoices):
 	READY = 'RE', 'Ready'
 
 
-class GameGenerationData(models.Model):
-	game = models.CharField(max_length=500000)
+class MapPoolData(models.Model):
+	"""Represents a pre-generated map that is used for the next game with this map size and map type."""
+	map_size = models.CharField(max_length=20)  # MapSize
+	map_type = models.CharField(max_length=20)  # MapType
+	content = models.BinaryField()  # GameModelCodec.dumpsMap
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	objects = models.Manager()
+
+	def __str__(self):
+		return f'{self.id}, {self.map_size}, {self.map_type}'
+
+	class Meta:
+		indexes = [
+			models.Index(fields=['map_size', 'map_type'])
+		]
+
+
+class GameTurnData(models.Model):
+	"""Represents the (background) processing of the AI turns of a game - the id is the id of the game."""
 	state = models.CharField(
 		max_length=2,
 		choices=GameGenerationState.choices,
 		default=GameGenerationState.OPEN,
 	)
+	player = models.CharField(max_length=100, default='')  # player that is currently processed
+	phase = models.CharField(max_length=20, default='')  # TurnPhase that is currently processed
 	progress = models.FloatField(default=0.0)
+	# result of the processing
+	current_turn = models.IntegerField(default=0)
+	current_player = models.CharField(max_length=100, default='')
+	human_active = models.BooleanField(default=False)
+	updated_at = models.DateTimeField(auto_now=True)
 
 	objects = models.Manager()
 
 	def __str__(self):
-		return f'{self.id}, {self.state}, {self.progress}'
+		return f'{self.id}, {self.state}, {self.player}, {self.phase}, {self.progress}'
 
 	class Meta:
 		constraints = [
 			CheckConstraint(
 				condition=Q(state__in=GameGenerationState.values),
-				name="valid_state"
+				name="valid_turn_state"
 			)
 		]
 
@@ -37,7 +62,9 @@ class GameGenerationData(models.Model):
 class GameData(models.Model):
 	"""Represents a game instance."""
 	name = models.CharField(max_length=100)
-	content = models.CharField(max_length=500000)
+	content = models.CharField(max_length=500000)  # json of GameModelSchema (games stored before snapshots)
+	snapshot = models.BinaryField(null=True)  # GameModelCodec
+	sequence = models.IntegerField(default=0)  # sequence number of the last delta
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
@@ -55,3 +82,22 @@ class GameData(models.Model):
 
 	def __str__(self):
 		return self.name
+
+
+class GameDataDelta(models.Model):
+	"""Represents the changes of a game since the previous delta / the snapshot."""
+	game = models.ForeignKey(GameData, on_delete=models.CASCADE, related_name='deltas')
+	sequence = models.IntegerField()
+	content = models.BinaryField()  # GameModelCodec.dumpsDelta
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	objects = models.Manager()  # Default manager
+
+	def __str__(self):
+		return f'{self.game_id}, {self.sequence}'
+
+	class Meta:
+		ordering = ['game', 'sequence']
+		constraints = [
+			UniqueConstraint(fields=['game', 'sequence'], name="unique_delta_sequence")
+		]
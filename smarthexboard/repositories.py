@@ -1,33 +1,267 @@
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 
 from django.core.cache import cache
+from django.db import transaction
+
+from setup.settings import MAP_POOL_SIZE, Q_CLUSTER
 from .smarthexboardlib.game.game import GameModel
+from .smarthexboardlib.map.map import MapModel
+from .smarthexboardlib.map.types import MapSize, MapType
+from .smarthexboardlib.serialisation.binary import GameModelCodec, SaveState, SavedGame, BinaryCodecError
 from .smarthexboardlib.serialisation.game import GameModelSchema
 
-from smarthexboard.models import GameData
+from smarthexboard.models import GameData, GameDataDelta, GameGenerationState, MapPoolData
 
+logger = logging.getLogger(__name__)
 
-class GameDataRepository:
-	# https://docs.djangoproject.com/en/4.2/topics/cache/
-	cache_timeout = 600  # in seconds = 5 minutes
-	size_limit = 5 * 1024 * 1024
 
-	# cache methods
+class GameStoreMetrics:
+	"""counters of the hot game store"""
+
+	def __init__(self):
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.residentBytes = 0
+
+	def to_dict(self) -> dict:
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'evictions': self.evictions,
+			'resident_bytes': self.residentBytes
+		}
+
+
+class _GameStoreEntry:
+	def __init__(self, gameModel: GameModel, size: int):
+		self.gameModel = gameModel
+		self.size = size
+		self.dirty = False
+		self.storedAt = time.monotonic()  # last write to the database
+		self.version: Optional[str] = None  # version of the database row the game is based on (see versionOf)
+
+
+class _GameStoreLock:
+	"""
+		reentrant lock of one game of a GameStore (context manager)
+
+		the store only keeps the lock of a game while a thread holds or waits for it
+	"""
+
+	def __init__(self, store: 'GameStore', game_id: int):
+		self._store = store
+		self._game_id = game_id
+
+	def __enter__(self):
+		self._store._acquire(self._game_id)
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self._store._release(self._game_id)
 
-	@staticmethod
-	def _cacheKey(game_id) -> str:
-		return f"game_{game_id}"
+
+class GameStore:
+	"""
+		process-local store of live GameModel objects
+
+		the games are evicted in least recently used order if there are more than max_games games or the estimated
+		resident size exceeds max_bytes. Changed games are written to the database later (write-behind) by the
+		flush callback. Games that leave the store (evicted or unloaded) are written by the unload callback.
+	"""
+
+	def __init__(self, max_games: int, max_bytes: int, flush, unload):
+		self.max_games = max_games
+		self.max_bytes = max_bytes
+		self.metrics = GameStoreMetrics()
+		self._flush = flush  # (game_id, gameModel) -> None
+		self._unload = unload  # (game_id, gameModel) -> None
+		self._entries: OrderedDict[int, _GameStoreEntry] = OrderedDict()
+		self._locks: dict[int, threading.RLock] = dict()
+		self._lockUsers: dict[int, int] = dict()  # number of threads that hold or wait for the lock of a game
+		self._mutex = threading.RLock()
 
 	@staticmethod
-	def _fetchFromCache(game_id: str) -> Optional[GameModel]:
-		return cache.get(GameDataRepository._cacheKey(game_id))
+	def estimatedSize(gameModel: GameModel) -> int:
+		"""
+			estimated memory of a loaded game - measured with tracemalloc on generated duel and small games during
+			the first 30 turns: ~1.7 kB per tile, ~6 kB per unit and ~96 kB per city (buildings, districts, yields and
+			the ai of the city)
+		"""
+		mapModel = gameModel._map
+		return mapModel.width * mapModel.height * 1700 + len(mapModel._units) * 6 * 1024 + \
+			len(mapModel._cities) * 96 * 1024
+
+	def lock(self, game_id: int) -> _GameStoreLock:
+		"""the lock that serializes the mutations of one game"""
+		return _GameStoreLock(self, game_id)
+
+	def _acquire(self, game_id: int):
+		with self._mutex:
+			lock = self._locks.get(game_id)
+			if lock is None:
+				lock = threading.RLock()
+				self._locks[game_id] = lock
+
+			self._lockUsers[game_id] = self._lockUsers.get(game_id, 0) + 1
+
+		lock.acquire()
+
+	def _release(self, game_id: int):
+		with self._mutex:
+			self._locks[game_id].release()
+			self._lockUsers[game_id] -= 1
+
+			if self._lockUsers[game_id] == 0:
+				# unused - the next user creates a new lock
+				del self._locks[game_id]
+				del self._lockUsers[game_id]
+
+	def get(self, game_id: int) -> Optional[GameModel]:
+		with self._mutex:
+			entry = self._entries.get(game_id)
+			if entry is None:
+				self.metrics.misses += 1
+				return None
+
+			self._entries.move_to_end(game_id)
+			self.metrics.hits += 1
+			return entry.gameModel
+
+	def peek(self, game_id: int) -> Optional[GameModel]:
+		"""the game without counting it as use"""
+		with self._mutex:
+			entry = self._entries.get(game_id)
+			return entry.gameModel if entry is not None else None
+
+	def contains(self, game_id: int) -> bool:
+		with self._mutex:
+			return game_id in self._entries
+
+	def put(self, game_id: int, gameModel: GameModel, dirty: bool = False, version: Optional[str] = None):
+		with self._mutex:
+			entry = self._entries.pop(game_id, None)
+			if entry is not None:
+				self.metrics.residentBytes -= entry.size
+				dirty = dirty or (entry.dirty and entry.gameModel is gameModel)
+				version = version if version is not None else entry.version
+
+			entry = _GameStoreEntry(gameModel, self.estimatedSize(gameModel))
+			entry.dirty = dirty
+			entry.version = version
+			self._entries[game_id] = entry
+			self.metrics.residentBytes += entry.size
+
+		self._evict(keep=game_id)
+
+	def dirtyFor(self, game_id: int, olderThan: float) -> Optional[GameModel]:
+		"""the game if it was changed and not written to the database for olderThan seconds"""
+		with self._mutex:
+			entry = self._entries.get(game_id)
+			if entry is None or not entry.dirty or time.monotonic() - entry.storedAt < olderThan:
+				return None
+
+			return entry.gameModel
+
+	def markStored(self, game_id: int, gameModel: GameModel):
+		with self._mutex:
+			entry = self._entries.get(game_id)
+			if entry is not None and entry.gameModel is gameModel:
+				entry.dirty = False
+				entry.storedAt = time.monotonic()
+
+	def versionOf(self, game_id: int) -> Optional[str]:
+		"""version of the database row that the game of the store is based on - None if unknown"""
+		with self._mutex:
+			entry = self._entries.get(game_id)
+			return entry.version if entry is not None else None
+
+	def setVersion(self, game_id: int, gameModel: GameModel, version: str):
+		with self._mutex:
+			entry = self._entries.get(game_id)
+			if entry is not None and entry.gameModel is gameModel:
+				entry.version = version
+
+	def flush(self, game_id: Optional[int] = None):
+		"""writes the changed games (or only the game with game_id) to the database"""
+		with self._mutex:
+			game_ids = list(self._entries.keys()) if game_id is None else [game_id]
+
+		for loop_game_id in game_ids:
+			with self.lock(loop_game_id):
+				gameModel = self.dirtyFor(loop_game_id, olderThan=0.0)
+				if gameModel is not None:
+					self._flush(loop_game_id, gameModel)
+					self.markStored(loop_game_id, gameModel)
+
+	def unload(self, game_id: Optional[int] = None):
+		"""removes the games (or only the game with game_id) and writes them to the database"""
+		with self._mutex:
+			game_ids = list(self._entries.keys()) if game_id is None else [game_id]
+
+		for loop_game_id in game_ids:
+			with self.lock(loop_game_id):
+				with self._mutex:
+					entry = self._entries.pop(loop_game_id, None)
+					if entry is None:
+						continue
+
+					self.metrics.residentBytes -= entry.size
+
+				self._unload(loop_game_id, entry.gameModel)
+
+	def remove(self, game_id: int):
+		"""removes the game without writing it to the database"""
+		with self._mutex:
+			entry = self._entries.pop(game_id, None)
+			if entry is not None:
+				self.metrics.residentBytes -= entry.size
+
+	def clear(self):
+		with self._mutex:
+			self._entries.clear()
+			self.metrics = GameStoreMetrics()
+
+	def _evict(self, keep: int):
+		while True:
+			with self._mutex:
+				if len(self._entries) <= self.max_games and self.metrics.residentBytes <= self.max_bytes:
+					return
+
+				candidates = [game_id for game_id in self._entries.keys() if game_id != keep]
+				if len(candidates) == 0:
+					return
+
+				game_id = candidates[0]
+
+			with self.lock(game_id):
+				with self._mutex:
+					entry = self._entries.pop(game_id, None)
+					if entry is None:
+						continue
+
+					self.metrics.residentBytes -= entry.size
+					self.metrics.evictions += 1
+
+				self._unload(game_id, entry.gameModel)
+
+
+class GameDataRepository:
+	size_limit = 5 * 1024 * 1024
+	compaction_interval = 25  # number of deltas after which a new snapshot is written
+	write_behind_interval = 5.0  # in seconds - changed games are written to the database at most this often
+	hotStore: GameStore = None  # created below the class
+	version_timeout = 24 * 60 * 60  # in seconds - games without a known version are reloaded from the database
+
+	# cache methods
 
 	@staticmethod
-	def _storeToCache(game_id: str, gameModel: GameModel):
-		if gameModel is None:
-			raise Exception("GameModel is None")
-		if not isinstance(gameModel, GameModel):
-			raise Exception(f"GameModel is not an instance of GameModel: {type(gameModel)}")
+	def _cacheKey(game_id) -> int:
 		if game_id is None:
 			raise Exception("Game ID is None")
 		if isinstance(game_id, str):
@@ -38,28 +272,97 @@ class GameDataRepository:
 		if not isinstance(game_id, int):
 			raise Exception(f"Game ID is not an integer: {type(game_id)}")
 
-		cache.set(GameDataRepository._cacheKey(game_id), gameModel, GameDataRepository.cache_timeout)
+		return game_id
+
+	@staticmethod
+	def _versionKey(game_id) -> str:
+		return f'smarthexboard.game.version.{GameDataRepository._cacheKey(game_id)}'
+
+	@staticmethod
+	def _publishVersion(game_id, gameModel: GameModel, version: str):
+		"""tells the other processes that the database row of the game changed"""
+		cache.set(GameDataRepository._versionKey(game_id), version, timeout=GameDataRepository.version_timeout)
+		GameDataRepository.hotStore.setVersion(GameDataRepository._cacheKey(game_id), gameModel, version)
+
+	@staticmethod
+	def _fetchFromCache(game_id: str) -> Optional[GameModel]:
+		GameDataRepository._removeStale(game_id)
+		return GameDataRepository.hotStore.get(GameDataRepository._cacheKey(game_id))
+
+	@staticmethod
+	def _removeStale(game_id: str):
+		"""
+			removes the game from the hot store if another process wrote it to the database since it was loaded or
+			stored by this process (e.g. the background processing of the ai turns) - the version of the game is
+			shared via the cache, so that the check does not need the database
+		"""
+		key = GameDataRepository._cacheKey(game_id)
+		with GameDataRepository.hotStore.lock(key):
+			if not GameDataRepository.hotStore.contains(key):
+				return
+
+			version = cache.get(GameDataRepository._versionKey(key))
+			if version is None or version != GameDataRepository.hotStore.versionOf(key):
+				logger.info(f'game {game_id} was changed by another process - reloading it')
+				GameDataRepository.hotStore.remove(key)
+
+	@staticmethod
+	def _storeToCache(game_id: str, gameModel: GameModel, dirty: bool = False, version: Optional[str] = None):
+		if gameModel is None:
+			raise Exception("GameModel is None")
+		if not isinstance(gameModel, GameModel):
+			raise Exception(f"GameModel is not an instance of GameModel: {type(gameModel)}")
+
+		GameDataRepository.hotStore.put(GameDataRepository._cacheKey(game_id), gameModel, dirty=dirty, version=version)
 
 	# database methods
 
 	@staticmethod
 	def _fetchFromDatabase(game_id: str) -> Optional[GameModel]:
-		print(f'_fetchFromDatabase: {game_id}')
+		gameModel, _ = GameDataRepository._fetchVersionFromDatabase(game_id)
+		return gameModel
+
+	@staticmethod
+	def _fetchVersionFromDatabase(game_id: str) -> (Optional[GameModel], Optional[str]):
+		"""the game and the version of its database row"""
+		logger.debug(f'loading game {game_id} from the database')
 		try:
 			game_data = GameData.objects.get(id=game_id)
 		except GameData.DoesNotExist:
-			print(f'_fetchFromDatabase: {game_id} not found in database')
-			return None
+			logger.info(f'game {game_id} not found in database')
+			return None, None
 
-		db_content = game_data.content
+		version = game_data.updated_at.isoformat()
+		knownVersion = cache.get(GameDataRepository._versionKey(game_data.id))
+		if knownVersion is None or knownVersion < version:  # iso timestamps of the same time zone sort by time
+			cache.set(GameDataRepository._versionKey(game_data.id), version, timeout=GameDataRepository.version_timeout)
 
-		# print(f'_fetchFromDatabase: {db_content}')
+		if game_data.snapshot is None:
+			# games stored before snapshots - the json document does not have the sight sources of the tiles
+			gameModel = GameModelSchema().loads(game_data.content)
+			gameModel.rebuildSight()
+			return gameModel, version
 
-		obj = GameModelSchema().loads(db_content)
-		return obj
+		return GameDataRepository._openSavedGame(game_data).gameModel(), version
+
+	@staticmethod
+	def _openSavedGame(game_data: GameData) -> SavedGame:
+		"""the last snapshot with the deltas since"""
+		savedGame = GameModelCodec().open(bytes(game_data.snapshot))
+		for delta in game_data.deltas.order_by('sequence'):
+			savedGame.applyDelta(bytes(delta.content))
+
+		return savedGame
 
 	@staticmethod
 	def _storeToDatabase(game_id: Optional[str], gameModel: GameModel) -> str:
+		"""
+			writes the changes of the game to the database (as delta or snapshot)
+
+			@param game_id: id of the game or None for new games
+			@param gameModel: game to write
+			@return: id of the game
+		"""
 		if gameModel is None:
 			raise Exception("GameModel is None")
 
@@ -73,21 +376,48 @@ class GameDataRepository:
 			except GameData.DoesNotExist:
 				pass
 
-		json_str = GameModelSchema().dumps(gameModel)
+		codec = GameModelCodec()
+		state: Optional[SaveState] = getattr(gameModel, 'saveState', None)  # games cached before save states
 
-		# print(f'_storeToDatabase: {json_str}')
+		# only the changes since the last save are written if the game continues the stored state
+		if obj is not None and obj.snapshot is not None and state is not None and state.sequence == obj.sequence \
+			and obj.sequence < GameDataRepository.compaction_interval:
+			delta = codec.dumpsDelta(gameModel, state)
 
-		if len(json_str) > GameDataRepository.size_limit:
-			raise Exception(f'Cannot store game - game data is more than 5 MB: {len(json_str)}')
+			if delta is not None:
+				with transaction.atomic():
+					GameDataDelta.objects.create(game=obj, sequence=state.sequence, content=delta)
+					obj.sequence = state.sequence
+					obj.save(update_fields=['sequence', 'updated_at'])
 
-		if obj is None:
-			if game_id is None:
-				game_id = GameData.objects.create(name='name', content=json_str).id
+				GameDataRepository._publishVersion(obj.id, gameModel, obj.updated_at.isoformat())
+
+			return game_id
+
+		# full snapshot (compaction of the deltas)
+		snapshotState = SaveState()
+		snapshot = codec.dumps(gameModel, snapshotState)
+
+		if len(snapshot) > GameDataRepository.size_limit:
+			raise Exception(f'Cannot store game - game data is more than 5 MB: {len(snapshot)}')
+
+		gameModel.saveState = snapshotState
+
+		with transaction.atomic():
+			if obj is None:
+				if game_id is None:
+					obj = GameData.objects.create(name='name', content='', snapshot=snapshot)
+					game_id = obj.id
+				else:
+					obj = GameData.objects.create(id=game_id, name='name', content='', snapshot=snapshot)
 			else:
-				GameData.objects.create(id=game_id, name='name', content=json_str)
-		else:
-			obj.content = json_str
-			obj.save()
+				obj.deltas.all().delete()
+				obj.content = ''
+				obj.snapshot = snapshot
+				obj.sequence = 0
+				obj.save()
+
+		GameDataRepository._publishVersion(obj.id, gameModel, obj.updated_at.isoformat())
 
 		return game_id
 
@@ -107,33 +437,180 @@ class GameDataRepository:
 		if game_id is None:
 			return False
 
-		return cache.get(GameDataRepository._cacheKey(game_id), None) is not None
+		try:
+			return GameDataRepository.hotStore.contains(GameDataRepository._cacheKey(game_id))
+		except Exception:
+			return False
 
 	# public methods
 
 	@staticmethod
 	def inCacheOrDB(game_id: str) -> bool:
-		return GameDataRepository._inDB(game_id) or GameDataRepository._inCache(game_id)
+		return GameDataRepository._inCache(game_id) or GameDataRepository._inDB(game_id)
+
+	@staticmethod
+	def lock(game_id: str) -> _GameStoreLock:
+		"""lock that needs to be held while a game is fetched, changed and stored"""
+		return GameDataRepository.hotStore.lock(GameDataRepository._cacheKey(game_id))
 
 	@staticmethod
 	def fetch(game_id: str) -> Optional[GameModel]:
 		obj = GameDataRepository._fetchFromCache(game_id)
 
 		if obj is None:
-			obj: Optional[GameModel] = GameDataRepository._fetchFromDatabase(game_id)
+			obj, version = GameDataRepository._fetchVersionFromDatabase(game_id)
 
 			if obj is None:
 				return None
 
-			GameDataRepository._storeToCache(game_id, obj)
-		else:
-			cache.touch(game_id, GameDataRepository.cache_timeout)
+			GameDataRepository._storeToCache(game_id, obj, version=version)
 
 		return obj
 
 	@staticmethod
 	def store(game_id: Optional[str], obj: GameModel) -> str:
-		game_id = GameDataRepository._storeToDatabase(game_id, obj)
-		GameDataRepository._storeToCache(game_id, obj)
+		if game_id is None or not GameDataRepository.inCacheOrDB(game_id):
+			# new games are written immediately - they need an id
+			game_id = GameDataRepository._storeToDatabase(game_id, obj)
+			version = cache.get(GameDataRepository._versionKey(game_id))
+			GameDataRepository._storeToCache(game_id, obj, version=version)
+			GameDataRepository.hotStore.markStored(GameDataRepository._cacheKey(game_id), obj)
+			return game_id
+
+		# write-behind: the database is only updated if the last write is old enough
+		key = GameDataRepository._cacheKey(game_id)
+		GameDataRepository._storeToCache(game_id, obj, dirty=True)
+		if GameDataRepository.hotStore.dirtyFor(key, olderThan=GameDataRepository.write_behind_interval) is not None:
+			GameDataRepository.hotStore.flush(key)
 
 		return game_id
+
+	@staticmethod
+	def fetchUncached(game_id: str) -> Optional[GameModel]:
+		"""
+			loads the game from the database without keeping it in the hot store - for processes that change the game
+			while the web processes released it (e.g. the background tasks, see release)
+		"""
+		return GameDataRepository._fetchFromDatabase(game_id)
+
+	@staticmethod
+	def storeUncached(game_id: Optional[str], obj: GameModel) -> str:
+		"""writes the game to the database without keeping it in the hot store (see fetchUncached)"""
+		return GameDataRepository._storeToDatabase(game_id, obj)
+
+	@staticmethod
+	def flush(game_id: Optional[str] = None):
+		"""writes the changed games (or the game with game_id) of the hot store to the database"""
+		GameDataRepository.hotStore.flush(None if game_id is None else GameDataRepository._cacheKey(game_id))
+
+	@staticmethod
+	def release(game_id: str, flush: bool = True):
+		"""
+			removes the game from the hot store, e.g. while it is changed by another process
+
+			@param game_id: id of the game
+			@param flush: write the changes of the game to the database before
+		"""
+		key = GameDataRepository._cacheKey(game_id)
+		if flush:
+			GameDataRepository.hotStore.unload(key)
+		else:
+			GameDataRepository.hotStore.remove(key)
+
+	@staticmethod
+	def metrics() -> dict:
+		return GameDataRepository.hotStore.metrics.to_dict()
+
+
+GameDataRepository.hotStore = GameStore(
+	max_games=16,
+	max_bytes=512 * 1024 * 1024,
+	flush=lambda game_id, gameModel: GameDataRepository._storeToDatabase(str(game_id), gameModel),
+	unload=lambda game_id, gameModel: GameDataRepository._storeToDatabase(str(game_id), gameModel)
+)
+atexit.register(GameDataRepository.hotStore.unload)
+
+
+class GameGenerationRepository:
+	"""
+		progress of the game generations - kept in the cache, so that the generation does not write to the database
+		until the game is ready
+	"""
+	timeout = 60 * 60  # in seconds
+
+	@staticmethod
+	def _statusKey(game_id) -> str:
+		return f'smarthexboard.generation.{GameDataRepository._cacheKey(game_id)}'
+
+	@staticmethod
+	def storeStatus(game_id: str, state: GameGenerationState, progress: float):
+		cache.set(
+			GameGenerationRepository._statusKey(game_id),
+			{'state': state.value, 'progress': progress},
+			timeout=GameGenerationRepository.timeout
+		)
+
+	@staticmethod
+	def fetchStatus(game_id: str) -> Optional[dict]:
+		"""
+			@return: dict with state (GameGenerationState) and progress or None if there is no generation of the game
+		"""
+		status = cache.get(GameGenerationRepository._statusKey(game_id))
+		if status is None:
+			return None
+
+		return {'state': GameGenerationState(status['state']), 'progress': status['progress']}
+
+	@staticmethod
+	def clearStatus(game_id: str):
+		cache.delete(GameGenerationRepository._statusKey(game_id))
+
+
+class MapPoolRepository:
+	"""pre-generated maps per map size and map type"""
+	refill_timeout = Q_CLUSTER['timeout']  # in seconds - a refill that did not finish by then can be started again
+
+	@staticmethod
+	def count(mapSize: MapSize, mapType: MapType) -> int:
+		return MapPoolData.objects.filter(map_size=mapSize.value, map_type=mapType.value).count()
+
+	@staticmethod
+	def store(mapSize: MapSize, mapType: MapType, mapModel: MapModel):
+		content = GameModelCodec().dumpsMap(mapModel)
+		MapPoolData.objects.create(map_size=mapSize.value, map_type=mapType.value, content=content)
+
+	@staticmethod
+	def _refillKey(mapSize: MapSize, mapType: MapType) -> str:
+		return f'smarthexboard.map_pool.refill.{mapSize.value}.{mapType.value}'
+
+	@staticmethod
+	def startRefill(mapSize: MapSize, mapType: MapType) -> bool:
+		"""
+			@return: True if the caller needs to refill the pool - False if the pool is full or already refilled
+		"""
+		if MapPoolRepository.count(mapSize, mapType) >= MAP_POOL_SIZE:
+			return False
+
+		# atomic: only one refill per map size and map type
+		return cache.add(MapPoolRepository._refillKey(mapSize, mapType), True, timeout=MapPoolRepository.refill_timeout)
+
+	@staticmethod
+	def finishRefill(mapSize: MapSize, mapType: MapType):
+		cache.delete(MapPoolRepository._refillKey(mapSize, mapType))
+
+	@staticmethod
+	def take(mapSize: MapSize, mapType: MapType) -> Optional[MapModel]:
+		"""removes the oldest map of the pool and returns it - None if the pool is empty"""
+		pool = MapPoolData.objects.filter(map_size=mapSize.value, map_type=mapType.value)
+
+		while True:
+			map_pool_data = pool.order_by('created_at').first()
+			if map_pool_data is None:
+				return None
+
+			# only one process gets the map
+			if MapPoolData.objects.filter(id=map_pool_data.id).delete()[0] == 1:
+				try:
+					return GameModelCodec().loadsMap(bytes(map_pool_data.content))
+				except BinaryCodecError:
+					logger.warning(f'dropped map of the pool in an unknown format: {map_pool_data.id}')
@@ -1,30 +1,42 @@
-from smarthexboard.models import GameGenerationData, GameGenerationState
+from django_q.tasks import async_task
+
+from setup.settings import MAP_POOL_SIZE
+from smarthexboard.models import GameGenerationState, GameTurnData
+from smarthexboard.repositories import GameDataRepository, GameGenerationRepository, MapPoolRepository
 from smarthexboard.smarthexboardlib.game.baseTypes import HandicapType
 from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
 from smarthexboard.smarthexboardlib.game.generation import GameGenerator, UserInterfaceImpl
 from smarthexboard.smarthexboardlib.map.generation import MapOptions, MapGenerator
 from smarthexboard.smarthexboardlib.map.types import MapSize, MapType
-from smarthexboard.smarthexboardlib.serialisation.game import GameModelSchema
 
 
 def generate_game(game_id: int, leader: LeaderType, handicap: HandicapType, mapSize: MapSize, mapType: MapType):
+	"""
+		generates the game - the progress is reported via the GameGenerationRepository (cache) and the game
+		is written to the database once it is ready. a pre-generated map of the pool is used if available.
+	"""
 	def callbackFunc(state):
 		print(f'Progress: {state.value} - {state.message} - {game_id}')
-		# write state to db
-		map_generation_callback_obj = GameGenerationData.objects.filter(id=game_id).first()
-		map_generation_callback_obj.state = GameGenerationState.RUNNING
-		map_generation_callback_obj.progress = state.value
-		map_generation_callback_obj.save()
-		print(f'saved state: MapGenerationState.RUNNING')
+		GameGenerationRepository.storeStatus(game_id, GameGenerationState.RUNNING, state.value)
 
 	print(f'start creating map: {game_id}')
-	game_generation_obj = GameGenerationData(id=game_id, game='', state=GameGenerationState.OPEN, progress=0.0)
-	game_generation_obj.save()
+	GameGenerationRepository.storeStatus(game_id, GameGenerationState.RUNNING, 0.0)
+
+	mapModel = MapPoolRepository.take(mapSize, mapType)
+
+	if mapModel is not None:
+		print(f'using map of the pool: {mapSize}, {mapType}')
+		mapModel.assignHumanLeader(leader)
+		GameGenerationRepository.storeStatus(game_id, GameGenerationState.RUNNING, 0.9)
+	else:
+		options = MapOptions(mapSize=mapSize, mapType=mapType, leader=leader)
+		generator = MapGenerator(options)
 
-	options = MapOptions(mapSize=mapSize, mapType=mapType, leader=leader)
-	generator = MapGenerator(options)
+		mapModel = generator.generate(callbackFunc)
 
-	mapModel = generator.generate(callbackFunc)
+	# refill the pool in the background (once)
+	if MapPoolRepository.startRefill(mapSize, mapType):
+		async_task("smarthexboard.services.fill_map_pool", mapSize, mapType)
 
 	gameGenerator = GameGenerator()
 	gameModel = gameGenerator.generate(mapModel, handicap)
@@ -32,10 +44,77 @@ def generate_game(game_id: int, leader: LeaderType, handicap: HandicapType, mapS
 	# add UI
 	gameModel.userInterface = UserInterfaceImpl()
 
-	game_generation_final_obj = GameGenerationData.objects.filter(id=game_id).first()
-	game_generation_final_obj.game = GameModelSchema().dumps(gameModel)
-	game_generation_final_obj.state = GameGenerationState.READY
-	game_generation_final_obj.progress = 1.0
-	game_generation_final_obj.save()
+	GameDataRepository.storeUncached(game_id, gameModel)
+	GameGenerationRepository.storeStatus(game_id, GameGenerationState.READY, 1.0)
 
 	print(f'game created: {game_id} - can be retrieved')
+
+
+def fill_map_pool(mapSize: MapSize, mapType: MapType):
+	"""generates maps until the pool for mapSize and mapType contains MAP_POOL_SIZE maps"""
+	try:
+		while MapPoolRepository.count(mapSize, mapType) < MAP_POOL_SIZE:
+			# the leader of the human is assigned when the map is used
+			options = MapOptions(mapSize=mapSize, mapType=mapType, leader=LeaderType.alexander)
+			generator = MapGenerator(options)
+
+			mapModel = generator.generate(lambda state: None)
+			MapPoolRepository.store(mapSize, mapType, mapModel)
+			print(f'map added to pool: {mapSize}, {mapType}')
+	finally:
+		MapPoolRepository.finishRefill(mapSize, mapType)
+
+
+def update_game(game_id: int):
+	"""
+		processes the game (the turns of the AI players) until the human needs to act - the progress and the result
+		are written to the GameTurnData of the game, which needs to be in state RUNNING (see views.game_update)
+
+		the game is loaded from and written to the database, the web processes do not keep it meanwhile
+
+		@param game_id: id of the game
+	"""
+	lastProgress = [None]
+
+	def progressFunc(player, phase):
+		if lastProgress[0] == (player, phase):
+			return
+
+		lastProgress[0] = (player, phase)
+		GameTurnData.objects.filter(id=game_id).update(
+			player=player.name(),
+			phase=phase.value,
+			progress=float(gameModel.players.index(player)) / float(len(gameModel.players))
+		)
+
+	gameModel = GameDataRepository.fetchUncached(game_id)
+
+	if gameModel is None:
+		GameTurnData.objects.filter(id=game_id).update(state=GameGenerationState.OPEN)
+		print(f'game not found: {game_id}')
+		return
+
+	try:
+		gameModel.userInterface = UserInterfaceImpl(gameModel.mapChangeLog, progressFunc)
+		gameModel.update()
+
+		gameModel.userInterface = UserInterfaceImpl(gameModel.mapChangeLog)
+		GameDataRepository.storeUncached(game_id, gameModel)
+	except Exception:
+		GameTurnData.objects.filter(id=game_id).update(state=GameGenerationState.OPEN)
+		raise
+
+	currentPlayerName = ''
+	if gameModel.activePlayer() is not None:
+		if gameModel.activePlayer().isCityState():
+			currentPlayerName = f'PLAYER_CITYSTATE_{gameModel.activePlayer().cityState.title().upper()}'
+		else:
+			currentPlayerName = f'PLAYER_{gameModel.activePlayer().leader.name.upper()}'
+
+	GameTurnData.objects.filter(id=game_id).update(
+		state=GameGenerationState.READY,
+		progress=1.0,
+		current_turn=gameModel.currentTurn,
+		current_player=currentPlayerName,
+		human_active=gameModel.humanPlayer().turnActive
+	)
@@ -1,7 +1,7 @@
 import logging
 import random
 from enum import Enum
-from functools import reduce
+from functools import reduce, wraps
 from typing import Optional
 
 
@@ -12,6 +12,27 @@ class ExtendedEnum(Enum):
 		return list(map(lambda c: c.value, cls))
 
 
+def memoizedData(func):
+	"""
+		decorator for the _data() methods of enums - the data object of each member is created once (on first access)
+		and stored on the member. the data objects are shared, so callers must copy values before changing them.
+		the uncached method is available as __wrapped__
+	"""
+	attributeName = f'_memoized{func.__name__}'
+
+	@wraps(func)
+	def wrapper(self):
+		data = self.__dict__.get(attributeName)
+
+		if data is None:
+			data = func(self)
+			setattr(self, attributeName, data)
+
+		return data
+
+	return wrapper
+
+
 class InvalidEnumError(Exception):
 	def __init__(self, type_value):
 		super().__init__(f'enum value {type_value} not handled')
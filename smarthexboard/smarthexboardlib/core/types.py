@@ -1,4 +1,4 @@
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, memoizedData
 from smarthexboard.smarthexboardlib.utils.translation import gettext_lazy as _
 
 
@@ -56,6 +56,7 @@ class EraType(ExtendedEnum):
 	def next(self) -> EraType:
 		return self._data().nextEra
 
+	@memoizedData
 	def _data(self) -> EraTypeData:
 		if self == EraType.ancient:
 			return EraTypeData(
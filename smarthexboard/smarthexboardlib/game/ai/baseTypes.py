@@ -1,6 +1,6 @@
 from typing import Optional
 
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.game.ai.diplomaticTypes import MajorPlayerApproachType
 from smarthexboard.smarthexboardlib.game.ai.grandStrategies import GrandStrategyAIType
 from smarthexboard.smarthexboardlib.game.flavors import Flavor, FlavorType
@@ -102,6 +102,7 @@ class MilitaryStrategyType(ExtendedEnum):
 	def checkEachTurns(self) -> int:
 		return self._data().checkEachTurns
 
+	@memoizedData
 	def _data(self) -> MilitaryStrategyTypeData:
 		if self == MilitaryStrategyType.needRanged:  # MILITARYAISTRATEGY_NEED_RANGED
 			#
@@ -15,7 +15,7 @@ from smarthexboard.smarthexboardlib.map import constants
 from smarthexboard.smarthexboardlib.map.base import HexPoint
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
 from smarthexboard.smarthexboardlib.map.types import YieldType, FeatureType, YieldList
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, WeightedBaseList
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, WeightedBaseList, memoizedData
 from smarthexboard.smarthexboardlib.utils.base import firstOrNone
 
 
@@ -59,6 +59,7 @@ class CitySpecializationType(ExtendedEnum):
 	def mustBeCoastal(self) -> bool:
 		return self._data().mustBeCoastal
 
+	@memoizedData
 	def _data(self) -> CitySpecializationTypeData:
 		if self == CitySpecializationType.none:
 			return CitySpecializationTypeData(
@@ -392,6 +393,7 @@ class CityStrategyType(ExtendedEnum):
 	
 		raise InvalidEnumError(self)
 
+	@memoizedData
 	def _data(self) -> CityStrategyTypeData:
 		if self == CityStrategyType.none:
 			return CityStrategyTypeData(
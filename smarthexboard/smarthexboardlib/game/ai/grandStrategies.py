@@ -4,7 +4,7 @@ import random
 from smarthexboard.smarthexboardlib.game.ai.diplomaticTypes import GuessConfidenceType
 from smarthexboard.smarthexboardlib.game.flavors import FlavorType, Flavor
 from smarthexboard.smarthexboardlib.game.states.victories import VictoryType
-from smarthexboard.smarthexboardlib.core.base import InvalidEnumError, ExtendedEnum, WeightedBaseList
+from smarthexboard.smarthexboardlib.core.base import InvalidEnumError, ExtendedEnum, WeightedBaseList, memoizedData
 from smarthexboard.smarthexboardlib.map.types import Yields
 from smarthexboard.smarthexboardlib.utils.base import firstOrNone
 
@@ -48,6 +48,7 @@ class GrandStrategyAIType(ExtendedEnum):
 	def yields(self) -> Yields:
 		return self._data().yields
 
+	@memoizedData
 	def _data(self) -> GrandStrategyAIData:
 		if self == GrandStrategyAIType.none:
 			return GrandStrategyAIData(
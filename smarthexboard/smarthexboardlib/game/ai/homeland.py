@@ -17,7 +17,7 @@ from smarthexboard.smarthexboardlib.map.base import HexPoint
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
 from smarthexboard.smarthexboardlib.map.path_finding.finder import AStarPathfinder
 from smarthexboard.smarthexboardlib.map.types import UnitDomainType, UnitMovementType, Yields
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, contains
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, contains, memoizedData
 from smarthexboard.smarthexboardlib.utils.base import firstOrNone
 
 
@@ -69,6 +69,7 @@ class HomelandMoveType(ExtendedEnum):
 	def priority(self) -> int:
 		return self._data().priority
 
+	@memoizedData
 	def _data(self) -> HomelandMoveTypeData:
 		if self == HomelandMoveType.none:
 			return HomelandMoveTypeData(name="none", priority=0)
@@ -1401,6 +1402,7 @@ class HomelandAI:
 
 		bestValue = -999999
 		bestPlot = None
+		reachabilityMap = unit.reachabilityMap(1, simulation)
 
 		for point in unit.location.areaWithRadius(searchRange):
 			tile = simulation.tileAt(point)
@@ -1415,7 +1417,7 @@ class HomelandAI:
 				continue
 
 			# if we can't get there this turn, skip it
-			turns = unit.turnsToReach(point, simulation)
+			turns = reachabilityMap.turnsTo(point)
 			if turns == sys.maxsize or turns > 1:
 				continue
 
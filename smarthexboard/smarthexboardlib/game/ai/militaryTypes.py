@@ -1,6 +1,6 @@
 from typing import List
 
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.game.unitTypes import UnitTaskType
 from smarthexboard.smarthexboardlib.map import constants
 from smarthexboard.smarthexboardlib.map.base import HexPoint
@@ -211,6 +211,7 @@ class TacticalMoveType(ExtendedEnum):
 	def canRecruitForOperations(self) -> bool:
 		return self._data().operationsCanRecruit
 
+	@memoizedData
 	def _data(self) -> TacticalMoveTypeData:
 		if self == TacticalMoveType.none:
 			return TacticalMoveTypeData(
@@ -405,6 +405,36 @@ class TacticalTarget:
 		return False
 
 
+class TacticalUnitIndex:
+	"""units in buckets of bucketSize x bucketSize tiles to find the units near a location without a scan of all units"""
+
+	def __init__(self, units: list, bucketSize: int):
+		self.bucketSize = bucketSize
+		self._buckets = dict()
+
+		for order, unit in enumerate(units):
+			key = (unit.location.x // bucketSize, unit.location.y // bucketSize)
+			self._buckets.setdefault(key, []).append((order, unit))
+
+	def unitsWithin(self, location: HexPoint, distance: int) -> list:
+		"""units within distance of location (in the order of the units given to the index)"""
+		# a hex distance of d spans at most d + 1 columns and d rows in offset coordinates
+		minX = (location.x - distance - 1) // self.bucketSize
+		maxX = (location.x + distance + 1) // self.bucketSize
+		minY = (location.y - distance) // self.bucketSize
+		maxY = (location.y + distance) // self.bucketSize
+
+		found = []
+		for bucketY in range(minY, maxY + 1):
+			for bucketX in range(minX, maxX + 1):
+				for order, unit in self._buckets.get((bucketX, bucketY), []):
+					if unit.location.distance(location) <= distance:
+						found.append((order, unit))
+
+		found.sort(key=lambda entry: entry[0])
+		return [unit for _, unit in found]
+
+
 class TacticalAnalysisMap:
 	dominancePercentage = 25  # AI_TACTICAL_MAP_DOMINANCE_PERCENTAGE
 	tacticalRange = 10  # AI_TACTICAL_RECRUIT_RANGE
@@ -428,6 +458,13 @@ class TacticalAnalysisMap:
 
 		self._bestFriendlyRangeValue = 0
 
+		# terrain facts of each cell (by tile index) - kept across turns and players until a tile changes
+		self._terrainVersion = -1
+		self._impassableTerrain = bytearray(size.width() * size.height())
+		self._water = bytearray(size.width() * size.height())
+		self._ocean = bytearray(size.width() * size.height())
+		self._defenseModifiers = [0] * (size.width() * size.height())
+
 	# reserve capacity
 	# self.dominanceZones.reserveCapacity(mapSize.width() * mapSize.height())
 
@@ -450,6 +487,7 @@ class TacticalAnalysisMap:
 
 			self.dominanceZones = []
 			self.addTemporaryZones(simulation)
+			self.updateTerrainFacts(simulation)
 
 			for x in range(self.plots.width):
 				for y in range(self.plots.height):
@@ -475,6 +513,29 @@ class TacticalAnalysisMap:
 
 		return
 
+	def updateTerrainFacts(self, simulation):
+		"""Update the facts of the cells that only depend on the tiles (if any tile changed since the last update)"""
+		terrainVersion = simulation.terrainVersion()
+		if terrainVersion == self._terrainVersion:
+			return
+
+		width = self.plots.width
+
+		for index in range(width * self.plots.height):
+			tile = simulation.tileAt(HexPoint(index % width, index // width))
+
+			if tile is None:
+				continue
+
+			terrain = tile.terrain()
+			impassable = tile.isImpassable(UnitMovementType.walk) and tile.isImpassable(UnitMovementType.swim)
+			self._impassableTerrain[index] = 1 if impassable else 0
+			self._water[index] = 1 if terrain.isWater() else 0
+			self._ocean[index] = 1 if terrain == TerrainType.ocean else 0
+			self._defenseModifiers[index] = tile.defenseModifierFor(None)
+
+		self._terrainVersion = terrainVersion
+
 	def addTemporaryZones(self, simulation):
 		"""Add in any temporary dominance zones from tactical AI"""
 		tacticalAI = self.playerBuild.tacticalAI
@@ -521,16 +582,23 @@ class TacticalAnalysisMap:
 		diplomacyAI = player.diplomacyAI
 
 		cell: TacticalAnalysisCell = self.plots.values[y][x]
+		index = y * self.plots.width + x
 
 		if tile is not None:
+			revealed = tile.isDiscoveredBy(self.playerBuild)
+			impTerrain: bool = self._impassableTerrain[index] > 0
+
+			# cells that can't be part of a dominance zone are erased by the caller anyway
+			if impTerrain or (not revealed and not player.isBarbarian()):
+				return False
+
 			cell.reset()
 
-			cell.setRevealed(tile.isDiscoveredBy(self.playerBuild))
+			cell.setRevealed(revealed)
 			cell.setVisible(tile.isVisibleTo(self.playerBuild))
-			impTerrain: bool = tile.isImpassable(UnitMovementType.walk) and tile.isImpassable(UnitMovementType.swim)
 			cell.setImpassableTerrain(impTerrain)
-			cell.setWater(tile.terrain().isWater())
-			cell.setOcean(tile.terrain() == TerrainType.ocean)
+			cell.setWater(self._water[index] > 0)
+			cell.setOcean(self._ocean[index] > 0)
 
 			impassableTerritory = False
 			if tile.hasOwner():
@@ -563,7 +631,7 @@ class TacticalAnalysisMap:
 				cell.setUnclaimedTerritory(True)
 
 			cell.setImpassableTerritory(impassableTerritory)
-			cell.setDefenseModifier(tile.defenseModifierFor(player))
+			cell.setDefenseModifier(self._defenseModifiers[index])
 
 			unit = simulation.unitAt(HexPoint(x, y), UnitMapType.combat)
 			if unit is not None:
@@ -594,6 +662,30 @@ class TacticalAnalysisMap:
 		"""Calculate military presences in each owned dominance zone"""
 		player = self.playerBuild
 
+		# only units within tacticalRange of the closest city of a zone count
+		friendlyUnits = TacticalUnitIndex(
+			[unit for unit in simulation.unitsOf(player) if unit.isCombatUnit()],
+			self.tacticalRange
+		)
+		enemyUnits = TacticalUnitIndex(
+			[loopUnit for otherPlayer in simulation.players if player.isAtWarWith(otherPlayer)
+			 for loopUnit in simulation.unitsOf(otherPlayer) if loopUnit.isCombatUnit()],
+			self.tacticalRange
+		)
+		strengths = dict()
+
+		def strengthsOf(loopUnit) -> (int, int):
+			"""attack and ranged strength of the unit (independent of the zone)"""
+			unitStrengths = strengths.get(id(loopUnit))
+			if unitStrengths is None:
+				unitStrengths = (
+					loopUnit.attackStrengthAgainst(None, None, None, simulation),
+					loopUnit.rangedCombatStrengthAgainst(None, None, None, attacking=True, simulation=simulation)
+				)
+				strengths[id(loopUnit)] = unitStrengths
+
+			return unitStrengths
+
 		# Loop through the dominance zones
 		for dominanceZone in self.dominanceZones:
 			if dominanceZone.territoryType == TacticalDominanceTerritoryType.noOwner:
@@ -612,7 +704,7 @@ class TacticalAnalysisMap:
 					dominanceZone.enemyRangedStrength += closestCity.rangedCombatStrengthAgainst(None, None)
 
 				# Loop through all of OUR units first
-				for unit in simulation.unitsOf(player):
+				for unit in friendlyUnits.unitsWithin(closestCity.location, self.tacticalRange):
 					if unit.isCombatUnit():
 						if unit.domain() == UnitDomainType.air or \
 							unit.domain() == UnitDomainType.land and not dominanceZone.isWater or \
@@ -622,15 +714,13 @@ class TacticalAnalysisMap:
 							multiplier = self.tacticalRange + 1 - distance
 
 							if multiplier > 0:
-								unitStrength = unit.attackStrengthAgainst(None, None, None, simulation)
+								unitStrength, unitRangedStrength = strengthsOf(unit)
 
 								if unitStrength == 0 and unit.isEmbarked() and not dominanceZone.isWater:
 									unitStrength = unit.baseCombatStrength(ignoreEmbarked=True)
 
 								dominanceZone.friendlyStrength += unitStrength * multiplier * self.unitStrengthMultiplier
-								dominanceZone.friendlyRangedStrength += unit.rangedCombatStrengthAgainst(None, None, None,
-																								  attacking=True,
-																								  simulation=simulation)
+								dominanceZone.friendlyRangedStrength += unitRangedStrength
 
 								if unit.range() > self._bestFriendlyRangeValue:
 									self._bestFriendlyRangeValue = unit.range()
@@ -638,56 +728,51 @@ class TacticalAnalysisMap:
 								dominanceZone.friendlyUnitCount += 1
 
 				# Repeat for all visible enemy units ( or adjacent to visible)
-				for otherPlayer in simulation.players:
-					if player.isAtWarWith(otherPlayer):
-						for loopUnit in simulation.unitsOf(otherPlayer):
-							if loopUnit.isCombatUnit():
+				for loopUnit in enemyUnits.unitsWithin(closestCity.location, self.tacticalRange):
+					if loopUnit.isCombatUnit():
 
-								if loopUnit.domain() == UnitDomainType.air or \
-									(loopUnit.domain() == UnitDomainType.land and not dominanceZone.isWater) or \
-									(loopUnit.domain() == UnitDomainType.sea and dominanceZone.isWater):
+						if loopUnit.domain() == UnitDomainType.air or \
+							(loopUnit.domain() == UnitDomainType.land and not dominanceZone.isWater) or \
+							(loopUnit.domain() == UnitDomainType.sea and dominanceZone.isWater):
 
-									plot = simulation.tileAt(loopUnit.location)
+							plot = simulation.tileAt(loopUnit.location)
 
-									if plot is not None:
-										visible = True
-										distance = loopUnit.location.distance(closestCity.location)
+							if plot is not None:
+								visible = True
+								distance = loopUnit.location.distance(closestCity.location)
 
-										if distance <= self.tacticalRange:
-											# "4" so unit strength isn't totally dominated by proximity to city
-											multiplier = (self.tacticalRange + 4 - distance)
-											if not plot.isVisibleTo(player) and \
-												not simulation.isAdjacentDiscovered(loopUnit.location, player):
-												visible = False
+								if distance <= self.tacticalRange:
+									# "4" so unit strength isn't totally dominated by proximity to city
+									multiplier = (self.tacticalRange + 4 - distance)
+									if not plot.isVisibleTo(player) and \
+										not simulation.isAdjacentDiscovered(loopUnit.location, player):
+										visible = False
 
-											if multiplier > 0:
-												unitStrength = loopUnit.attackStrengthAgainst(None, None, None, simulation)
-												if unitStrength == 0 and loopUnit.isEmbarked() and not dominanceZone.isWater:
-													unitStrength = loopUnit.baseCombatStrength(ignoreEmbarked=True)
+									if multiplier > 0:
+										unitStrength, rangedStrength = strengthsOf(loopUnit)
+										if unitStrength == 0 and loopUnit.isEmbarked() and not dominanceZone.isWater:
+											unitStrength = loopUnit.baseCombatStrength(ignoreEmbarked=True)
 
-												if not visible:
-													unitStrength /= 2
+										if not visible:
+											unitStrength /= 2
 
-												dominanceZone.enemyStrength += unitStrength * multiplier * self.unitStrengthMultiplier
+										dominanceZone.enemyStrength += unitStrength * multiplier * self.unitStrengthMultiplier
 
-												rangedStrength = loopUnit.rangedCombatStrengthAgainst(None, None, None,
-																							   attacking=True,
-																							   simulation=simulation)
-												if not visible:
-													rangedStrength /= 2
+										if not visible:
+											rangedStrength /= 2
 
-												dominanceZone.enemyRangedStrength = rangedStrength
+										dominanceZone.enemyRangedStrength = rangedStrength
 
-												if visible:
-													dominanceZone.enemyUnitCount += 1
-													if distance < dominanceZone.rangeClosestEnemyUnit:
-														dominanceZone.rangeClosestEnemyUnit = distance
+										if visible:
+											dominanceZone.enemyUnitCount += 1
+											if distance < dominanceZone.rangeClosestEnemyUnit:
+												dominanceZone.rangeClosestEnemyUnit = distance
 
-													if loopUnit.isRanged():
-														dominanceZone.enemyRangedUnitCount += 1
+											if loopUnit.isRanged():
+												dominanceZone.enemyRangedUnitCount += 1
 
-													if loopUnit.domain() == UnitDomainType.sea:
-														dominanceZone.enemyNavalUnitCount += 1
+											if loopUnit.domain() == UnitDomainType.sea:
+												dominanceZone.enemyNavalUnitCount += 1
 
 		return
 
@@ -783,6 +868,11 @@ class TacticalAnalysisMap:
 		player = self.playerBuild
 		diplomacyAI = player.diplomacyAI
 
+		# tiles visible to any (non barbarian) player we are at war with - see Tile.isVisibleToEnemy
+		enemies = [loopPlayer for loopPlayer in simulation.players
+		           if not loopPlayer.isBarbarian() and loopPlayer != player and diplomacyAI.isAtWarWith(loopPlayer)]
+		visibleToEnemy = simulation.visibleToAnyOf(enemies)
+
 		# Look at every cell on the map
 		for x in range(self.plots.width):
 			for y in range(self.plots.height):
@@ -793,7 +883,7 @@ class TacticalAnalysisMap:
 
 				if tile is not None:
 					if tile.isDiscoveredBy(self.playerBuild) and not tile.isImpassable(UnitMovementType.walk):
-						if not tile.isVisibleToEnemy(player, simulation):
+						if not visibleToEnemy[y * self.plots.width + x]:
 							cell.setNotVisibleToEnemy(True)
 						else:
 							# loop all enemy units
@@ -2747,6 +2837,7 @@ class TacticalAI:
 		# Now looking for BEST score
 		bestValue = 0
 		movementRange = unit.movesLeft()
+		reachabilityMap = unit.reachabilityMap(movementRange, simulation)
 
 		for plot in unit.location.areaWithRadius(movementRange):
 			if plot == unit.location:
@@ -2759,7 +2850,7 @@ class TacticalAI:
 			if not tile.isDiscoveredBy(self.player):
 				continue
 
-			if not unit.canReachAt(plot, movementRange, simulation):
+			if not reachabilityMap.canReachIn(plot, movementRange):
 				continue
 
 			value = simulation.numberOfTradeRoutesAt(plot)
@@ -2777,6 +2868,7 @@ class TacticalAI:
 		bestValue = 0
 		bestMovePlot: Optional[HexPoint] = None
 		movementRange = unit.movesLeft()
+		reachabilityMap = unit.reachabilityMap(movementRange, simulation)
 
 		# Now looking for BEST score
 		for plot in unit.location.areaWithRadius(movementRange):
@@ -2790,7 +2882,7 @@ class TacticalAI:
 			if not tile.isDiscoveredBy(self.player):
 				continue
 
-			if not unit.canReachAt(plot, movementRange, simulation):
+			if not reachabilityMap.canReachIn(plot, movementRange):
 				continue
 
 			# Value them based on their explore value
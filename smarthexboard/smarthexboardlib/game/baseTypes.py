@@ -3,7 +3,7 @@ from typing import List
 
 from smarthexboard.smarthexboardlib.game.types import TechType, CivicType
 from smarthexboard.smarthexboardlib.game.units import UnitType
-from smarthexboard.smarthexboardlib.core.base import InvalidEnumError, ExtendedEnum
+from smarthexboard.smarthexboardlib.core.base import InvalidEnumError, ExtendedEnum, memoizedData
 from smarthexboard.smarthexboardlib.utils.translation import gettext_lazy as _
 
 
@@ -111,6 +111,7 @@ class HandicapType(ExtendedEnum):
 	def barbarianCampGold(self) -> int:
 		return self._data().barbarianCampGold
 
+	@memoizedData
 	def _data(self) -> HandicapTypeData:
 		if self == HandicapType.settler:
 			#
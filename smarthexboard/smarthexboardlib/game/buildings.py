@@ -7,7 +7,7 @@ from smarthexboard.smarthexboardlib.game.greatworks import GreatWorkSlotType
 from smarthexboard.smarthexboardlib.game.specialists import SpecialistSlots, SpecialistType
 from smarthexboard.smarthexboardlib.game.types import TechType, EraType, CivicType
 from smarthexboard.smarthexboardlib.map.types import Yields
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, memoizedData
 from gettext import gettext as _
 
 
@@ -207,6 +207,7 @@ class BuildingType(ExtendedEnum):
 
 		return slots.amount > 0
 
+	@memoizedData
 	def _data(self) -> BuildingTypeData:
 		# default
 		if self == BuildingType.none:
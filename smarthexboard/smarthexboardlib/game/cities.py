@@ -1815,6 +1815,16 @@ class City:
 	def name(self) -> str:
 		return self._name
 
+	def to_dict(self) -> dict:
+		return {
+			'name': self._name,
+			'x': self.location.x,
+			'y': self.location.y,
+			'player': self.player.identifier() if self.player is not None else None,
+			'health': self.healthPoints(),
+			'size': self.population()
+		}
+
 	def setName(self, name: str):
 		self._name = name
 
@@ -3941,7 +3951,7 @@ class City:
 		simulation.concealCity(self)
 
 		self.leader = LeaderType.freeCities
-		self.player = newPlayer
+		simulation.setCityOwner(self, newPlayer)
 
 		# reveal city to new 'owner'
 		simulation.sightCity(self)
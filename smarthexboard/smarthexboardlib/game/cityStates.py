@@ -1,7 +1,7 @@
 from typing import Optional
 
 from smarthexboard.smarthexboardlib.game.envoys import EnvoyEffectLevel
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.core.theming import Color
 from smarthexboard.smarthexboardlib.game.types import TechType, CivicType
 from smarthexboard.smarthexboardlib.utils.translation import gettext_lazy as _
@@ -27,6 +27,7 @@ class CityStateCategory(ExtendedEnum):
 	def title(self) -> str:
 		return self._data().name
 
+	@memoizedData
 	def _data(self):
 		if self == CityStateCategory.cultural:
 			return CityStateCategoryData(
@@ -262,6 +263,7 @@ class CityStateType(ExtendedEnum):
 
 		raise InvalidEnumError(level)
 
+	@memoizedData
 	def _data(self) -> CityStateTypeData:
 		# akkad
 		if self == CityStateType.amsterdam:
@@ -2,7 +2,7 @@ from typing import List
 
 from smarthexboard.smarthexboardlib.game.ai.diplomaticTypes import MajorPlayerApproachType, MinorPlayerApproachType
 from smarthexboard.smarthexboardlib.game.flavors import FlavorType, Flavor
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, WeightedBaseList
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, WeightedBaseList, memoizedData
 from smarthexboard.smarthexboardlib.map.types import TerrainType, FeatureType, ResourceType
 
 from smarthexboard.smarthexboardlib.utils.translation import gettext_lazy as _
@@ -117,6 +117,7 @@ class CivilizationType(ExtendedEnum):
 
 		return biasValue
 
+	@memoizedData
 	def _data(self) -> CivilizationData:
 		# https://civilization.fandom.com/wiki/Module:Data/Civ6/GS/StartBiasTerrains
 		if self == CivilizationType.none:
@@ -639,6 +640,7 @@ class LeaderType(ExtendedEnum):
 	def _flavors(self) -> List[Flavor]:
 		return self._data().flavors
 
+	@memoizedData
 	def _data(self) -> LeaderTypeData:
 		"""
 		https://github.com/LoneGazebo/Community-Patch-DLL/blob/4a483b28353f38dd5a10d5e75c7a68e59b9bee5c/(2)%20Vox%20Populi/Balance%20Changes/AI/LeaderPersonalities.sql#L9
@@ -4,7 +4,7 @@ from smarthexboard.smarthexboardlib.game.flavors import Flavor, FlavorType
 from smarthexboard.smarthexboardlib.game.types import CivicType, TechType
 from smarthexboard.smarthexboardlib.map.base import HexPoint
 from smarthexboard.smarthexboardlib.map.types import Yields, TerrainType, FeatureType
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from gettext import gettext as _
 
 
@@ -83,6 +83,7 @@ class DistrictType(ExtendedEnum):
 	def foreignTradeYields(self) -> Yields:
 		return self._data().foreignTradeYields
 
+	@memoizedData
 	def _data(self) -> DistrictTypeData:
 		if self == DistrictType.none:
 			return DistrictTypeData(
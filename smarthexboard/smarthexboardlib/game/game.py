@@ -1,7 +1,7 @@
 import logging
 import operator
 import random
-from typing import Optional, Union, List
+from typing import Optional, Union, List, Dict
 
 from smarthexboard.smarthexboardlib.core.base import WeightedBaseList
 from smarthexboard.smarthexboardlib.game.ai.barbarians import BarbarianAI
@@ -24,7 +24,7 @@ from smarthexboard.smarthexboardlib.game.religions import PantheonType, Religion
 from smarthexboard.smarthexboardlib.game.states.accessLevels import AccessLevel
 from smarthexboard.smarthexboardlib.game.states.builds import BuildType
 from smarthexboard.smarthexboardlib.game.states.gossips import GossipType, GossipSourceType, GossipItem
-from smarthexboard.smarthexboardlib.game.states.ui import ScreenType
+from smarthexboard.smarthexboardlib.game.states.ui import ScreenType, MapChangeLog
 from smarthexboard.smarthexboardlib.game.states.victories import VictoryType
 from smarthexboard.smarthexboardlib.game.types import TechType, EraType, CivicType
 from smarthexboard.smarthexboardlib.game.unitTypes import UnitMapType, UnitAbilityType, MoveOption
@@ -38,6 +38,8 @@ from smarthexboard.smarthexboardlib.map.map import MapModel, Tile, ContinentType
 from smarthexboard.smarthexboardlib.map.path_finding.finder import AStarPathfinder, MoveTypeIgnoreUnitsOptions, \
 	MoveTypeIgnoreUnitsPathfinderDataSource, InfluencePathfinderDataSource, MoveTypeUnitAwarePathfinderDataSource, \
 	MoveTypeUnitAwareOptions
+from smarthexboard.smarthexboardlib.map.path_finding.cache import PathCache
+from smarthexboard.smarthexboardlib.map.path_finding.hierarchical import PathHierarchy
 from smarthexboard.smarthexboardlib.map.path_finding.path import HexPath
 from smarthexboard.smarthexboardlib.map.types import FeatureType, Tutorials, UnitMovementType, MapSize, ArchaeologicalRecord, ArchaeologicalRecordType, \
 	ResourceType, TerrainType
@@ -159,12 +161,42 @@ class GameModel:
 	pass
 
 
+class PlayerIndexes:
+	"""lookups of the players of a game by leader, city state, hash and slot (index in the player list)"""
+
+	def __init__(self, players: List[Player]):
+		self.players = players
+		self.numberOfPlayers = len(players)
+		self.playersByLeader: Dict[LeaderType, Player] = dict()
+		self.playersByCityState: Dict[CityStateType, Player] = dict()
+		self.playersByHash: Dict[int, Player] = dict()
+		self.slots: Dict[int, int] = dict()
+
+		# the first matching player wins (like a scan over the players)
+		for slot, player in enumerate(players):
+			if player.leader == LeaderType.cityState:
+				self.playersByCityState.setdefault(player.cityState, player)
+			else:
+				self.playersByLeader.setdefault(player.leader, player)
+
+			self.playersByHash.setdefault(hash(player), player)
+			self.slots.setdefault(hash(player), slot)
+
+	def isValidFor(self, players: List[Player]) -> bool:
+		return self.players is players and self.numberOfPlayers == len(players)
+
+
 class GameModel:
+	# map sizes whose games search long routes with hierarchical pathfinding (HPA*), opt in by adding
+	# map sizes (e.g. MapSize.standard) - HPA* paths are not always the shortest ones
+	hierarchicalPathfindingMapSizes: List[MapSize] = []
+
 	def __init__(self, victoryTypes: Union[dict, List[VictoryType]], handicap: Optional[HandicapType]=None, turnsElapsed: Optional[int]=None, players: Optional[List[Player]]=None, map: Optional[MapModel]=None):
 		if isinstance(victoryTypes, List):
 			self.turnSliceValue = 0
 			self.waitDiploPlayer = None
 			self.players: List[Player] = players
+			self._playerIndexes: Optional[PlayerIndexes] = None
 			self._activePlayer: Optional[Player] = None
 			self.currentTurn: int = turnsElapsed
 			self.maxTurns: int = 500
@@ -174,6 +206,10 @@ class GameModel:
 			self.userInterface = None
 			self._gameStateValue: GameState = GameState.on
 			self._tacticalAnalysisMap = TacticalAnalysisMap(Size(map.width, map.height))
+			self._pathCache = PathCache(self._map)
+			self._pathHierarchy: Optional[PathHierarchy] = self._defaultPathHierarchy()
+			self.saveState = None  # what was persisted last (see serialisation.binary.SaveState)
+			self.mapChangeLog = MapChangeLog(self.currentTurn)
 			self._rankingData = GameRankingData()
 
 			# game ai
@@ -199,6 +235,7 @@ class GameModel:
 			self.turnSliceValue = 0
 			self.waitDiploPlayer = None
 			self.players: List[Player] = [Player(player_dict) for player_dict in victoryTypes['players']]
+			self._playerIndexes: Optional[PlayerIndexes] = None
 			self._activePlayer: Optional[Player] = None  # fixme
 			self.currentTurn: int = victoryTypes['currentTurn']
 			self.maxTurns: int = victoryTypes['maxTurns']
@@ -212,6 +249,10 @@ class GameModel:
 			self.userInterface = None
 			self._gameStateValue: GameState = victoryTypes['_gameStateValue']
 			self._tacticalAnalysisMap = TacticalAnalysisMap(Size(self._map.width, self._map.height))
+			self._pathCache = PathCache(self._map)
+			self._pathHierarchy: Optional[PathHierarchy] = self._defaultPathHierarchy()
+			self.saveState = None  # what was persisted last (see serialisation.binary.SaveState)
+			self.mapChangeLog = MapChangeLog(self.currentTurn + 1)  # the changes of the current turn are lost
 			self._rankingData = GameRankingData(victoryTypes['_rankingData'])
 
 			# game ai
@@ -236,6 +277,21 @@ class GameModel:
 		else:
 			raise Exception(f'Invalid combination of parameters: {victoryTypes}, {handicap}, {turnsElapsed}, {players}, {map}')
 
+	def __getstate__(self):
+		# the ui, the save state, the change log and the path cache belong to the running game (see GameModelCodec)
+		state = self.__dict__.copy()
+		for name in ['userInterface', 'saveState', 'mapChangeLog', '_pathCache']:
+			state.pop(name, None)
+
+		return state
+
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+		self.userInterface = None
+		self.saveState = None
+		self.mapChangeLog = MapChangeLog(self.currentTurn + 1)  # the changes of the current turn are lost
+		self._pathCache = PathCache(self._map)
+
 	def update(self):
 		if self.userInterface is None:
 			raise Exception("no UI")
@@ -339,9 +395,16 @@ class GameModel:
 
 	def addUnit(self, unit):
 		self._map.addUnit(unit)
+		self.mapChangeLog.record(unit.location)
 
 	def removeUnit(self, unit):
 		self._map.removeUnit(unit)
+		self.mapChangeLog.record(unit.location)
+
+	def moveUnit(self, unit, location: HexPoint):
+		self.mapChangeLog.record(unit.location)
+		self._map.moveUnit(unit, location)
+		self.mapChangeLog.record(location)
 
 	def cityAt(self, location: HexPoint) -> Optional[City]:
 		return self._map.cityAt(location)
@@ -369,6 +432,7 @@ class GameModel:
 		tile.setFeature(FeatureType.none)
 
 		self._map.addCity(city, simulation=self)
+		self.mapChangeLog.record(city.location)
 		# self.userInterface?.show(city: city)
 
 		# update area around the city
@@ -389,6 +453,9 @@ class GameModel:
 	def deleteCity(self, city):
 		self._map.deleteCity(city)
 
+	def setCityOwner(self, city, player):
+		self._map.setCityOwner(city, player)
+
 	def tileAt(self, x_or_hex: Union[int, HexPoint], y: Optional[int] = None) -> Optional[Tile]:
 		return self._map.tileAt(x_or_hex, y)
 
@@ -447,6 +514,9 @@ class GameModel:
 
 		self.humanPlayer().resetFinishTurnButtonPressed()
 
+		# paths are only cached within one turn
+		self._pathCache.clear()
+
 		self.barbarianAI.doTurn(self)
 		self._religions.doTurn(self)
 
@@ -469,6 +539,7 @@ class GameModel:
 
 		# incrementGameTurn();
 		self.currentTurn += 1
+		self.mapChangeLog.setTurn(self.currentTurn)
 
 		# Sequential turns.
 		# Activate the << FIRST >> player we find from the start, human or AI, who wants a sequential turn.
@@ -803,21 +874,20 @@ class GameModel:
 
 		return
 
-	def sightAt(self, location: HexPoint, sight: int, unit=None, player=None):
+	def sightAt(self, location: HexPoint, sight: int, unit=None, player=None) -> List[HexPoint]:
+		"""
+			makes the tiles visible from location visible to player and returns their points - the points are
+			recorded on the unit (if any), other callers need to pass them back to concealAt
+		"""
 		if player is None:
 			raise Exception("cant get player")
 
-		currentTile = self.tileAt(location)
 		hasSentry: bool = unit.hasPromotion(UnitPromotionType.sentry) if unit is not None else False
+		sightedPoints: List[HexPoint] = []
 
-		for areaPoint in location.areaWithRadius(sight):
-			tile = self.tileAt(areaPoint)
-
-			if tile is None:
-				continue
-
-			if not tile.canSeeTile(currentTile, player, sight, hasSentry, self):
-				continue
+		for tile in self._map.visibleTilesFrom(location, sight, hasSentry):
+			areaPoint = tile.point
+			sightedPoints.append(areaPoint)
 
 			# inform the player about a goody hut
 			if tile.hasImprovement(ImprovementType.goodyHut) and not tile.isDiscoveredBy(player):
@@ -849,7 +919,7 @@ class GameModel:
 					player.doDiscoverNaturalWonder(feature)
 					player.addMoment(MomentType.discoveryOfANaturalWonder, naturalWonder=feature, simulation=self)
 
-					if unit.hasAbility(UnitAbilityType.experienceFromTribal):
+					if unit is not None and unit.hasAbility(UnitAbilityType.experienceFromTribal):
 						# Gains XP when activating Tribal Villages(+5 XP) and discovering Natural Wonders(+10 XP)
 						unit.changeExperienceBy(10, self)
 
@@ -868,25 +938,33 @@ class GameModel:
 
 			self.userInterface.refreshTile(tile)
 
-		return
-
-	def concealAt(self, location: HexPoint, sight: int, unit=None, player=None):
-		currentTile = self.tileAt(location)
-
-		hasSentry: bool = unit.hasPromotion(UnitPromotionType.sentry) if unit is not None else False
+		if unit is not None:
+			unit.setSightedPoints((unit.sightedPoints() or []) + sightedPoints)
 
-		for loopPoint in location.areaWithRadius(sight):
-			loopTile = self.tileAt(loopPoint)
+		return sightedPoints
 
-			if loopTile is None:
-				continue
+	def concealAt(self, location: Optional[HexPoint], sight: int, unit=None, player=None, points: Optional[List[HexPoint]] = None):
+		"""
+			undoes sightAt - conceals the recorded points of the unit or the given points, so the visibility counts
+			stay balanced when sight, promotions or terrain changed in between (a unit that has not sighted yet
+			conceals nothing). location and sight are only used without unit and points
+		"""
+		if points is None and unit is not None:
+			points = unit.sightedPoints() or []
 
-			if not loopTile.canSeeTile(currentTile, player, sight, hasSentry=hasSentry, simulation=self):
-				continue
+		if points is not None:
+			tiles = [self.tileAt(point) for point in points]
+		else:
+			hasSentry: bool = unit.hasPromotion(UnitPromotionType.sentry) if unit is not None else False
+			tiles = self._map.visibleTilesFrom(location, sight, hasSentry)
 
+		for loopTile in tiles:
 			loopTile.concealTo(player)
 			self.userInterface.refreshTile(loopTile)
 
+		if unit is not None:
+			unit.setSightedPoints(None)
+
 		return
 
 	def concealCity(self, city):
@@ -913,20 +991,52 @@ class GameModel:
 
 		return
 
-	def discoverAt(self, location: HexPoint, sight: int, player):
-		if not self.valid(location):
-			return
+	def rebuildSight(self):
+		"""
+			recounts the sight sources of all tiles from the units, cities and delegations and records the points the
+			units and delegations see - for games loaded from the json documents, which only store whether a tile is
+			visible. nothing gets discovered
+		"""
+		planes = self._map.planes
+		for playerHash, plane in planes.visibility.items():
+			plane[:] = bytes(len(plane))
+			planes.sightChanged(playerHash)
 
-		currentTile = self.tileAt(location)
+		for player in self.players:
+			for unit in self.unitsOf(player):
+				hasSentry: bool = unit.hasPromotion(UnitPromotionType.sentry)
+				tiles = self._map.visibleTilesFrom(unit.location, unit.sight(), hasSentry)
+				for tile in tiles:
+					tile.sightBy(player)
 
-		for pt in location.areaWithRadius(sight):
-			tile = self.tileAt(pt)
+				unit.setSightedPoints([tile.point for tile in tiles])
 
-			if tile is None:
-				continue
+			for city in self.citiesOf(player):
+				for loopPoint in city.location.areaWithRadius(3):
+					loopTile = self.tileAt(loopPoint)
 
-			if not tile.canSeeTile(currentTile, player, sight, hasSentry=False, simulation=self):
-				continue
+					if loopTile is not None:
+						loopTile.sightBy(player)
+
+			for otherPlayer in self.players:
+				if otherPlayer is player or not player.diplomacyAI.hasSentDelegationTo(otherPlayer):
+					continue
+
+				capital = self.capitalOf(otherPlayer)
+				tiles = [] if capital is None else self._map.visibleTilesFrom(capital.location, 3)
+				for tile in tiles:
+					tile.sightBy(player)
+
+				player.diplomacyAI.playerDict.updateDelegationSightTo(otherPlayer, [tile.point for tile in tiles])
+
+		return
+
+	def discoverAt(self, location: HexPoint, sight: int, player):
+		if not self.valid(location):
+			return
+
+		for tile in self._map.visibleTilesFrom(location, sight):
+			pt = tile.point
 
 			if tile.isDiscoveredBy(player):
 				continue
@@ -1050,7 +1160,9 @@ class GameModel:
 			can_embark=unit.player.canEmbark(),
 			can_enter_ocean=unit.player.canEnterOcean()
 		)
-		return MoveTypeUnitAwarePathfinderDataSource(self._map, unit.movementType(), unit.player, datasourceOptions)
+		datasource = MoveTypeUnitAwarePathfinderDataSource(self._map, unit.movementType(), unit.player, datasourceOptions)
+		datasource.pathCache = self._pathCache
+		return datasource
 
 	def ignoreUnitsPathfinderDataSource(self, movementType: UnitMovementType, player,
 										canEmbark: bool, canEnterOcean: bool) -> MoveTypeIgnoreUnitsPathfinderDataSource:
@@ -1059,7 +1171,37 @@ class GameModel:
 			can_embark=canEmbark,
 			can_enter_ocean=canEnterOcean
 		)
-		return MoveTypeIgnoreUnitsPathfinderDataSource(self._map, movementType, player, datasourceOptions)
+		datasource = MoveTypeIgnoreUnitsPathfinderDataSource(self._map, movementType, player, datasourceOptions)
+		datasource.pathCache = self._pathCache
+		datasource.hierarchy = self._pathHierarchy
+		return datasource
+
+	def _defaultPathHierarchy(self) -> Optional[PathHierarchy]:
+		"""new and loaded games of the big map sizes search long routes with HPA*"""
+		if self._map.bestMatchingSize() in GameModel.hierarchicalPathfindingMapSizes:
+			return PathHierarchy(self._map)
+
+		return None
+
+	def enableHierarchicalPathfinding(self, clusterSize: int = 10):
+		"""
+			long routes of the data sources that ignore units are searched over clusters of the map (HPA*)
+			instead of the tiles. The paths are close to but not always the cheapest. Intended for big maps.
+		"""
+		self._pathHierarchy = PathHierarchy(self._map, clusterSize)
+		self._pathCache.clear()
+
+	def disableHierarchicalPathfinding(self):
+		self._pathHierarchy = None
+		self._pathCache.clear()
+
+	def clearPathCache(self):
+		"""drops all cached paths (e.g. when the war state of players changes)"""
+		self._pathCache.clear()
+
+	def pathCacheStatistics(self) -> dict:
+		"""hits / misses of the path cache (for profiling)"""
+		return self._pathCache.statistics()
 
 	def pathTowards(self, target: HexPoint, options: [MoveOption], unit) -> Optional[HexPath]:
 		datasource = self.unitAwarePathfinderDataSource(unit)
@@ -1402,31 +1544,52 @@ class GameModel:
 	def worldEra(self) -> EraType:
 		return self._worldEraValue
 
+	def _indexes(self, rebuild: bool = False) -> 'PlayerIndexes':
+		if rebuild or self._playerIndexes is None or not self._playerIndexes.isValidFor(self.players):
+			self._playerIndexes = PlayerIndexes(self.players)
+
+		return self._playerIndexes
+
 	def playerFor(self, leader: LeaderType) -> Optional[Player]:
 		if leader == LeaderType.cityState:
 			raise Exception('use cityStatePlayerFor for cityState')
 
-		for player in self.players:
-			if player.leader == leader:
-				return player
+		player = self._indexes().playersByLeader.get(leader)
+		if player is None or player.leader != leader:
+			# leader of a player could have been changed after the indexes were built
+			player = self._indexes(rebuild=True).playersByLeader.get(leader)
 
-		return None
+		return player
 
 	def cityStatePlayerFor(self, cityState: CityStateType) -> Optional[Player]:
-		for player in self.players:
-			if player.leader == LeaderType.cityState and player.cityState == cityState:
-				return player
+		player = self._indexes().playersByCityState.get(cityState)
+		if player is None or player.cityState != cityState:
+			player = self._indexes(rebuild=True).playersByCityState.get(cityState)
 
-		return None
+		return player
 
 	def playerForHash(self, hashValue: Union[int, str]) -> Optional[Player]:
 		hashValueInt = hashValue if isinstance(hashValue, int) else int(hashValue)
 
-		for player in self.players:
-			if hash(player) == hashValueInt:
-				return player
+		player = self._indexes().playersByHash.get(hashValueInt)
+		if player is None or hash(player) != hashValueInt:
+			player = self._indexes(rebuild=True).playersByHash.get(hashValueInt)
 
-		return None
+		return player
+
+	def slotOf(self, player: Player) -> int:
+		"""small int (index into players) of player - stable as long as no player is added or removed"""
+		slot = self._indexes().slots.get(hash(player))
+		if slot is None or self.players[slot] is not player:
+			slot = self._indexes(rebuild=True).slots.get(hash(player))
+
+		if slot is None:
+			raise Exception(f'player {player} is not part of the game')
+
+		return slot
+
+	def playerForSlot(self, slot: int) -> Player:
+		return self.players[slot]
 
 	def addReplayEvent(self, eventType: ReplayEventType, message: str, location: HexPoint):
 		self.replayEvents.append(ReplayEvent(self.currentTurn, eventType, message, location))
@@ -1435,6 +1598,18 @@ class GameModel:
 		"""number of land tiles"""
 		return self._map.numberOfLandPlots()
 
+	def terrainVersion(self) -> int:
+		"""changes whenever terrain, hills, feature, route, river or improvement of a tile changes"""
+		return self._map.terrainVersion()
+
+	def numberOfDiscoveredPlotsBy(self, player) -> int:
+		"""number of tiles discovered by player"""
+		return self._map.numberOfDiscoveredTilesBy(player)
+
+	def visibleToAnyOf(self, players) -> bytearray:
+		"""flag per tile (row by row) if the tile is visible to at least one of the players"""
+		return self._map.visibleToAnyOf(players)
+
 	def randomLocation(self) -> HexPoint:
 		size: Size = self.mapSize().size()
 		x = random.randint(0, size.width())  # Int.random(number: self.mapSize().width())
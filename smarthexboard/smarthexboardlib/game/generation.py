@@ -1,12 +1,12 @@
 import logging
-from typing import List
+from typing import List, Optional, Callable
 
 from smarthexboard.smarthexboardlib.game.baseTypes import HandicapType
 from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
 from smarthexboard.smarthexboardlib.game.game import GameModel
 from smarthexboard.smarthexboardlib.game.governments import GovernmentType
 from smarthexboard.smarthexboardlib.game.players import Player
-from smarthexboard.smarthexboardlib.game.states.ui import Interface
+from smarthexboard.smarthexboardlib.game.states.ui import Interface, MapChangeLog, TurnPhase
 from smarthexboard.smarthexboardlib.game.states.victories import VictoryType
 from smarthexboard.smarthexboardlib.game.unitTypes import UnitType
 from smarthexboard.smarthexboardlib.game.units import Unit
@@ -15,8 +15,20 @@ from smarthexboard.smarthexboardlib.map.map import MapModel
 
 
 class UserInterfaceImpl(Interface):
+	def __init__(self, changeLog: Optional[MapChangeLog] = None, progressFunc: Optional[Callable] = None):
+		super().__init__()
+		self.changeLog = changeLog  # collects the changed points for the map diff of the client
+		self.progressFunc = progressFunc  # (player, phase) -> None, informed about the progress of the AI turns
+
+	def _record(self, point):
+		if self.changeLog is not None:
+			self.changeLog.record(point)
+
 	def updateCity(self, city):
-		pass
+		self._record(city.location)
+
+	def removeCity(self, city):
+		self._record(city.location)
 
 	def updatePlayer(self, player):
 		pass
@@ -25,7 +37,20 @@ class UserInterfaceImpl(Interface):
 		return False
 
 	def refreshTile(self, tile):
-		pass
+		self._record(tile.point)
+
+	def refreshUnit(self, unit):
+		self._record(unit.location)
+
+	def hideUnit(self, unit, location):
+		self._record(location)
+
+	def showUnit(self, unit, location):
+		self._record(location)
+
+	def updateTurnProgress(self, player, phase: TurnPhase):
+		if self.progressFunc is not None:
+			self.progressFunc(player, phase)
 
 
 class GameGenerator:
@@ -6,7 +6,7 @@ from smarthexboard.smarthexboardlib.game.policyCards import PolicyCardType, Poli
 from smarthexboard.smarthexboardlib.game.states.ages import AgeType
 from smarthexboard.smarthexboardlib.game.states.gossips import GossipType
 from smarthexboard.smarthexboardlib.game.types import CivicType, EraType
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, WeightedBaseList
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, WeightedBaseList, memoizedData
 from smarthexboard.smarthexboardlib.utils.base import isinstance_string
 
 
@@ -98,6 +98,7 @@ class GovernmentType(ExtendedEnum):
 
 		return 0
 
+	@memoizedData
 	def _data(self) -> GovernmentTypeData:
 		# ancient
 		if self == GovernmentType.chiefdom:
@@ -369,7 +370,14 @@ class PlayerGovernment:
 
 	def policyCardSlots(self, simulation) -> PolicyCardSlots:
 		if self._currentGovernmentValue is not None:
-			policyCardSlots = self._currentGovernmentValue.policyCardSlots()
+			# the slots of the government type are shared
+			governmentSlots = self._currentGovernmentValue.policyCardSlots()
+			policyCardSlots = PolicyCardSlots(
+				military=governmentSlots.military,
+				economic=governmentSlots.economic,
+				diplomatic=governmentSlots.diplomatic,
+				wildcard=governmentSlots.wildcard
+			)
 
 			if self.player.leader.civilization().ability() == CivilizationAbility.platosRepublic:
 				policyCardSlots.wildcard += 1
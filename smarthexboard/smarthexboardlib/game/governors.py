@@ -2,7 +2,7 @@ from typing import List
 
 from smarthexboard.smarthexboardlib.game.flavors import Flavor, FlavorType
 from smarthexboard.smarthexboardlib.map import constants
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 
 
 class GovernorTitleType:
@@ -80,6 +80,7 @@ class GovernorTitleType(ExtendedEnum):
 	def title(self) -> str:
 		return self._data().name
 
+	@memoizedData
 	def _data(self) -> GovernorTitleTypeData:
 		if self == GovernorTitleType.none:
 			return GovernorTitleTypeData(
@@ -594,6 +595,7 @@ class GovernorType(ExtendedEnum):
 
 		return 0
 	
+	@memoizedData
 	def _data(self) -> GovernorTypeData:
 		if self == GovernorType.none:
 			return GovernorTypeData(
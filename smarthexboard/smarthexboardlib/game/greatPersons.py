@@ -1,7 +1,7 @@
 import random
 from typing import Optional, List
 
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.core.types import EraType
 
 
@@ -159,6 +159,7 @@ class GreatPerson(ExtendedEnum):
 	def greatPersonType(self) -> GreatPersonType:
 		return self._data().greatPersonType
 
+	@memoizedData
 	def _data(self) -> GreatPersonData:
 		if self == GreatPerson.none:
 			return GreatPersonData(
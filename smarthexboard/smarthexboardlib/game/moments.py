@@ -7,7 +7,7 @@ from smarthexboard.smarthexboardlib.game.states.dedications import DedicationTyp
 from smarthexboard.smarthexboardlib.game.types import EraType
 from smarthexboard.smarthexboardlib.game.wonders import WonderType
 from smarthexboard.smarthexboardlib.map.types import FeatureType
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 
 
 class MomentCategory(ExtendedEnum):
@@ -214,6 +214,7 @@ class MomentType(ExtendedEnum):
 	def maxEra(self) -> EraType:
 		return self._data().maxEra
 
+	@memoizedData
 	def _data(self) -> MomentTypeData:
 		# major
 		# admiralDefeatsEnemy  # 1 #
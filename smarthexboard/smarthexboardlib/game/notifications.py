@@ -7,7 +7,7 @@ from smarthexboard.smarthexboardlib.game.moments import MomentType
 from smarthexboard.smarthexboardlib.game.religions import PantheonType, ReligionType
 from smarthexboard.smarthexboardlib.game.wonders import WonderType
 from smarthexboard.smarthexboardlib.map.base import HexPoint
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
 
 
@@ -186,6 +186,7 @@ class NotificationType(ExtendedEnum):
 	def message(self) -> str:
 		return self._data().message
 
+	@memoizedData
 	def _data(self) -> NotificationTypeData:
 		if self == NotificationType.turn:  # 0
 			return NotificationTypeData(
@@ -4,7 +4,7 @@ import sys
 from functools import reduce
 from typing import Optional, List
 
-from smarthexboard.smarthexboardlib.core.base import WeightedBaseList, ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import WeightedBaseList, ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.game.ai.baseTypes import PlayerStateAllWars, WarGoalType, MilitaryStrategyType
 from smarthexboard.smarthexboardlib.game.ai.diplomaticTypes import DiplomaticStatementType, DiplomaticDeal, MajorCivOpinionType, \
 	MinorPlayerApproachType, PeaceTreatyType, MajorPlayerApproachType, GuessConfidenceType, CoopWarStateType, \
@@ -753,6 +753,7 @@ class ApproachModifierType(ExtendedEnum):
 	def reductionValue(self) -> int:
 		return self._data().reductionValue
 
+	@memoizedData
 	def _data(self) -> ApproachModifierTypeData:
 		if self == ApproachModifierType.delegation:
 			return ApproachModifierTypeData(
@@ -907,6 +908,7 @@ class DiplomaticAIPlayerItem:
 		self.warmongerThreatValue: MilitaryThreatType = MilitaryThreatType.none
 
 		self.hasDelegationValue: bool = False
+		self.delegationSightValue: List[HexPoint] = []
 		self.hasEmbassyValue: bool = False
 
 		self.landDisputeLevel: DisputeLevelType = DisputeLevelType.none
@@ -1232,6 +1234,24 @@ class DiplomaticPlayerDict:
 
 		raise Exception("not gonna happen")
 
+	def delegationSightTo(self, otherPlayer) -> List[HexPoint]:
+		"""points sighted by the delegation to otherPlayer - concealed again when the delegation is revoked"""
+		item: Optional[DiplomaticAIPlayerItem] = self._itemOf(otherPlayer)
+
+		if item is not None:
+			return item.delegationSightValue
+
+		return []
+
+	def updateDelegationSightTo(self, otherPlayer, points: List[HexPoint]):
+		item: Optional[DiplomaticAIPlayerItem] = self._itemOf(otherPlayer)
+
+		if item is not None:
+			item.delegationSightValue = points
+			return
+
+		raise Exception("not gonna happen")
+
 	def hasEstablishedEmbassyTo(self, otherPlayer) -> bool:
 		item: Optional[DiplomaticAIPlayerItem] = self._itemOf(otherPlayer)
 
@@ -2829,7 +2849,8 @@ class DiplomaticAI:
 
 			# sight capital - our guys are there
 			capital = simulation.capitalOf(otherPlayer)
-			simulation.sightAt(capital.location, sight=3, player=self.player)
+			sightedPoints = simulation.sightAt(capital.location, sight=3, player=self.player)
+			self.playerDict.updateDelegationSightTo(otherPlayer, sightedPoints)
 
 			# update access level
 			self.increaseAccessLevelTowards(otherPlayer)
@@ -2866,11 +2887,12 @@ class DiplomaticAI:
 		playerDiplomacy = self.player.diplomacyAI
 
 		self.playerDict.sendDelegationTo(otherPlayer, send=False)
-		self.playerDict.removeApproachTowards(self.player, ApproachModifierType.delegation)
+		self.playerDict.removeApproachTowards(otherPlayer, ApproachModifierType.delegation)
 
-		# conceal capital - our guys are no longer there
-		capital = simulation.capitalOf(otherPlayer)
-		simulation.conceal(capital.location, sight=3, player=self.player)
+		# conceal capital - our guys are no longer there (exactly the tiles they sighted, the capital may be gone)
+		sightedPoints = self.playerDict.delegationSightTo(otherPlayer)
+		simulation.concealAt(None, sight=3, player=self.player, points=sightedPoints)
+		self.playerDict.updateDelegationSightTo(otherPlayer, [])
 
 		# update access level
 		playerDiplomacy.decreaseAccessLevelTowards(otherPlayer)
@@ -5856,6 +5878,9 @@ class DiplomaticAI:
 
 		self.playerDict.declaredWarTowards(otherPlayer, simulation.currentTurn)
 
+		# units of both players no longer block each others paths
+		simulation.clearPathCache()
+
 		# inform player that some declared war
 		if otherPlayer.isHuman():
 			self.player.notifications.addNotification(NotificationType.war, leader=otherPlayer.leader)
@@ -48,7 +48,7 @@ from smarthexboard.smarthexboardlib.game.states.ages import AgeType, AgeThreshol
 from smarthexboard.smarthexboardlib.game.states.builds import BuildType
 from smarthexboard.smarthexboardlib.game.states.dedications import DedicationType
 from smarthexboard.smarthexboardlib.game.states.gossips import GossipType
-from smarthexboard.smarthexboardlib.game.states.ui import ScreenType, PopupType, TooltipType
+from smarthexboard.smarthexboardlib.game.states.ui import ScreenType, PopupType, TooltipType, TurnPhase
 from smarthexboard.smarthexboardlib.game.states.victories import VictoryType
 from smarthexboard.smarthexboardlib.game.tradeRoutes import TradeRoutes, TradeRoute, TradeRoutePathfinderDataSource
 from smarthexboard.smarthexboardlib.game.types import EraType, TechType, CivicType
@@ -2233,6 +2233,11 @@ class MinorCivAI:
 class Player:
 	BaseStockPileAmount = 50
 
+	# cached stable hash (see __hash__)
+	_hashValue: Optional[int] = None
+	_hashLeader: Optional[LeaderType] = None
+	_hashCityState: Optional[CityStateType] = None
+
 	def __init__(self, leader: Union[LeaderType, dict], cityState: Optional[CityStateType]=None, human: bool=False):
 		if isinstance(leader, LeaderType):
 			self.leader = leader
@@ -2436,13 +2441,20 @@ class Player:
 			return f'Player({self.leader}, {self.leader.civilization()}, AI, {meta_str})'
 
 	def __hash__(self):
+		# the stable hash is only computed again, when leader or cityState were re-assigned
+		if self._hashValue is not None and self._hashLeader is self.leader and self._hashCityState is self.cityState:
+			return self._hashValue
+
 		if not isinstance(self.leader, LeaderType):
 			raise Exception(f'leader is of type {type(self.leader)}')
 
 		if self.cityState is not None and not isinstance(self.cityState, CityStateType):
 			raise Exception(f'cityState is of type {type(self.cityState)}')
 
-		return stable_hash(f"{self.leader.name}_{self.cityState.name if self.cityState is not None else 'none'}")
+		self._hashValue = stable_hash(f"{self.leader.name}_{self.cityState.name if self.cityState is not None else 'none'}")
+		self._hashLeader = self.leader
+		self._hashCityState = self.cityState
+		return self._hashValue
 
 	def __eq__(self, other):
 		if isinstance(other, Player):
@@ -2531,6 +2543,7 @@ class Player:
 				self.grandStrategyAI.doTurn(simulation)
 
 				# Do diplomacy for toward everyone
+				simulation.userInterface.updateTurnProgress(self, TurnPhase.diplomacy)
 				self.diplomacyAI.doTurn(simulation)
 				self.governors.doTurn(simulation)
 
@@ -2573,6 +2586,7 @@ class Player:
 		self.doCityAmenities(simulation)
 
 		# Do turn for all Cities
+		simulation.userInterface.updateTurnProgress(self, TurnPhase.cities)
 		for city in simulation.citiesOf(self):
 			city.doTurn(simulation)
 
@@ -3105,7 +3119,9 @@ class Player:
 		else:
 			# Now let the tactical AI run.  Putting it after the operations update allows units who have
 			# just been handed off to the tactical AI to get a move in the same turn they switch between
+			simulation.userInterface.updateTurnProgress(self, TurnPhase.tactical)
 			self.tacticalAI.doTurn(simulation)
+			simulation.userInterface.updateTurnProgress(self, TurnPhase.homeland)
 			self.homelandAI.doTurn(simulation)
 
 	def verifyAlive(self, simulation):
@@ -3124,6 +3140,9 @@ class Player:
 	def numberOfUnits(self, simulation) -> int:
 		return len(simulation.unitsOf(player=self))
 
+	def numberOfDiscoveredPlots(self, simulation) -> int:
+		return simulation.numberOfDiscoveredPlotsBy(self)
+
 	def numberOfUnitsOfType(self, unitType: UnitType, simulation) -> int:
 		units = 0
 
@@ -3787,7 +3806,7 @@ class Player:
 				simulation.enableTutorial(Tutorials.none)
 
 	def newCityName(self, simulation):
-		possibleNames = self.leader.civilization().cityNames()
+		possibleNames = list(self.leader.civilization().cityNames())
 
 		if self.isCityState() and len(possibleNames) == 0:
 			possibleNames.append(self.cityState.title())
@@ -2,7 +2,7 @@ from typing import Optional, List
 
 from smarthexboard.smarthexboardlib.game.flavors import Flavor, FlavorType
 from smarthexboard.smarthexboardlib.game.types import CivicType, EraType
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 
 
 class PolicyCardSlotData:
@@ -20,6 +20,7 @@ class PolicyCardSlot(ExtendedEnum):
 	def name(self) -> str:
 		return self._data().name
 
+	@memoizedData
 	def _data(self) -> PolicyCardSlotData:
 		if self == PolicyCardSlot.diplomatic:
 			return PolicyCardSlotData(name='TXT_KEY_POLICY_CARD_TYPE_DIPLOMATIC_TITLE')
@@ -260,6 +261,7 @@ class PolicyCardType(ExtendedEnum):
 
 		return 0
 
+	@memoizedData
 	def _data(self) -> PolicyCardTypeData:
 		if self == PolicyCardType.none:
 			return PolicyCardTypeData(
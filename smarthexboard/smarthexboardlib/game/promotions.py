@@ -1,6 +1,6 @@
 from typing import Optional, List
 
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, contains, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, contains, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.game.flavors import Flavor, FlavorType
 from smarthexboard.smarthexboardlib.game.unitTypes import UnitClassType
 from smarthexboard.smarthexboardlib.map.types import FeatureType, UnitDomainType
@@ -317,6 +317,7 @@ class UnitPromotionType(ExtendedEnum):
 
 		return 0
 
+	@memoizedData
 	def _data(self) -> UnitPromotionTypeData:
 		if self == UnitPromotionType.embarkation:
 			return UnitPromotionTypeData(
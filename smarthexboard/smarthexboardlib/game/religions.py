@@ -1,6 +1,6 @@
 from typing import Optional, List
 
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.core.types import EraType
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
 from smarthexboard.smarthexboardlib.map.types import TerrainType, YieldType, FeatureType, ResourceType
@@ -190,6 +190,7 @@ class PantheonType(ExtendedEnum):
 	def districtProductionModifier(self) -> int:
 		return self._data().districtProductionModifier
 
+	@memoizedData
 	def _data(self) -> PantheonTypeData:
 		if self == PantheonType.none:
 			return PantheonTypeData(
@@ -462,6 +463,7 @@ class ReligionType(ExtendedEnum):
 	def title(self) -> str:
 		return self._data().name
 
+	@memoizedData
 	def _data(self) -> ReligionTypeData:
 		if self == ReligionType.none:
 			return ReligionTypeData(
@@ -622,6 +624,7 @@ class BeliefType(ExtendedEnum):
 	def greatPersonExpendedFaith(self) -> int:
 		return self._data().greatPersonExpendedFaith
 
+	@memoizedData
 	def _data(self) -> BeliefData:
 		if self == BeliefType.none:
 			return BeliefData(
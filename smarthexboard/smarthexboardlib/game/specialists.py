@@ -1,4 +1,4 @@
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.map.types import Yields
 
 
@@ -31,6 +31,7 @@ class SpecialistType(ExtendedEnum):
 	def yields(self) -> Yields:
 		return self._data().yields
 
+	@memoizedData
 	def _data(self) -> SpecialistTypeData:
 		if self == SpecialistType.none:
 			return SpecialistTypeData(
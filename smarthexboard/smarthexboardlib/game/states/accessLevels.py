@@ -1,4 +1,4 @@
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.utils.translation import gettext_lazy as _
 
 
@@ -42,6 +42,7 @@ class AccessLevel(ExtendedEnum):
 
 		return False
 
+	@memoizedData
 	def _data(self) -> AccessLevelData:
 		if self == AccessLevel.none:
 			return AccessLevelData(
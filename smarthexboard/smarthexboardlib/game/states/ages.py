@@ -1,4 +1,4 @@
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 
 
 class AgeThresholds:
@@ -24,6 +24,7 @@ class AgeType(ExtendedEnum):
 	def title(self) -> str:  # cannot be 'name
 		return self._data().name
 
+	@memoizedData
 	def _data(self) -> AgeTypeData:
 		if self == AgeType.normal:
 			return AgeTypeData(
@@ -4,7 +4,7 @@ from typing import Optional
 from smarthexboard.smarthexboardlib.game.types import TechType, EraType
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
 from smarthexboard.smarthexboardlib.map.types import FeatureType, RouteType
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, memoizedData
 
 
 class BuildTypeData:
@@ -133,6 +133,7 @@ class BuildType(ExtendedEnum):
 	def isKill(self) -> bool:
 		return self._data().isKill
 
+	@memoizedData
 	def _data(self) -> BuildTypeData:
 		# https://civilization.fandom.com/wiki/Module:Data/Civ5/BNW/Builds
 		if self == BuildType.none:
@@ -1,7 +1,7 @@
 from typing import List
 
 from smarthexboard.smarthexboardlib.game.types import EraType
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 
 
 class DedicationTypeData:
@@ -39,6 +39,7 @@ class DedicationType(ExtendedEnum):
 	def eras(self) -> [EraType]:
 		return self._data().eras
 
+	@memoizedData
 	def _data(self):
 		if self == DedicationType.monumentality:
 			return DedicationTypeData(
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, memoizedData
 from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
 from smarthexboard.smarthexboardlib.game.districts import DistrictType
 from smarthexboard.smarthexboardlib.game.states.accessLevels import AccessLevel
@@ -64,6 +64,7 @@ class GossipType(ExtendedEnum):
 	def accessLevel(self) -> AccessLevel:
 		return self._data().accessLevel
 
+	@memoizedData
 	def _data(self) -> GossipTypeData:
 		# AccessLevel: none
 		if self == GossipType.cityConquests:
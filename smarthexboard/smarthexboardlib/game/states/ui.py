@@ -38,6 +38,53 @@ class PopupType(ExtendedEnum):
 	foreignCityRevolted = 'foreignCityRevolted'
 
 
+class TurnPhase(ExtendedEnum):
+	diplomacy = 'diplomacy'
+	cities = 'cities'
+	tactical = 'tactical'
+	homeland = 'homeland'
+
+
+class MapChangeLog:
+	"""
+		points of the map where tiles, units or cities changed - by turn
+
+		the log is not persisted: a loaded game only knows the changes of the turns after it was loaded (see changedSince).
+	"""
+	maxTurns = 10  # number of turns that are kept
+
+	def __init__(self, turn: int = 0):
+		self.turn = turn
+		self.firstTurn = turn  # the changes before this turn are not known
+		self._points: dict[int, set] = dict()
+
+	def record(self, point: HexPoint):
+		self._points.setdefault(self.turn, set()).add(point)
+
+	def setTurn(self, turn: int):
+		self.turn = turn
+
+		for oldTurn in [loopTurn for loopTurn in self._points.keys() if loopTurn <= turn - MapChangeLog.maxTurns]:
+			del self._points[oldTurn]
+
+		self.firstTurn = max(self.firstTurn, turn - MapChangeLog.maxTurns + 1)
+
+	def changedSince(self, turn: int) -> Optional[set]:
+		"""
+			@param turn: first turn of the changes
+			@return: points that changed in this turn or later - None if the changes of the turn are not known
+		"""
+		if turn < self.firstTurn:
+			return None
+
+		points = set()
+		for loopTurn, loopPoints in self._points.items():
+			if loopTurn >= turn:
+				points |= loopPoints
+
+		return points
+
+
 class Interface:
 	def __init__(self):
 		pass
@@ -99,3 +146,6 @@ class Interface:
 
 	def updateGameData(self):
 		pass
+
+	def updateTurnProgress(self, player, phase: TurnPhase):
+		pass
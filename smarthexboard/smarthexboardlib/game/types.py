@@ -1,6 +1,6 @@
 from typing import List
 
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, memoizedData
 from smarthexboard.smarthexboardlib.core.types import EraType
 from smarthexboard.smarthexboardlib.game.flavors import Flavor, FlavorType
 from gettext import gettext as _
@@ -172,6 +172,7 @@ class TechType(ExtendedEnum):
 
 		return leadingTo
 
+	@memoizedData
 	def _data(self):
 		if self == TechType.none:
 			return TechTypeData(
@@ -1513,6 +1514,7 @@ class CivicType(ExtendedEnum):
 
 		return 0
 
+	@memoizedData
 	def _data(self):
 		# default
 		if self == CivicType.none:
@@ -6,7 +6,7 @@ from smarthexboard.smarthexboardlib.game.flavors import Flavor, FlavorType
 from smarthexboard.smarthexboardlib.game.states.builds import BuildType
 from smarthexboard.smarthexboardlib.game.types import EraType, TechType, CivicType
 from smarthexboard.smarthexboardlib.map.types import UnitMovementType, ResourceType, UnitDomainType
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 from smarthexboard.smarthexboardlib.utils.translation import gettext_lazy as _
 
 
@@ -144,6 +144,7 @@ class UnitClassType(ExtendedEnum):
 	def domain(self) -> UnitDomainType:
 		return self._data().domain
 
+	@memoizedData
 	def _data(self) -> UnitClassTypeData:
 		if self == UnitClassType.civilian:
 			return UnitClassTypeData(
@@ -246,8 +247,7 @@ class BitArray(bytearray):
 	def fill(self, val):
 		assert val in self.valid_values
 		val = 0 if val == 0 else 255
-		for byte_idx in range(len(self)):
-			super().__setitem__(byte_idx, val)
+		super().__setitem__(slice(None), bytes([val]) * len(self))
 
 		return self
 
@@ -657,6 +657,7 @@ class UnitType(ExtendedEnum):
 		else:
 			return UnitMapType.combat
 
+	@memoizedData
 	def _data(self) -> UnitTypeData:
 		# https://civilization.fandom.com/wiki/Module:Data/Civ5/BNW/Unit_Values
 
@@ -1939,6 +1940,7 @@ class UnitMissionType(Enum):
 	def needsTarget(self) -> bool:
 		return self._data().needsTarget
 
+	@memoizedData
 	def _data(self) -> UnitMissionTypeData:
 		if self == UnitMissionType.found:
 			return UnitMissionTypeData(name='TXT_KEY_MISSION_FOUND_NAME', needsTarget=False)
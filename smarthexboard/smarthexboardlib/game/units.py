@@ -33,6 +33,7 @@ from smarthexboard.smarthexboardlib.map.base import HexPoint, HexArea, HexDirect
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
 from smarthexboard.smarthexboardlib.map.path_finding.finder import AStarPathfinder
 from smarthexboard.smarthexboardlib.map.path_finding.path import HexPath
+from smarthexboard.smarthexboardlib.map.path_finding.reachability import ReachabilityMap
 from smarthexboard.smarthexboardlib.map.types import UnitDomainType, YieldType, ResourceType, RouteType, FeatureType, TerrainType
 from smarthexboard.smarthexboardlib.utils.plugin import Tests
 
@@ -210,6 +211,7 @@ class Unit:
 			self._deployFromOperationTurnValue: int = 0
 
 			self._noDefensiveBonusCount: int = 0
+			self._sightedPointsValue: Optional[List[HexPoint]] = None
 
 			self.unitMoved = None
 		elif isinstance(location, dict):
@@ -260,6 +262,7 @@ class Unit:
 			self._deployFromOperationTurnValue: int = unit_dict['_deployFromOperationTurnValue']
 
 			self._noDefensiveBonusCount: int = unit_dict['_noDefensiveBonusCount']
+			self._sightedPointsValue: Optional[List[HexPoint]] = None
 
 			self.unitMoved = None
 		else:
@@ -1231,7 +1234,7 @@ class Unit:
 		# self.set(lastMoveTurn: gameModel.turnSlice())
 		oldCity = simulation.cityAt(oldPlot.point)
 
-		self.location = newLocation
+		simulation.moveUnit(self, newLocation)
 		if self.unitMoved is not None:
 			self.unitMoved(newLocation)
 
@@ -1910,6 +1913,16 @@ class Unit:
 
 		return sightValue
 
+	def sightedPoints(self) -> Optional[List[HexPoint]]:
+		"""
+			points the unit currently sees (set by GameModel.sightAt) - concealAt hides exactly these, even if the
+			sight, the promotions or the terrain changed in between. None if the unit has not sighted yet
+		"""
+		return self._sightedPointsValue
+
+	def setSightedPoints(self, points: Optional[List[HexPoint]]):
+		self._sightedPointsValue = points
+
 	def doAttackInto(self, destination: HexPoint, steps: int, simulation) -> bool:
 		"""Returns true if attack was made...
 			UnitAttack in civ5"""
@@ -2988,6 +3001,11 @@ class Unit:
 		pathFinder = AStarPathfinder(pathFinderDataSource)
 		return pathFinder.turnsToReachTarget(self, point, simulation)
 
+	def reachabilityMap(self, turns: int, simulation) -> ReachabilityMap:
+		"""turns / paths to all tiles this unit can reach in the given number of turns (from one search)"""
+		pathFinderDataSource = simulation.unitAwarePathfinderDataSource(self)
+		return ReachabilityMap(pathFinderDataSource, self.location, self.maxMoves(simulation), maxTurns=turns)
+
 	def numberOfAttacksPerTurn(self, simulation) -> int:
 		numberOfAttacksPerTurnValue: int = 0
 
@@ -3018,7 +3036,19 @@ class Unit:
 		if promotionType.tier() == 4:
 			self.player.addMoment(MomentType.unitPromotedWithDistinction, simulation=simulation)
 
-		if self._promotions.earnPromotion(promotionType):
+		# sentry, spyglass and rutter change what the unit sees
+		changesSight: bool = promotionType in [UnitPromotionType.sentry, UnitPromotionType.spyglass,
+											   UnitPromotionType.rutter] and self.sightedPoints() is not None
+
+		if changesSight:
+			simulation.concealAt(self.location, sight=self.sight(), unit=self, player=self.player)
+
+		earned: bool = self._promotions.earnPromotion(promotionType)
+
+		if changesSight:
+			simulation.sightAt(self.location, sight=self.sight(), unit=self, player=self.player)
+
+		if earned:
 			# also heal completely
 			self.setHealthPoints(self.maxHealthPoints())
 			return True
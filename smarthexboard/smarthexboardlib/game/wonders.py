@@ -9,7 +9,7 @@ from smarthexboard.smarthexboardlib.game.types import CivicType, TechType, EraTy
 from smarthexboard.smarthexboardlib.map.base import HexPoint
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
 from smarthexboard.smarthexboardlib.map.types import Yields, FeatureType, TerrainType, ResourceType
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 
 
 class WonderTypeData:
@@ -244,6 +244,7 @@ class WonderType(ExtendedEnum):
 
 		return 0
 
+	@memoizedData
 	def _data(self) -> WonderTypeData:
 		# https://civilization.fandom.com/wiki/Module:Data/Civ6/GS/Buildings
 
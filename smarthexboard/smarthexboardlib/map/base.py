@@ -1,6 +1,7 @@
 import math
 import uuid
-from typing import Optional, Union, List
+from array import array
+from typing import Optional, Union, List, Tuple
 
 from smarthexboard.smarthexboardlib.core.base import ExtendedEnum
 
@@ -362,12 +363,100 @@ class HexDirection(ExtendedEnum):
 		return f'[HexDirection {self.value}]'
 
 
+def _cubeOf(x: int, y: int) -> Tuple[int, int, int]:
+	"""cube coordinates (q, r, s) of an even-q offset point"""
+	q = x - (y + (y & 1)) // 2
+	return q, -q - y, y
+
+
+def _pointOf(q: int, s: int) -> Tuple[int, int]:
+	"""even-q offset point of cube coordinates"""
+	return q + (s + (s & 1)) // 2, s
+
+
+def _offsetsWithin(parity: int, radius: int, ring_only: bool) -> List[Tuple[int, int]]:
+	"""offsets (dx, dy) of all points within (or exactly at) radius of a point with the given row parity"""
+	center_q, center_r, center_s = _cubeOf(0, parity)
+	offsets = []
+
+	for dq in range(-radius, radius + 1):
+		for dr in range(max(-radius, -dq - radius), min(radius, -dq + radius) + 1):
+			ds = -dq - dr
+			if ring_only and max(abs(dq), abs(dr), abs(ds)) != radius:
+				continue
+
+			x, y = _pointOf(center_q + dq, center_s + ds)
+			offsets.append((x, y - parity))
+
+	return offsets
+
+
+_directionOrder = [
+	HexDirection.north,
+	HexDirection.northEast,
+	HexDirection.southEast,
+	HexDirection.south,
+	HexDirection.southWest,
+	HexDirection.northWest
+]
+_directionIndex = {direction: index for index, direction in enumerate(_directionOrder)}
+
+
+def _neighborOffset(parity: int, direction: HexDirection) -> Tuple[int, int]:
+	"""offset (dx, dy) of the neighbor in direction of a point with the given row parity"""
+	center_q, _, center_s = _cubeOf(0, parity)
+	cube_direction = direction.cubeDirection()
+	x, y = _pointOf(center_q + cube_direction.q, center_s + cube_direction.s)
+	return x, y - parity
+
+
+# neighbor offsets (dx, dy) per row parity in the order of _directionOrder
+_neighborOffsets = [[_neighborOffset(parity, direction) for direction in _directionOrder] for parity in range(2)]
+
+# offsets of disks and rings per row parity and radius (0..HexGeometry.maxRadius)
+_diskOffsets = [[_offsetsWithin(parity, radius, ring_only=False) for radius in range(11)] for parity in range(2)]
+_ringOffsets = [[_offsetsWithin(parity, radius, ring_only=True) for radius in range(11)] for parity in range(2)]
+
+# line of sight templates per (row parity, radius) - see _lineOfSightOffsets
+_lineOfSightTemplates = dict()
+
+
+def _lineOfSightOffsets(parity: int, radius: int) -> List[Tuple[Tuple[int, int], List[Tuple[int, int]]]]:
+	"""
+		line of sight template of a point with the given row parity
+
+		for each offset within radius the offsets of the tiles between it and the center, that can block the
+		sight (the ray that Tile.canSeeTile walks from the target towards the center)
+	"""
+	template = _lineOfSightTemplates.get((parity, radius))
+	if template is not None:
+		return template
+
+	# walked around a center with positive coordinates (the screen positions are truncated towards zero)
+	center = HexPoint(50, 50 + parity)
+	template = []
+
+	for dx, dy in _offsetsWithin(parity, radius, ring_only=False):
+		target = HexPoint(center.x + dx, center.y + dy)
+		ray = []
+
+		if target != center:
+			tmpPoint = target
+			while not tmpPoint.isNeighborOf(center):
+				tmpPoint = tmpPoint.neighbor(tmpPoint.directionTowards(center))
+				ray.append((tmpPoint.x - center.x, tmpPoint.y - center.y))
+
+		template.append(((dx, dy), ray))
+
+	_lineOfSightTemplates[(parity, radius)] = template
+	return template
+
+
 class HexPoint(Point):
 	def __init__(self, x_or_hex_cube: Union[int, HexCube, dict, 'HexPoint'], y: Optional[int] = None):
 		if isinstance(x_or_hex_cube, int) and isinstance(y, int):
-			x = x_or_hex_cube
-			super().__init__(x, y)
-			self.x = x
+			# hot path - skip the validation of Point
+			self.x = x_or_hex_cube
 			self.y = y
 		elif isinstance(x_or_hex_cube, HexCube) and y is None:
 			hex_cube = x_or_hex_cube
@@ -388,6 +477,10 @@ class HexPoint(Point):
 			raise AttributeError(f'HexPoint with wrong attributes: {x_or_hex_cube} / {y}')
 
 	def neighbor(self, direction: HexDirection, distance: int = 1):
+		if distance == 1:
+			dx, dy = _neighborOffsets[self.y & 1][_directionIndex[direction]]
+			return HexPoint(self.x + dx, self.y + dy)
+
 		cube_direction = direction.cubeDirection()
 		cube_direction = cube_direction.mul(distance)
 
@@ -397,17 +490,13 @@ class HexPoint(Point):
 		return HexPoint(cube_neighbor)
 
 	def neighbors(self):
-		return [
-			self.neighbor(HexDirection.north),
-			self.neighbor(HexDirection.northEast),
-			self.neighbor(HexDirection.southEast),
-			self.neighbor(HexDirection.south),
-			self.neighbor(HexDirection.southWest),
-			self.neighbor(HexDirection.northWest)
-		]
+		"""returns the neighbors in the order north, north-east, south-east, south, south-west and north-west"""
+		x = self.x
+		y = self.y
+		return [HexPoint(x + dx, y + dy) for dx, dy in _neighborOffsets[y & 1]]
 
 	def isNeighborOf(self, other: HexPoint) -> bool:
-		return other in self.neighbors()
+		return self.distance(other) == 1
 
 	def directionTowards(self, target: HexPoint) -> HexDirection:
 		"""
@@ -415,8 +504,9 @@ class HexPoint(Point):
 			@param target:
 			@return:
 		"""
-		for direction in list(HexDirection):
-			if self.neighbor(direction, 1) == target:
+		delta = (target.x - self.x, target.y - self.y)
+		for direction, offset in zip(_directionOrder, _neighborOffsets[self.y & 1]):
+			if offset == delta:
 				return direction
 
 		angle = HexPoint.screenAngle(self, target)
@@ -454,12 +544,16 @@ class HexPoint(Point):
 
 		return HexDirection.north
 
-	def distance(self, target: HexPoint) -> int:
-		self_cube = HexCube(self)
-		hex_cube = HexCube(target)
-		return self_cube.distance(hex_cube)
+	def distance(self, target: HexPoint) -> float:
+		self_q = self.x - (self.y + (self.y & 1)) // 2
+		target_q = target.x - (target.y + (target.y & 1)) // 2
+		dq = self_q - target_q
+		ds = self.y - target.y
+		# float like the HexCube distance before
+		return float(max(abs(dq), abs(ds), abs(dq + ds)))
 
 	def areaWithRadius(self, radius: int):
+		# the neighbor set unions of HexArea define the order of the points (callers pick the first of equal scores)
 		return HexArea(self, radius)
 
 	def __hash__(self):
@@ -481,6 +575,147 @@ class HexPoint(Point):
 		return f'HexPoint({self.x}, {self.y})'
 
 
+class HexGeometry:
+	"""
+		precomputed geometry tables of a map size
+
+		holds one interned HexPoint per tile, a flat table with the indices of the six neighbors of each tile
+		(-1 if outside of the map) and the cube coordinates of each tile for O(1) distances
+	"""
+	maxRadius = 10
+	_instances = {}
+
+	def __init__(self, width: int, height: int):
+		self.width = width
+		self.height = height
+
+		size = width * height
+		self._points = [HexPoint(x, y) for y in range(height) for x in range(width)]
+		self._cubeQ = array('i', [0]) * size
+		self._cubeS = array('i', [0]) * size
+		self.neighborIndices = array('i', [-1]) * (size * 6)
+
+		for y in range(height):
+			for x in range(width):
+				index = y * width + x
+				self._cubeQ[index] = _cubeOf(x, y)[0]
+				self._cubeS[index] = y
+
+				for direction_index, (dx, dy) in enumerate(_neighborOffsets[y & 1]):
+					nx = x + dx
+					ny = y + dy
+					if 0 <= nx < width and 0 <= ny < height:
+						self.neighborIndices[index * 6 + direction_index] = ny * width + nx
+
+	@classmethod
+	def forSize(cls, width: int, height: int) -> 'HexGeometry':
+		"""returns the shared geometry tables of a map size"""
+		key = (width, height)
+		geometry = cls._instances.get(key)
+
+		if geometry is None:
+			geometry = cls(width, height)
+			cls._instances[key] = geometry
+
+		return geometry
+
+	def __repr__(self):
+		return f'HexGeometry({self.width}, {self.height})'
+
+	def valid(self, x: int, y: int) -> bool:
+		return 0 <= x < self.width and 0 <= y < self.height
+
+	def indexOf(self, point: HexPoint) -> int:
+		return point.y * self.width + point.x
+
+	def pointAt(self, index: int) -> HexPoint:
+		"""returns the interned point of the tile index"""
+		return self._points[index]
+
+	def point(self, x: int, y: int) -> HexPoint:
+		"""returns the interned point for points on the map, a new point otherwise"""
+		if 0 <= x < self.width and 0 <= y < self.height:
+			return self._points[y * self.width + x]
+
+		return HexPoint(x, y)
+
+	def neighborIndicesOf(self, index: int) -> List[int]:
+		"""returns the indices of the neighbors on the map (direction order, without tiles outside of the map)"""
+		return [neighbor_index for neighbor_index in self.neighborIndices[index * 6:index * 6 + 6] if neighbor_index >= 0]
+
+	def neighbors(self, point: HexPoint) -> List[HexPoint]:
+		"""returns the interned neighbors of point that are on the map"""
+		if not self.valid(point.x, point.y):
+			return [neighbor for neighbor in point.neighbors() if self.valid(neighbor.x, neighbor.y)]
+
+		points = self._points
+		return [points[neighbor_index] for neighbor_index in self.neighborIndicesOf(point.y * self.width + point.x)]
+
+	def distance(self, index_a: int, index_b: int) -> int:
+		"""distance of two tile indices"""
+		dq = self._cubeQ[index_a] - self._cubeQ[index_b]
+		ds = self._cubeS[index_a] - self._cubeS[index_b]
+		return max(abs(dq), abs(ds), abs(dq + ds))
+
+	def _pointsWith(self, point: HexPoint, offsets: List[Tuple[int, int]]) -> List[HexPoint]:
+		points = self._points
+		width = self.width
+		height = self.height
+		result = []
+
+		for dx, dy in offsets:
+			x = point.x + dx
+			y = point.y + dy
+			if 0 <= x < width and 0 <= y < height:
+				result.append(points[y * width + x])
+
+		return result
+
+	def ring(self, point: HexPoint, radius: int) -> List[HexPoint]:
+		"""returns the interned points on the map with exactly radius distance to point"""
+		if radius <= HexGeometry.maxRadius:
+			offsets = _ringOffsets[point.y & 1][radius]
+		else:
+			offsets = _offsetsWithin(point.y & 1, radius, ring_only=True)
+
+		return self._pointsWith(point, offsets)
+
+	def disk(self, point: HexPoint, radius: int) -> List[HexPoint]:
+		"""returns the interned points on the map within radius distance to point"""
+		if radius <= HexGeometry.maxRadius:
+			offsets = _diskOffsets[point.y & 1][radius]
+		else:
+			offsets = _offsetsWithin(point.y & 1, radius, ring_only=False)
+
+		return self._pointsWith(point, offsets)
+
+	def lineOfSight(self, point: HexPoint, radius: int) -> List[Tuple[int, List[int]]]:
+		"""
+			returns the indices of the tiles on the map within radius distance to point, each with the indices of
+			the tiles in between that can block the sight (tiles outside of the map are left out)
+		"""
+		width = self.width
+		height = self.height
+		result = []
+
+		for (dx, dy), ray in _lineOfSightOffsets(point.y & 1, radius):
+			x = point.x + dx
+			y = point.y + dy
+			if not (0 <= x < width and 0 <= y < height):
+				continue
+
+			rayIndices = []
+			for rx, ry in ray:
+				x = point.x + rx
+				y = point.y + ry
+				if 0 <= x < width and 0 <= y < height:
+					rayIndices.append(y * width + x)
+
+			result.append(((point.y + dy) * width + point.x + dx, rayIndices))
+
+		return result
+
+
 class Array2D:
 	"""class that stores a 2-dimensional matrix of complex or basic objects"""
 
@@ -2,13 +2,17 @@ import logging
 import math
 import random
 import sys
+from array import array
+from concurrent.futures import Executor
+from heapq import heappush, heappop
 from typing import Optional
 
+import numpy as np
+
 from smarthexboard.smarthexboardlib.game.cityStates import CityStateType
 from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
-from smarthexboard.smarthexboardlib.game.unitTypes import BitArray
 from smarthexboard.smarthexboardlib.map.areas import OceanType, ContinentType, Continent, Ocean
-from smarthexboard.smarthexboardlib.map.base import HexPoint, HexDirection, Array2D, HexArea
+from smarthexboard.smarthexboardlib.map.base import HexPoint, HexDirection, Array2D, HexArea, HexGeometry
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
 from smarthexboard.smarthexboardlib.map.map import MapModel, Tile
 from smarthexboard.smarthexboardlib.map.path_finding.finder import MoveTypeIgnoreUnitsOptions, MoveTypeIgnoreUnitsPathfinderDataSource, AStarPathfinder
@@ -21,51 +25,42 @@ from smarthexboard.smarthexboardlib.utils.translation import gettext_lazy as _
 
 # https://www.redblobgames.com/maps/terrain-from-noise/
 class HeightMap(Array2D):
-	def __init__(self, width: int, height: int, octaves: int = 4):
-		super().__init__(width, height, 0.0)
+	def __init__(self, width: int, height: int, octaves: int = 4, seed: Optional[int] = None):
+		# no Array2D.__init__ - the values are a numpy array (see _generate) and not nested lists
 		self.width = width
 		self.height = height
-		self._generate(octaves)
+		self._generate(octaves, seed)
 		self._normalize()
 
-	def _generate(self, octaves: int):
+	def _generate(self, octaves: int, seed: Optional[int]):
 		"""
-			generates the heightmap based on the input parameters
+			generates the heightmap based on the input parameters (all tiles at once)
 
 			@param octaves: object
+			@param seed: seed of the noise layers - random if None
 		"""
+		seeds = random.Random(seed).sample(range(1, 10 ** 5), 4) if seed is not None else [None] * 4
 
-		noise1 = PerlinNoise(octaves=1 * octaves)
-		noise2 = PerlinNoise(octaves=2 * octaves)
-		noise3 = PerlinNoise(octaves=4 * octaves)
-		noise4 = PerlinNoise(octaves=8 * octaves)
+		noise1 = PerlinNoise(octaves=1 * octaves, seed=seeds[0])
+		noise2 = PerlinNoise(octaves=2 * octaves, seed=seeds[1])
+		noise3 = PerlinNoise(octaves=4 * octaves, seed=seeds[2])
+		noise4 = PerlinNoise(octaves=8 * octaves, seed=seeds[3])
 
-		for x in range(self.width):
-			for y in range(self.height):
-				nx = float(x) / float(self.width)
-				ny = float(y) / float(self.height)
+		nx = np.arange(self.width, dtype=np.float64) / float(self.width)
+		ny = np.arange(self.height, dtype=np.float64) / float(self.height)
 
-				value0 = 1.00 * noise1.noise([nx, ny])
-				value1 = 0.50 * noise2.noise([nx, ny])
-				value2 = 0.25 * noise3.noise([nx, ny])
-				value3 = 0.125 * noise4.noise([nx, ny])
+		value0 = 1.00 * noise1.noiseGrid(nx, ny)
+		value1 = 0.50 * noise2.noiseGrid(nx, ny)
+		value2 = 0.25 * noise3.noiseGrid(nx, ny)
+		value3 = 0.125 * noise4.noiseGrid(nx, ny)
 
-				value = math.fabs(value0 + value1 + value2 + value3)  # / 1.875
-
-				self.values[y][x] = value
+		self.values = np.abs(value0 + value1 + value2 + value3)  # / 1.875
 
 	def _normalize(self):
-		min_value = 1000.0
-		max_value = -1000.0
-
-		for x in range(self.width):
-			for y in range(self.height):
-				min_value = min(min_value, self.values[y][x])
-				max_value = max(max_value, self.values[y][x])
+		min_value = self.values.min()
+		max_value = self.values.max()
 
-		for x in range(self.width):
-			for y in range(self.height):
-				self.values[y][x] = (self.values[y][x] - min_value) / (max_value - min_value)
+		self.values = (self.values - min_value) / (max_value - min_value)
 
 	def findThresholdAbove(self, percentage):
 		"""
@@ -74,20 +69,12 @@ class HeightMap(Array2D):
 			@param percentage: value to check
 			@return: heightmap value where percentage is above
 		"""
-		tmp_array = []
-
-		# fill from map
-		for x in range(self.width):
-			for y in range(self.height):
-				tmp_array.append(self.values[y][x])
-
-		# sorted smallest first, highest last
-		tmp_array.sort()
-		tmp_array.reverse()
+		tmp_array = np.asarray(self.values, dtype=np.float64).ravel()
 
-		threshold_index = math.floor(len(tmp_array) * percentage)
+		# index in descending order => index in ascending order
+		threshold_index = len(tmp_array) - 1 - math.floor(len(tmp_array) * percentage)
 
-		return tmp_array[threshold_index]
+		return float(np.partition(tmp_array, threshold_index)[threshold_index])
 
 
 class ResourcesInfo:
@@ -98,13 +85,14 @@ class ResourcesInfo:
 
 
 class MapOptions:
-	def __init__(self, mapSize: MapSize, mapType: MapType, leader: LeaderType, aiLeaders=None):
+	def __init__(self, mapSize: MapSize, mapType: MapType, leader: LeaderType, aiLeaders=None, seed: Optional[int] = None):
 		self.mapSize = mapSize
 		self.mapType = mapType
 		self.rivers = 20
 		self.age = MapAge.normal
 		self.leader = leader
 		self.aiLeaders = [] if aiLeaders is None else aiLeaders
+		self.seed = seed  # the same seed (and options) generate the same map - random if None
 
 	def mountains_percentage(self):
 		""" Percentage of mountain on land """
@@ -522,6 +510,81 @@ class StartPositioner:
 		self.startLocations = sorted(self.startLocations, key=lambda loc: 1 if loc.isHuman else 0)
 
 
+def _labelAreas(mapModel, members: bytearray, noArea: int) -> array:
+	"""
+		labels the connected areas of member tiles in one pass with a union-find
+
+		tiles are visited column by column and joined with their north, north-west and south-west neighbor.
+		The identifiers are assigned (lowest free first, at most 256) and merged like the former
+		replace passes did, so the continents and oceans of generated maps stay the same.
+
+		@param mapModel: map to label
+		@param members: flag per tile index, 1 if the tile belongs to an area
+		@param noArea: identifier of tiles without area
+		@return: identifier per tile index
+	"""
+	width = mapModel.width
+	height = mapModel.height
+	neighborIndices = mapModel.geometry.neighborIndices
+	size = width * height
+
+	parent = array('i', range(size))
+	labeled = bytearray(size)
+	rootIdentifier = dict()
+	identifierRoot = dict()
+	freeIdentifiers = list(range(256))  # heap
+
+	def find(index: int) -> int:
+		root = index
+		while parent[root] != root:
+			root = parent[root]
+
+		while parent[index] != root:
+			parent[index], index = root, parent[index]
+
+		return root
+
+	def identifierOf(index: int) -> int:
+		return rootIdentifier[find(index)] if index >= 0 and labeled[index] else noArea
+
+	def replace(oldIdentifier: int, newIdentifier: int):
+		oldRoot = identifierRoot.pop(oldIdentifier)
+		del rootIdentifier[oldRoot]
+		parent[oldRoot] = identifierRoot[newIdentifier]
+		heappush(freeIdentifiers, oldIdentifier)
+
+	for x in range(width):
+		for y in range(height):
+			index = y * width + x
+			if not members[index]:
+				continue
+
+			# directions: north, northEast, southEast, south, southWest, northWest
+			north = identifierOf(neighborIndices[index * 6 + 0])
+			northWest = identifierOf(neighborIndices[index * 6 + 5])
+			southWest = identifierOf(neighborIndices[index * 6 + 4])
+
+			joined = next((identifier for identifier in [north, northWest, southWest] if identifier != noArea), None)
+			if joined is not None:
+				parent[index] = identifierRoot[joined]
+				labeled[index] = 1
+			elif len(freeIdentifiers) > 0:
+				identifier = heappop(freeIdentifiers)
+				rootIdentifier[index] = identifier
+				identifierRoot[identifier] = index
+				labeled[index] = 1
+
+			# handle area joins
+			if north != noArea and northWest != noArea and north != northWest:
+				replace(northWest, north)
+			elif northWest != noArea and southWest != noArea and northWest != southWest:
+				replace(northWest, southWest)
+			elif north != noArea and southWest != noArea and north != southWest:
+				replace(north, southWest)
+
+	return array('i', [identifierOf(index) for index in range(size)])
+
+
 class ContinentFinder:
 	notAnalyzed = -2
 	noContinent = -1
@@ -534,28 +597,27 @@ class ContinentFinder:
 		return value != ContinentFinder.notAnalyzed and value != ContinentFinder.noContinent
 
 	def executeOn(self, mapModel):
-		for x in range(self.continentIdentifiers.width):
-			for y in range(self.continentIdentifiers.height):
-				self.evaluate(x, y, mapModel)
+		landTiles = mapModel.planes.terrain.mask(lambda terrain: terrain.isLand())
+		identifiers = _labelAreas(mapModel, landTiles, ContinentFinder.noContinent)
 
 		# wrap map
 		# if map?.wrapX ?? false {
 		#   for y in 0..<self.continentIdentifiers.height {
 		#       self.evaluate(x: 0, y: y, on: map)
 
-		continents = []
+		continents = dict()
 
 		for x in range(self.continentIdentifiers.width):
 			for y in range(self.continentIdentifiers.height):
-				continentIdentifier = self.continentIdentifiers.values[y][x]
+				continentIdentifier = identifiers[y * mapModel.width + x]
+				self.continentIdentifiers.values[y][x] = continentIdentifier
 
 				if self.evaluated(continentIdentifier):
-					continent = next((continentItem for continentItem in continents if
-									  continentItem.identifier == continentIdentifier), None)
+					continent = continents.get(continentIdentifier)
 
 					if continent is None:
 						continent = Continent(continentIdentifier, f'Continent {continentIdentifier})', mapModel)
-						continents.append(continent)
+						continents[continentIdentifier] = continent
 
 					mapModel.setContinent(continent, HexPoint(x, y))
 
@@ -563,7 +625,7 @@ class ContinentFinder:
 
 		# set continent types
 		availableContinentTypes = list(ContinentType)
-		for continent in continents:
+		for continent in continents.values():
 			if len(continent.points) < 10:
 				continue
 
@@ -571,66 +633,7 @@ class ContinentFinder:
 			continent.continentType = pickContinentType
 			availableContinentTypes.remove(pickContinentType)
 
-		return continents
-
-	def evaluate(self, x, y, mapModel):
-		currentPoint = HexPoint(x, y)
-
-		if mapModel.tileAt(currentPoint).terrain().isLand():
-			northPoint = currentPoint.neighbor(HexDirection.north)
-			nortwestPoint = currentPoint.neighbor(HexDirection.northWest)
-			southPoint = currentPoint.neighbor(HexDirection.southWest)
-
-			northContinent = self.continentIdentifiers.values[northPoint.y][northPoint.x] if mapModel.valid(
-				northPoint) else ContinentFinder.notAnalyzed
-			nortwestContinent = self.continentIdentifiers.values[nortwestPoint.y][nortwestPoint.x] if mapModel.valid(
-				nortwestPoint) else ContinentFinder.notAnalyzed
-			southContinent = self.continentIdentifiers.values[southPoint.y][southPoint.x] if mapModel.valid(
-				southPoint) else ContinentFinder.notAnalyzed
-
-			if self.evaluated(northContinent):
-				self.continentIdentifiers.values[y][x] = northContinent
-			elif self.evaluated(nortwestContinent):
-				self.continentIdentifiers.values[y][x] = nortwestContinent
-			elif self.evaluated(southContinent):
-				self.continentIdentifiers.values[y][x] = southContinent
-			else:
-				freeIdentifier = self.firstFreeIdentifier()
-				self.continentIdentifiers.values[y][x] = freeIdentifier
-
-			# handle continent joins
-			if self.evaluated(northContinent) and self.evaluated(
-				nortwestContinent) and northContinent != nortwestContinent:
-				self.replace(nortwestContinent, northContinent)
-			elif self.evaluated(nortwestContinent) and self.evaluated(
-				southContinent) and nortwestContinent != southContinent:
-				self.replace(nortwestContinent, southContinent)
-			elif self.evaluated(northContinent) and self.evaluated(southContinent) and northContinent != southContinent:
-				self.replace(northContinent, southContinent)
-		else:
-			self.continentIdentifiers.values[y][x] = ContinentFinder.noContinent
-
-	def firstFreeIdentifier(self):
-		freeIdentifiers = BitArray(256)
-		freeIdentifiers.fill(True)
-
-		for x in range(self.continentIdentifiers.width):
-			for y in range(self.continentIdentifiers.height):
-				continentIndex = self.continentIdentifiers.values[y][x]
-				if 0 <= continentIndex < 256:
-					freeIdentifiers[continentIndex] = False
-
-		for index in range(256):
-			if freeIdentifiers[index]:
-				return index
-
-		return ContinentFinder.noContinent
-
-	def replace(self, oldIdentifier: int, newIdentifier: int):
-		for x in range(self.continentIdentifiers.width):
-			for y in range(self.continentIdentifiers.height):
-				if self.continentIdentifiers.values[y][x] == oldIdentifier:
-					self.continentIdentifiers.values[y][x] = newIdentifier
+		return list(continents.values())
 
 
 class OceanFinder:
@@ -645,28 +648,27 @@ class OceanFinder:
 		return value != ContinentFinder.notAnalyzed and value != ContinentFinder.noContinent
 
 	def executeOn(self, mapModel):
-		for x in range(self.oceanIdentifiers.width):
-			for y in range(self.oceanIdentifiers.height):
-				self.evaluate(x, y, mapModel)
+		waterTiles = mapModel.planes.terrain.mask(lambda terrain: terrain.isWater())
+		identifiers = _labelAreas(mapModel, waterTiles, OceanFinder.noContinent)
 
 		# wrap map
 		# if map?.wrapX ?? false {
 		#   for y in 0..<self.continentIdentifiers.height {
 		#       self.evaluate(x: 0, y: y, on: map)
 
-		oceans = []
+		oceans = dict()
 
 		for x in range(self.oceanIdentifiers.width):
 			for y in range(self.oceanIdentifiers.height):
-				oceanIdentifier = self.oceanIdentifiers.values[y][x]
+				oceanIdentifier = identifiers[y * mapModel.width + x]
+				self.oceanIdentifiers.values[y][x] = oceanIdentifier
 
 				if self.evaluated(oceanIdentifier):
-					ocean = next((oceanItem for oceanItem in oceans if
-								  oceanItem.identifier == oceanIdentifier), None)
+					ocean = oceans.get(oceanIdentifier)
 
 					if ocean is None:
 						ocean = Ocean(oceanIdentifier, f'Ocean {oceanIdentifier})', mapModel)
-						oceans.append(ocean)
+						oceans[oceanIdentifier] = ocean
 
 					mapModel.setOcean(ocean, HexPoint(x, y))
 
@@ -674,7 +676,7 @@ class OceanFinder:
 
 		# set ocean types
 		availableOceanTypes = list(OceanType)
-		for ocean in oceans:
+		for ocean in oceans.values():
 			if len(ocean.points) < 10:
 				continue
 
@@ -682,71 +684,17 @@ class OceanFinder:
 			ocean.oceanType = pickOceanType
 			availableOceanTypes.remove(pickOceanType)
 
-		return oceans
-
-	def evaluate(self, x, y, mapModel):
-		currentPoint = HexPoint(x, y)
-
-		if mapModel.tileAt(currentPoint).terrain().isWater():
-			northPoint = currentPoint.neighbor(HexDirection.north)
-			northwestPoint = currentPoint.neighbor(HexDirection.northWest)
-			southPoint = currentPoint.neighbor(HexDirection.southWest)
-
-			northOcean = self.oceanIdentifiers.values[northPoint.y][northPoint.x] if mapModel.valid(
-				northPoint) else OceanFinder.notAnalyzed
-			northwestOcean = self.oceanIdentifiers.values[northwestPoint.y][northwestPoint.x] if mapModel.valid(
-				northwestPoint) else OceanFinder.notAnalyzed
-			southOcean = self.oceanIdentifiers.values[southPoint.y][southPoint.x] if mapModel.valid(
-				southPoint) else OceanFinder.notAnalyzed
-
-			if self.evaluated(northOcean):
-				self.oceanIdentifiers.values[y][x] = northOcean
-			elif self.evaluated(northwestOcean):
-				self.oceanIdentifiers.values[y][x] = northwestOcean
-			elif self.evaluated(southOcean):
-				self.oceanIdentifiers.values[y][x] = southOcean
-			else:
-				freeIdentifier = self.firstFreeIdentifier()
-				self.oceanIdentifiers.values[y][x] = freeIdentifier
-
-			# handle continent joins
-			if self.evaluated(northOcean) and self.evaluated(
-				northwestOcean) and northOcean != northwestOcean:
-				self.replace(northwestOcean, northOcean)
-			elif self.evaluated(northwestOcean) and self.evaluated(
-				southOcean) and northwestOcean != southOcean:
-				self.replace(northwestOcean, southOcean)
-			elif self.evaluated(northOcean) and self.evaluated(southOcean) and northOcean != southOcean:
-				self.replace(northOcean, southOcean)
-		else:
-			self.oceanIdentifiers.values[y][x] = OceanFinder.noContinent
-
-	def firstFreeIdentifier(self):
-		freeIdentifiers = BitArray(256)
-		freeIdentifiers.fill(True)
-
-		for x in range(self.oceanIdentifiers.width):
-			for y in range(self.oceanIdentifiers.height):
-				oceanIndex = self.oceanIdentifiers.values[y][x]
-				if 0 <= oceanIndex < 256:
-					freeIdentifiers[oceanIndex] = False
-
-		for index in range(256):
-			if freeIdentifiers[index]:
-				return index
-
-		return OceanFinder.noContinent
-
-	def replace(self, oldIdentifier: int, newIdentifier: int):
-		for x in range(self.oceanIdentifiers.width):
-			for y in range(self.oceanIdentifiers.height):
-				if self.oceanIdentifiers.values[y][x] == oldIdentifier:
-					self.oceanIdentifiers.values[y][x] = newIdentifier
+		return list(oceans.values())
 
 
 class MapGenerator:
-	def __init__(self, options: MapOptions):
+	def __init__(self, options: MapOptions, executor: Optional[Executor] = None):
+		"""
+			@param options: options of the map
+			@param executor: executor (e.g. ProcessPoolExecutor) for the independent stages - sequential if None
+		"""
 		self.options = options
+		self.executor = executor
 		self.width = options.mapSize.size().width()
 		self.height = options.mapSize.size().height()
 
@@ -767,11 +715,36 @@ class MapGenerator:
 		self.spring_locations = []
 
 	def generate(self, callback):
+		if self.options.seed is None:
+			self.options.seed = random.randint(1, 10 ** 9)
+
+		logging.info(f'generate map with seed: {self.options.seed}')
+
+		# all stages use the (global) random module - it is seeded for the generation and restored afterward
+		state = random.getstate()
+		random.seed(self.options.seed)
+
+		try:
+			return self._generate(callback)
+		finally:
+			random.setstate(state)
+
+	def _generate(self, callback):
 		callback(MapGeneratorState(0.0, _("TXT_KEY_MAP_GENERATOR_START")))
 		mapModel = MapModel(self.width, self.height)
 
-		height_map = self._generateHeightMap()
-		moisture_map = HeightMap(self.width, self.height)
+		# the noise fields are independent - they get their own seeds and can be generated in parallel
+		heightSeed = random.randint(1, 10 ** 9)
+		moistureSeed = random.randint(1, 10 ** 9)
+
+		if self.executor is not None:
+			heightFuture = self.executor.submit(HeightMap, self.width, self.height, self._heightMapOctaves(), heightSeed)
+			moistureFuture = self.executor.submit(HeightMap, self.width, self.height, 4, moistureSeed)
+			height_map = heightFuture.result()
+			moisture_map = moistureFuture.result()
+		else:
+			height_map = HeightMap(self.width, self.height, self._heightMapOctaves(), heightSeed)
+			moisture_map = HeightMap(self.width, self.height, 4, moistureSeed)
 
 		callback(MapGeneratorState(0.1, _("TXT_KEY_MAP_GENERATOR_INITED")))
 
@@ -861,15 +834,15 @@ class MapGenerator:
 
 		self._addGoodyHuts(map)
 
-	def _generateHeightMap(self):
+	def _heightMapOctaves(self) -> int:
 		if self.options.mapType == MapType.continents:
-			return HeightMap(self.width, self.height, 4)
+			return 4
 		elif self.options.mapType == MapType.pangaea:
-			return HeightMap(self.width, self.height, 2)
+			return 2
 		elif self.options.mapType == MapType.archipelago:
-			return HeightMap(self.width, self.height, 8)
+			return 8
 		else:
-			return HeightMap(self.width, self.height, 4)  # fallback
+			return 4  # fallback
 
 	def _fillFromElevation(self, height_map, threshold):
 
@@ -900,37 +873,66 @@ class MapGenerator:
 					self.climate_zones.values[y][x] = ClimateZone.tropic
 
 	def _prepareDistanceToCoast(self):
-		self.distance_to_coast.fill(sys.maxsize)
+		"""
+			distance of each tile to the sea in one propagation from the sea tiles
+
+			the distances are found in the order of the former sweeps over the map (column by column until
+			nothing changes): a tile is reached in the first sweep that visits it after one of its neighbors
+			got a distance. The land tiles are processed ordered by (sweep, position in sweep) so the
+			distances of generated maps stay the same.
+		"""
+		width = self.width
+		height = self.height
+		size = width * height
+		neighborIndices = HexGeometry.forSize(width, height).neighborIndices
+		unknown = sys.maxsize
+
+		# distance and time (sweep * size + position in sweep) when the distance was found per tile index
+		distances = [unknown] * size
+		found = [unknown] * size
+		events = []
+
+		for x in range(width):
+			for y in range(height):
+				if self.plots.values[y][x] == TerrainType.sea:
+					distances[y * width + x] = 0
+					found[y * width + x] = x * height + y  # all sea tiles are found in the first sweep
+
+		def schedule(index: int):
+			# land neighbors are found when they are visited next (this sweep or the next one)
+			for direction in range(6):
+				neighborIndex = neighborIndices[index * 6 + direction]
+				if neighborIndex < 0 or distances[neighborIndex] != unknown:
+					continue
 
-		action_happened = True
-		while action_happened:
-			# reset
-			action_happened = False
+				position = (neighborIndex % width) * height + neighborIndex // width
+				time = found[index] - found[index] % size + position
+				if time < found[index]:
+					time += size
 
-			for x in range(self.width):
-				for y in range(self.height):
-					# this needs to be analyzed
-					if self.distance_to_coast.values[y][x] == sys.maxsize:
-						# if field is ocean = > no distance
-						if self.plots.values[y][x] == TerrainType.sea:
-							self.distance_to_coast.values[y][x] = 0
-							action_happened = True
-						else:
-							# check neighbors
-							distance = sys.maxsize
-							point = HexPoint(x, y)
+				heappush(events, (time, neighborIndex))
+
+		for index in range(size):
+			if distances[index] == 0:
+				schedule(index)
 
-							for direction in list(HexDirection):
-								neighbor = point.neighbor(direction, 1)
+		while events:
+			time, index = heappop(events)
+			if distances[index] != unknown:
+				continue
 
-								if 0 <= neighbor.x < self.width and 0 <= neighbor.y < self.height:
-									if self.distance_to_coast.values[neighbor.y][neighbor.x] < sys.maxsize:
-										distance = min(distance,
-													   self.distance_to_coast.values[neighbor.y][neighbor.x] + 1)
+			distance = unknown
+			for direction in range(6):
+				neighborIndex = neighborIndices[index * 6 + direction]
+				if neighborIndex >= 0 and found[neighborIndex] < time:
+					distance = min(distance, distances[neighborIndex] + 1)
 
-							if distance < sys.maxsize:
-								self.distance_to_coast.values[y][x] = distance
-								action_happened = True
+			distances[index] = distance
+			found[index] = time
+			schedule(index)
+
+		for y in range(height):
+			self.distance_to_coast.values[y] = distances[y * width:(y + 1) * width]
 
 	def _refineClimate(self):
 		for x in range(self.width):
@@ -1265,22 +1267,20 @@ class MapGenerator:
 		logging.info("-------------------------------")
 
 		# Show number of resources placed
+		if not logging.getLogger().isEnabledFor(logging.INFO):
+			return
+
+		resources_placed = {}
+		for point in mapModel.points():
+			resource = mapModel.tileAt(point)._resourceValue
+			resources_placed[resource] = resources_placed.get(resource, 0) + 1
+
 		for resource in resources:
 
 			if resource == ResourceType.none:
 				continue
 
-			resource_placed = 0
-
-			for x in range(self.width):
-				for y in range(self.height):
-					point = HexPoint(x, y)
-					tile = mapModel.tileAt(point)
-
-					if tile._resourceValue == resource:
-						resource_placed += 1
-
-			logging.info(f'Counted {resource_placed} of {resource.title()} placed on map')
+			logging.info(f'Counted {resources_placed.get(resource, 0)} of {resource.title()} placed on map')
 
 	def _addNonUniqueResource(self, mapModel, resource):
 		resource_count = self._numberOfResourcesToAdd(mapModel, resource)
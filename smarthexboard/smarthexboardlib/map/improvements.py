@@ -4,7 +4,7 @@ from smarthexboard.smarthexboardlib.game.civilizations import CivilizationType
 from smarthexboard.smarthexboardlib.game.flavors import Flavor, FlavorType
 from smarthexboard.smarthexboardlib.game.types import TechType, CivicType
 from smarthexboard.smarthexboardlib.map.types import Yields, TerrainType, FeatureType, ResourceType
-from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.core.base import ExtendedEnum, InvalidEnumError, memoizedData
 
 
 class ImprovementTypeData:
@@ -94,6 +94,7 @@ class ImprovementType(ExtendedEnum):
 
 		return 0
 
+	@memoizedData
 	def _data(self) -> ImprovementTypeData:
 		if self == ImprovementType.none:
 			return ImprovementTypeData(
@@ -17,12 +17,16 @@ from smarthexboard.smarthexboardlib.game.unitTypes import UnitMapType
 from smarthexboard.smarthexboardlib.game.units import Unit
 from smarthexboard.smarthexboardlib.game.wonders import WonderType
 from smarthexboard.smarthexboardlib.map.areas import Continent, ContinentType, Ocean, OceanType
-from smarthexboard.smarthexboardlib.map.base import HexPoint, HexDirection, Size, Array2D, HexArea
+from smarthexboard.smarthexboardlib.map.base import HexPoint, HexDirection, Size, Array2D, HexArea, HexGeometry
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
+from smarthexboard.smarthexboardlib.map.movement import MovementCostTable
+from smarthexboard.smarthexboardlib.map.planes import TilePlanes
+from smarthexboard.smarthexboardlib.map.sight import SightTable
 from smarthexboard.smarthexboardlib.map.types import TerrainType, FeatureType, ResourceType, ClimateZone, RouteType, UnitMovementType, MapSize, \
 	Tutorials, Yields, AppealLevel, UnitDomainType, ResourceUsage, StartLocation, \
 	ArchaeologicalRecord, YieldType
 from smarthexboard.smarthexboardlib.core.base import WeightedBaseList, ExtendedEnum, InvalidEnumError
+from smarthexboard.smarthexboardlib.utils.plugin import Tests
 
 
 class WeightedBuildList(WeightedBaseList):
@@ -86,9 +90,6 @@ class TileBase(ABC):
 		pass
 
 
-_river_cache = {}
-
-
 class Tile(TileBase):
 	"""
 		class that holds a single tile of a Map
@@ -96,13 +97,20 @@ class Tile(TileBase):
 		it has a TerrainType, FeatureType, ResourceType and a boolean value for being hilly (or not)
 	"""
 
-	def __init__(self, point_or_dict: Union[HexPoint, dict], terrain: Optional[TerrainType] = None):
+	def __init__(self, point_or_dict: Union[HexPoint, dict], terrain: Optional[TerrainType] = None,
+	             planes: Optional[TilePlanes] = None):
 		"""
 			constructs a Tile from a TerrainType
 
 			@param point_or_dict: location of the tile or dict (from serialization)
 			@param terrain: TerrainType
+			@param planes: storage of the map this tile belongs to (a tile without map gets its own storage)
 		"""
+		self._planes = TilePlanes(1, 1) if planes is None else planes
+		self._planeIndex = 0
+		if planes is not None and isinstance(point_or_dict, HexPoint):
+			self._planeIndex = planes.indexOf(point_or_dict)
+
 		if isinstance(point_or_dict, HexPoint) and terrain is not None:
 			self.point = point_or_dict
 			self._terrainValue = terrain
@@ -131,7 +139,7 @@ class Tile(TileBase):
 			self._buildingWonderValue = WonderType.none
 			self._owner = None
 			self._workingCity = None
-			self._buildProgressList = WeightedBuildList()
+			self._buildProgressListValue = None
 			self._area = None
 		elif isinstance(point_or_dict, dict):
 			tmp_point = point_or_dict.get('point', {'x': -1, 'y': -1})
@@ -160,21 +168,146 @@ class Tile(TileBase):
 			self._wonderValue = point_or_dict.get('_wonderValue', WonderType.none)
 			self._owner = None  # fixme
 			self._workingCity = None  # fixme
-			self._buildProgressList = WeightedBuildList(point_or_dict.get('_buildProgressList', {}))
+			self._buildProgressListValue = WeightedBuildList(point_or_dict.get('_buildProgressList', {}))
 			self._area = None  # fixme
 		else:
 			raise Exception(f'unsupported combination: {point_or_dict}, {terrain}')
 
-		self._builderAIScratchPad = BuilderAIScratchPad()
-		self._archaeologicalRecordValue = ArchaeologicalRecord()
+		# rarely used - only allocated on first access
+		self._builderAIScratchPadValue = None
+		self._archaeologicalRecordValue = None
+
+	# values stored in the planes of the map
+	@property
+	def _terrainValue(self) -> TerrainType:
+		return self._planes.terrain[self._planeIndex]
+
+	@_terrainValue.setter
+	def _terrainValue(self, value: TerrainType):
+		self._planes.terrain[self._planeIndex] = value
+
+	@property
+	def _isHills(self) -> bool:
+		return self._planes.hills[self._planeIndex]
+
+	@_isHills.setter
+	def _isHills(self, value: bool):
+		self._planes.hills[self._planeIndex] = value
+
+	@property
+	def _featureValue(self) -> FeatureType:
+		return self._planes.feature[self._planeIndex]
+
+	@_featureValue.setter
+	def _featureValue(self, value: FeatureType):
+		self._planes.feature[self._planeIndex] = value
+
+	@property
+	def _resourceValue(self) -> ResourceType:
+		return self._planes.resource[self._planeIndex]
+
+	@_resourceValue.setter
+	def _resourceValue(self, value: ResourceType):
+		self._planes.resource[self._planeIndex] = value
+
+	@property
+	def _route(self) -> RouteType:
+		return self._planes.route[self._planeIndex]
+
+	@_route.setter
+	def _route(self, value: RouteType):
+		self._planes.route[self._planeIndex] = value
+
+	@property
+	def _riverValue(self) -> int:
+		return self._planes.river[self._planeIndex]
+
+	@_riverValue.setter
+	def _riverValue(self, value: int):
+		self._planes.river[self._planeIndex] = value
+
+	@property
+	def _improvementValue(self) -> ImprovementType:
+		return self._planes.improvement[self._planeIndex]
+
+	@_improvementValue.setter
+	def _improvementValue(self, value: ImprovementType):
+		self._planes.improvement[self._planeIndex] = value
+
+	@property
+	def _owner(self):
+		return self._planes.owner[self._planeIndex]
+
+	@_owner.setter
+	def _owner(self, value):
+		self._planes.owner[self._planeIndex] = value
+
+	@property
+	def continentIdentifier(self):
+		return self._planes.continent[self._planeIndex]
+
+	@continentIdentifier.setter
+	def continentIdentifier(self, value):
+		self._planes.continent[self._planeIndex] = value
+
+	@property
+	def discovered(self) -> dict:
+		"""players (by hash) that have discovered this tile"""
+		return {playerHash: True for playerHash, plane in self._planes.discovered.items() if plane[self._planeIndex] != 0}
+
+	@discovered.setter
+	def discovered(self, value: dict):
+		for playerHash, plane in self._planes.discovered.items():
+			plane[self._planeIndex] = 0
+			self._planes.sightChanged(playerHash)
+
+		for playerHash, discovered in value.items():
+			if discovered:
+				self._planes.discoveredPlane(int(playerHash))[self._planeIndex] = 1
+				self._planes.sightChanged(int(playerHash))
+
+	@property
+	def visible(self) -> dict:
+		"""players (by hash) this tile is currently visible to"""
+		return {playerHash: True for playerHash, plane in self._planes.visibility.items() if plane[self._planeIndex] > 0}
+
+	@visible.setter
+	def visible(self, value: dict):
+		"""sets the number of sight sources per player (by hash), True counts as one"""
+		for playerHash, plane in self._planes.visibility.items():
+			plane[self._planeIndex] = 0
+			self._planes.sightChanged(playerHash)
+
+		for playerHash, visible in value.items():
+			if visible:
+				if int(visible) > 255:
+					raise Exception(f'too many sight sources for tile {self.point}: {int(visible)}')
+
+				self._planes.visibilityPlane(int(playerHash))[self._planeIndex] = int(visible)
+				self._planes.sightChanged(int(playerHash))
+
+	# lazy values
+	@property
+	def _buildProgressList(self) -> WeightedBuildList:
+		if self._buildProgressListValue is None:
+			self._buildProgressListValue = WeightedBuildList()
+
+		return self._buildProgressListValue
+
+	@_buildProgressList.setter
+	def _buildProgressList(self, value: WeightedBuildList):
+		self._buildProgressListValue = value
+
+	@property
+	def _builderAIScratchPad(self) -> BuilderAIScratchPad:
+		if self._builderAIScratchPadValue is None:
+			self._builderAIScratchPadValue = BuilderAIScratchPad()
+
+		return self._builderAIScratchPadValue
 
 	def __repr__(self):
 		return f'Tile({self.point}, {self._terrainValue}, hills={self._isHills}, {self._featureValue}, {self._resourceValue})'
 
-	@staticmethod
-	def resetRiverCache():
-		_river_cache.clear()
-
 	def owner(self) -> Optional[Player]:
 		return self._owner
 
@@ -329,40 +462,23 @@ class Tile(TileBase):
 		return terrain_cost + hill_costs + feature_costs + river_cost
 
 	def isRiverToCrossTowards(self, target: TileBase) -> bool:
-		cache_key = f'{hash(self.point)}-{hash(target.point)}'
-		if cache_key in _river_cache:
-			return _river_cache[cache_key]
-
 		if not self.isNeighborTo(target.point):
-			_river_cache[cache_key] = False
 			return False
 
 		direction = self.point.directionTowards(target.point)
 
 		if direction == HexDirection.north:
-			tmp_value = self.isRiverInNorth()
-			_river_cache[cache_key] = tmp_value
-			return tmp_value
+			return self.isRiverInNorth()
 		elif direction == HexDirection.northEast:
-			tmp_value = self.isRiverInNorthEast()
-			_river_cache[cache_key] = tmp_value
-			return tmp_value
+			return self.isRiverInNorthEast()
 		elif direction == HexDirection.southEast:
-			tmp_value = self.isRiverInSouthEast()
-			_river_cache[cache_key] = tmp_value
-			return tmp_value
+			return self.isRiverInSouthEast()
 		elif direction == HexDirection.south:
-			tmp_value = target.isRiverInNorth()
-			_river_cache[cache_key] = tmp_value
-			return tmp_value
+			return target.isRiverInNorth()
 		elif direction == HexDirection.southWest:
-			tmp_value = target.isRiverInNorthEast()
-			_river_cache[cache_key] = tmp_value
-			return tmp_value
+			return target.isRiverInNorthEast()
 		elif direction == HexDirection.northWest:
-			tmp_value = target.isRiverInSouthEast()
-			_river_cache[cache_key] = tmp_value
-			return tmp_value
+			return target.isRiverInSouthEast()
 
 		raise InvalidEnumError(direction)
 
@@ -459,11 +575,14 @@ class Tile(TileBase):
 		return True
 
 	def isDiscoveredBy(self, player) -> bool:
-		return self.discovered.get(hash(player), False)
+		plane = self._planes.discovered.get(hash(player))
+		return plane is not None and plane[self._planeIndex] != 0
 
 	def discoverBy(self, player, simulation):
-		if not self.discovered.get(hash(player), False):
-			self.discovered[hash(player)] = True
+		plane = self._planes.discoveredPlane(hash(player))
+		if plane[self._planeIndex] == 0:
+			plane[self._planeIndex] = 1
+			self._planes.sightChanged(hash(player))
 
 			# tutorial
 			if simulation.tutorial() == Tutorials.movementAndExploration and player.isHuman():
@@ -476,17 +595,26 @@ class Tile(TileBase):
 		if player is None:
 			return False
 
-		return self.visible.get(hash(player), False)
+		plane = self._planes.visibility.get(hash(player))
+		return plane is not None and plane[self._planeIndex] > 0
 
 	def isVisibleToAny(self):
-		for visibleToPlayer in self.visible.values():
-			if visibleToPlayer:
+		for plane in self._planes.visibility.values():
+			if plane[self._planeIndex] > 0:
 				return True
 
 		return False
 
 	def sightBy(self, player):
-		self.visible[hash(player)] = True
+		"""adds a sight source of player to this tile (needs to be balanced by concealTo)"""
+		plane = self._planes.visibilityPlane(hash(player))
+		if plane[self._planeIndex] == 255:
+			# far more sources than can see one tile - sightBy and concealTo are out of balance
+			raise Exception(f'too many sight sources for tile {self.point} of player {player}')
+
+		plane[self._planeIndex] += 1
+		if plane[self._planeIndex] == 1:
+			self._planes.sightChanged(hash(player))
 
 	def canSeeTile(self, otherTile, player, radius: int, hasSentry: bool, simulation) -> bool:
 		if otherTile.point == self.point:
@@ -520,7 +648,12 @@ class Tile(TileBase):
 		return False
 
 	def concealTo(self, player):
-		self.visible[hash(player)] = False
+		"""removes a sight source of player - the tile is concealed when there is none left"""
+		plane = self._planes.visibility.get(hash(player))
+		if plane is not None and plane[self._planeIndex] > 0:
+			plane[self._planeIndex] -= 1
+			if plane[self._planeIndex] == 0:
+				self._planes.sightChanged(hash(player))
 
 	def isCity(self) -> bool:
 		return self._cityValue is not None
@@ -1030,13 +1163,6 @@ class Tile(TileBase):
 		if flow != FlowDirection.east and flow != FlowDirection.west:
 			raise Exception(f'{flow} unsupported in north')
 
-		# reset cache
-		target = self.point.neighbor(HexDirection.north)
-		cache_key = f'{hash(self.point)}-{hash(target)}'
-		del _river_cache[cache_key]
-		r_cache_key = f'{hash(target)}-{hash(self.point)}'
-		del _river_cache[r_cache_key]
-
 		if not self.isRiverIn(flow):
 			self._riverValue += int(flow._value_)
 
@@ -1046,13 +1172,6 @@ class Tile(TileBase):
 		if flow != FlowDirection.northEast and flow != FlowDirection.southWest:
 			raise Exception(f'{flow} unsupported in southEast')
 
-		# reset cache
-		target = self.point.neighbor(HexDirection.southEast)
-		cache_key = f'{hash(self.point)}-{hash(target)}'
-		del _river_cache[cache_key]
-		r_cache_key = f'{hash(target)}-{hash(self.point)}'
-		del _river_cache[r_cache_key]
-
 		if not self.isRiverIn(flow):
 			self._riverValue += int(flow._value_)
 
@@ -1062,16 +1181,6 @@ class Tile(TileBase):
 		if flow != FlowDirection.northWest and flow != FlowDirection.southEast:
 			raise Exception(f'{flow} unsupported in northEast')
 
-		# reset cache entries
-		target = self.point.neighbor(HexDirection.northEast)
-		cache_key = f'{hash(self.point)}-{hash(target)}'
-		if cache_key in _river_cache:
-			del _river_cache[cache_key]
-
-		r_cache_key = f'{hash(target)}-{hash(self.point)}'
-		if r_cache_key in _river_cache:
-			del _river_cache[r_cache_key]
-
 		if not self.isRiverIn(flow):
 			self._riverValue += int(flow._value_)
 
@@ -1151,12 +1260,16 @@ class Tile(TileBase):
 		return modifier
 
 	def addArchaeologicalRecord(self, artifact: ArtifactType, era: EraType, leader1: LeaderType, leader2: LeaderType):
-		self._archaeologicalRecordValue.artifactType = artifact
-		self._archaeologicalRecordValue.era = era
-		self._archaeologicalRecordValue.leader1 = leader1
-		self._archaeologicalRecordValue.leader2 = leader2
+		record = self.archaeologicalRecord()
+		record.artifactType = artifact
+		record.era = era
+		record.leader1 = leader1
+		record.leader2 = leader2
 
 	def archaeologicalRecord(self) -> ArchaeologicalRecord:
+		if self._archaeologicalRecordValue is None:
+			self._archaeologicalRecordValue = ArchaeologicalRecord()
+
 		return self._archaeologicalRecordValue
 
 	def possibleImprovements(self) -> [ImprovementType]:
@@ -1373,6 +1486,8 @@ class TileStatistics:
 
 
 class MapModel:
+	chunkSize = 16  # tiles per side of the chunks of the map api
+
 	def __init__(self, width_or_size: Union[Size, int, dict], height: Optional[int] = None):
 		self._numberOfLandPlotsValue = 0
 		self._numberOfWaterPlotsValue = 0
@@ -1392,14 +1507,22 @@ class MapModel:
 			self.height = dict_obj.get('height', 0)
 
 			tiles_dict = dict_obj.get('tiles', 0)
+			self.geometry = HexGeometry.forSize(self.width, self.height)
 			self.tiles = Array2D(self.width, self.height)
+			self.planes = TilePlanes(self.width, self.height)
+			self.movementCosts = MovementCostTable(self)
+			self.sightTable = SightTable(self)
 
 			for y in range(self.height):
 				for x in range(self.width):
-					self.tiles.values[y][x] = tiles_dict[y][x]
+					tile = tiles_dict[y][x]
+					self.planes.adopt(tile, y * self.width + x)
+					self.tiles.values[y][x] = tile
 
 			self._cities = dict_obj.get('_cities', [])
 			self._units = dict_obj.get('_units', [])
+			self.unitsVersion: int = 0
+			self.rebuildIndexes()
 
 			startLocations_list = dict_obj.get('startLocations', [])
 			self.startLocations = []
@@ -1489,15 +1612,21 @@ class MapModel:
 			raise AttributeError(f'Map with wrong attributes: {width_or_size} / {height}')
 
 	def _initialize(self):
+		self.geometry = HexGeometry.forSize(self.width, self.height)
 		self.tiles = Array2D(self.width, self.height)
+		self.planes = TilePlanes(self.width, self.height)
+		self.movementCosts = MovementCostTable(self)
+		self.sightTable = SightTable(self)
 
-		# create a unique Tile per place
+		# create a unique Tile per place - backed by the planes
 		for y in range(self.height):
 			for x in range(self.width):
-				self.tiles.values[y][x] = Tile(HexPoint(x, y), TerrainType.ocean)
+				self.tiles.values[y][x] = Tile(HexPoint(x, y), TerrainType.ocean, planes=self.planes)
 
 		self._cities = []
 		self._units = []
+		self.unitsVersion: int = 0
+		self.rebuildIndexes()
 		self.startLocations = []
 		self.cityStateStartLocations = []
 
@@ -1505,6 +1634,16 @@ class MapModel:
 		self.oceans = []
 		self.areas = []
 
+	def __getstate__(self):
+		# the geometry tables are shared per map size and rebuilt on demand
+		state = self.__dict__.copy()
+		state.pop('geometry', None)
+		return state
+
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+		self.geometry = HexGeometry.forSize(self.width, self.height)
+
 	def postProcess(self, simulation):
 		for unit in self._units:
 			unit.player = simulation.playerForHash(unit.playerHash)
@@ -1519,22 +1658,30 @@ class MapModel:
 				# self._workingCity = None  # fixme
 				# self._area = None  # fixme
 
-	def updateStatistics(self):
-		# reset
-		self._numberOfLandPlotsValue = 0
-		self._numberOfWaterPlotsValue = 0
+		# the players of the units changed
+		self.rebuildIndexes()
 
-		for x in range(self.width):
-			for y in range(self.height):
-				tile = self.tiles.values[y][x]
+	def updateStatistics(self):
+		self._numberOfWaterPlotsValue = self.planes.terrain.count(lambda terrain: terrain.isWater())
+		self._numberOfLandPlotsValue = len(self.planes.terrain) - self._numberOfWaterPlotsValue
 
-				if tile.isWater():
-					self._numberOfWaterPlotsValue += 1
-				else:
-					self._numberOfLandPlotsValue += 1
+	def assignHumanLeader(self, leader):
+		"""
+			changes the leader of the human start location (used for pre-generated maps)
+			if the leader already has an ai start location, the leaders switch places
 
+			@param leader: LeaderType of the human player
+		"""
+		humanLocation = next((location for location in self.startLocations if location.isHuman), None)
+		if humanLocation is None or humanLocation.leader == leader:
 			return
 
+		aiLocation = next((location for location in self.startLocations if location.leader == leader), None)
+		if aiLocation is not None:
+			aiLocation.leader = humanLocation.leader
+
+		humanLocation.leader = leader
+
 	# def save(self, filename: str) -> bool:
 
 	def valid(self, x_or_hex: Union[int, HexPoint], y: Optional[int] = None) -> bool:
@@ -1547,12 +1694,19 @@ class MapModel:
 		else:
 			raise AttributeError(f'Map.valid with wrong attributes: {x_or_hex} / {y}')
 
+	def visibleTilesFrom(self, location: HexPoint, sight: int, hasSentry: bool = False) -> List[Tile]:
+		"""tiles within sight of location that are not hidden by hills, forest or mountains (see Tile.canSeeTile)"""
+		width = self.width
+		tiles = self.tiles.values
+		return [tiles[index // width][index % width]
+		        for index in self.sightTable.visibleIndicesFrom(location, sight, hasSentry)]
+
 	def points(self) -> List[HexPoint]:
 		point_arr = []
 
 		for x in range(self.width):
 			for y in range(self.height):
-				point_arr.append(HexPoint(x, y))
+				point_arr.append(self.geometry.pointAt(y * self.width + x))
 
 		return point_arr
 
@@ -1737,12 +1891,9 @@ class MapModel:
 		if self.riverAt(x, y):
 			return True
 
-		for neighbors in HexPoint(x, y).neighbors():
+		for neighbors in self.geometry.neighbors(self.geometry.point(x, y)):
 			loopTile = self.tileAt(neighbors)
 
-			if loopTile is None:
-				continue
-
 			if loopTile._featureValue == FeatureType.lake:
 				return True
 
@@ -1752,47 +1903,176 @@ class MapModel:
 		return False
 
 	def capitalOf(self, player: Player) -> Optional[City]:
-		item = next((city for city in self._cities if city.player == player and city.isCapital()), None)
+		item = next((city for city in self._citiesByPlayer.get(player, []) if city.isCapital()), None)
 		return item
 
+	def rebuildIndexes(self):
+		"""rebuilds the location and player indexes of units and cities from the unit and city lists"""
+		self._unitsByLocation = dict()
+		self._unitsByPlayer = dict()
+		self._citiesByLocation = dict()
+		self._citiesByPlayer = dict()
+
+		for unit in self._units:
+			self._indexUnit(unit)
+
+		for city in self._cities:
+			self._indexCity(city)
+
+		self.unitsVersion += 1
+
+	def checkIndexes(self):
+		"""raises an exception if the indexes do not match the unit and city lists (only used in tests)"""
+		unitsByLocation = dict()
+		unitsByPlayer = dict()
+		for unit in self._units:
+			unitsByLocation.setdefault(unit.location, []).append(id(unit))
+			unitsByPlayer.setdefault(unit.player, []).append(id(unit))
+
+		citiesByPlayer = dict()
+		for city in self._cities:
+			citiesByPlayer.setdefault(city.player, []).append(id(city))
+
+		def identifiers(index: dict) -> dict:
+			return {key: sorted(id(item) for item in items) for key, items in index.items() if len(items) > 0}
+
+		if identifiers(self._unitsByLocation) != {key: sorted(value) for key, value in unitsByLocation.items()}:
+			raise Exception('unit location index is inconsistent')
+
+		if identifiers(self._unitsByPlayer) != {key: sorted(value) for key, value in unitsByPlayer.items()}:
+			raise Exception('unit player index is inconsistent')
+
+		if identifiers(self._citiesByPlayer) != {key: sorted(value) for key, value in citiesByPlayer.items()}:
+			raise Exception('city player index is inconsistent')
+
+		if {location: id(city) for location, city in self._citiesByLocation.items()} != \
+			{city.location: id(city) for city in self._cities}:
+			raise Exception('city location index is inconsistent')
+
+	def _indexUnit(self, unit):
+		self._unitsByLocation.setdefault(unit.location, []).append(unit)
+		self._unitsByPlayer.setdefault(unit.player, []).append(unit)
+
+	def _unindexUnit(self, unit):
+		self._removeFromIndex(self._unitsByLocation, unit.location, unit)
+		self._removeFromIndex(self._unitsByPlayer, unit.player, unit)
+
+	def _indexCity(self, city):
+		self._citiesByLocation[city.location] = city
+		self._citiesByPlayer.setdefault(city.player, []).append(city)
+
+	def _unindexCity(self, city):
+		if self._citiesByLocation.get(city.location) is city:
+			del self._citiesByLocation[city.location]
+
+		self._removeFromIndex(self._citiesByPlayer, city.player, city)
+
+	@staticmethod
+	def _removeFromIndex(index: dict, key, item):
+		items = index.get(key)
+		if items is None:
+			return
+
+		for loopIndex, loopItem in enumerate(items):
+			if loopItem is item:
+				del items[loopIndex]
+				break
+
+		if len(items) == 0:
+			del index[key]
+
 	def unitsOf(self, player: Player) -> List[Unit]:
-		return list(filter(lambda unit: unit.player == player, self._units))
+		return list(self._unitsByPlayer.get(player, []))
 
 	def unitsAt(self, location) -> List[Unit]:
-		return list(filter(lambda unit: unit.location == location, self._units))
+		return list(self._unitsByLocation.get(location, []))
 
 	def unitAt(self, location, unitMapType: UnitMapType) -> Optional[Unit]:
-		return next(filter(lambda unit: unit.location == location and unit.unitMapType() == unitMapType, self._units), None)
+		return next(filter(lambda unit: unit.unitMapType() == unitMapType, self._unitsByLocation.get(location, [])), None)
 
 	def addUnit(self, unit: Unit):
 		self._units.append(unit)
+		self._indexUnit(unit)
+		self.unitsVersion += 1
+
+		if Tests.are_running:
+			self.checkIndexes()
 
 	def removeUnit(self, unit):
-		self._units = list(filter(lambda loopUnit: unit.location != loopUnit.location or unit.unitType != loopUnit.unitType, self._units))
+		# removes all units of the same type at the location of unit
+		removedUnits = [loopUnit for loopUnit in self._unitsByLocation.get(unit.location, [])
+		                if loopUnit.unitType == unit.unitType]
+
+		for removedUnit in removedUnits:
+			self._unindexUnit(removedUnit)
+
+		removedIdentifiers = set(id(removedUnit) for removedUnit in removedUnits)
+		self._units = [loopUnit for loopUnit in self._units if id(loopUnit) not in removedIdentifiers]
+		self.unitsVersion += 1
+
+		if Tests.are_running:
+			self.checkIndexes()
+
+	def moveUnit(self, unit, location: HexPoint):
+		"""sets the location of unit and updates the location index"""
+		isIndexed = any(loopUnit is unit for loopUnit in self._unitsByLocation.get(unit.location, []))
+
+		if isIndexed:
+			self._removeFromIndex(self._unitsByLocation, unit.location, unit)
+
+		unit.location = location
+
+		if isIndexed:
+			self._unitsByLocation.setdefault(location, []).append(unit)
+
+		self.unitsVersion += 1
+
+		if Tests.are_running:
+			self.checkIndexes()
 
 	def cityAt(self, location: HexPoint) -> Optional[City]:
-		return next(filter(lambda city: city.location == location, self._cities), None)
+		return self._citiesByLocation.get(location)
 
 	def citiesOf(self, player) -> List[City]:
-		return list(filter(lambda city: city.player == player, self._cities))
+		return list(self._citiesByPlayer.get(player, []))
 
 	def citiesInAreaOf(self, player, area) -> List[City]:
-		return list(filter(lambda city: city.player == player and city.location in area, self._cities))
+		points = set(area)
+		return [city for city in self._citiesByPlayer.get(player, []) if city.location in points]
 
 	def citiesIn(self, area) -> List[City]:
-		return list(filter(lambda city: city.location in area, self._cities))
+		points = set(area)
+		return [city for city in self._cities if city.location in points]
 
 	def addCity(self, city: City, simulation):
 		self._cities.append(city)
+		self._indexCity(city)
 
 		tile = self.tileAt(city.location)
 		tile.setCity(city)
 
 		self._sightCity(city, simulation)
 
+		if Tests.are_running:
+			self.checkIndexes()
+
 	def deleteCity(self, city):
+		removedCities = [loopCity for loopCity in self._cities if loopCity.location == city.location]
+
+		for removedCity in removedCities:
+			self._unindexCity(removedCity)
+
 		self._cities = list(filter(lambda c: c.location != city.location, self._cities))
 
+		if Tests.are_running:
+			self.checkIndexes()
+
+	def setCityOwner(self, city, player):
+		"""sets the owner of city and updates the player index"""
+		self._unindexCity(city)
+		city.player = player
+		self._indexCity(city)
+
 	def _sightCity(self, city, simulation):
 		for pt in city.location.areaWithRadius(3):
 			tile = self.tileAt(pt)
@@ -1865,6 +2145,7 @@ class MapModel:
 
 	def to_dict(self, human=None):
 		values_dict = {}
+		emptyTileDict = Tile(HexPoint(-1, -1), TerrainType.undiscovered).to_dict()
 
 		for y in range(self.height):
 			row_array = []
@@ -1874,8 +2155,7 @@ class MapModel:
 				if tile.isDiscoveredBy(human):
 					row_array.append(tile.to_dict())
 				else:
-					emptyTile = Tile(HexPoint(x, y), TerrainType.undiscovered)
-					row_array.append(emptyTile.to_dict())
+					row_array.append(emptyTileDict)
 
 			values_dict[y] = row_array
 
@@ -1899,18 +2179,104 @@ class MapModel:
 			'cities': []
 		}
 
+	def chunkCount(self) -> Size:
+		"""number of chunks (see to_chunk_dict) in x and y direction"""
+		return Size(
+			(self.width + MapModel.chunkSize - 1) // MapModel.chunkSize,
+			(self.height + MapModel.chunkSize - 1) // MapModel.chunkSize
+		)
+
+	def to_chunk_dict(self, chunkX: int, chunkY: int, human=None) -> dict:
+		"""
+			compact dict of the tiles and units of one chunk (chunkSize x chunkSize tiles) as seen by human
+
+			the tiles are given in row major order as [terrain, isHills, feature, resource, resource_quantity]
+			undiscovered tiles as [undiscovered, False, none, none, 0]
+		"""
+		x0 = chunkX * MapModel.chunkSize
+		y0 = chunkY * MapModel.chunkSize
+		x1 = min(x0 + MapModel.chunkSize, self.width)
+		y1 = min(y0 + MapModel.chunkSize, self.height)
+		emptyTileValues = [TerrainType.undiscovered.value, False, FeatureType.none.value, ResourceType.none.value, 0]
+
+		tiles_arr = []
+		for y in range(y0, y1):
+			for x in range(x0, x1):
+				tile: Tile = self.tiles.values[y][x]
+				if tile.isDiscoveredBy(human):
+					tiles_arr.append(MapModel._tileValues(tile))
+				else:
+					tiles_arr.append(emptyTileValues)
+
+		units_arr = []
+		for unit in self._units:
+			if x0 <= unit.location.x < x1 and y0 <= unit.location.y < y1:
+				if self.tiles.values[unit.location.y][unit.location.x].isDiscoveredBy(human):
+					units_arr.append(unit.to_dict())
+
+		return {
+			'x': x0,
+			'y': y0,
+			'width': x1 - x0,
+			'height': y1 - y0,
+			'tiles': tiles_arr,
+			'units': units_arr
+		}
+
+	def to_diff_dict(self, points, human=None) -> dict:
+		"""
+			compact dict of the tiles, units and cities at the changed points that human has discovered
+
+			the tiles are given as [x, y, terrain, isHills, feature, resource, resource_quantity], the units and
+			cities at the points replace the ones the client knows there.
+		"""
+		points_arr = []
+		tiles_arr = []
+		units_arr = []
+		cities_arr = []
+
+		for point in sorted(points, key=lambda pt: (pt.y, pt.x)):
+			if not self.valid(point):
+				continue
+
+			tile: Tile = self.tiles.values[point.y][point.x]
+			if not tile.isDiscoveredBy(human):
+				continue
+
+			points_arr.append([point.x, point.y])
+			tiles_arr.append([point.x, point.y] + MapModel._tileValues(tile))
+			units_arr += [unit.to_dict() for unit in self.unitsAt(point)]
+
+			city = self.cityAt(point)
+			if city is not None:
+				cities_arr.append(city.to_dict())
+
+		return {
+			'points': points_arr,
+			'tiles': tiles_arr,
+			'units': units_arr,
+			'cities': cities_arr
+		}
+
+	@staticmethod
+	def _tileValues(tile: Tile) -> list:
+		return [
+			tile._terrainValue.value,
+			tile._isHills,
+			tile._featureValue.value,
+			tile._resourceValue.value,
+			tile._resourceQuantity
+		]
+
 	def isCoastalAt(self, point: HexPoint):
 		terrain = self.tileAt(point).terrain()
 		# we are only coastal, if we are on land
 		if terrain.isWater():
 			return False
 
-		for neighborPoint in point.neighbors():
+		for neighborPoint in self.geometry.neighbors(point):
 			neighborTile = self.tileAt(neighborPoint)
 
-			if neighborTile is None:
-				continue
-
 			neighborTerrain = neighborTile.terrain()
 			if neighborTerrain.isWater():
 				return True
@@ -1951,13 +2317,27 @@ class MapModel:
 	def numberOfTiles(self):
 		return self._numberOfLandPlotsValue + self._numberOfWaterPlotsValue
 
+	def terrainVersion(self) -> int:
+		"""changes whenever terrain, hills, feature, route, river or improvement of a tile changes"""
+		return self.planes.movementVersion() + self.planes.improvement.version
+
+	def numberOfDiscoveredTilesBy(self, player) -> int:
+		plane = self.planes.discovered.get(hash(player))
+		return 0 if plane is None else plane.count(1)
+
+	def numberOfVisibleTilesTo(self, player) -> int:
+		plane = self.planes.visibility.get(hash(player))
+		return 0 if plane is None else len(plane) - plane.count(0)
+
+	def visibleToAnyOf(self, players) -> bytearray:
+		"""returns a flag per tile index (1 if the tile is visible to at least one of the players)"""
+		return self.planes.visibleToAnyOf([hash(player) for player in players])
+
 	def indexFor(self, point: HexPoint) -> int:
 		return point.y * self.width + point.x
 
 	def pointFor(self, index: int) -> HexPoint:
-		y = index / self.width
-		x = index - self.width * y
-		return HexPoint(x, y)
+		return self.geometry.pointAt(index)
 
 	def nearestCity(self, pt: HexPoint, player, onSameContinent: bool = False) -> Optional[City]:
 		bestCity: Optional[City] = None
@@ -0,0 +1,97 @@
+from array import array
+
+from smarthexboard.smarthexboardlib.map.types import UnitMovementType
+
+
+class MovementCostTable:
+	"""
+		precomputed costs to move from each tile of a map into each of its six neighbors
+
+		there is one table per UnitMovementType, built on first use. The entry at tile index * 6 + direction index
+		(in the order of HexGeometry.neighborIndices) is the cost to enter the neighbor from the tile or
+		UnitMovementType.max.value if the neighbor can't be entered / is not on the map.
+		Changes of terrain, hills, feature, route or river of a tile only recompute the edges of this tile.
+	"""
+
+	def __init__(self, grid):
+		self.grid = grid
+		self._tables = dict()
+		self._listeners = []
+
+	def __getstate__(self):
+		# tables are rebuilt on demand, listeners register again
+		state = self.__dict__.copy()
+		state['_tables'] = dict()
+		state['_listeners'] = []
+		return state
+
+	def addChangeListener(self, listener):
+		"""
+			registers a callable that receives the indices of the changed tiles before the tables are updated
+		"""
+		self._listeners.append(listener)
+
+	def costsFor(self, movementType: UnitMovementType) -> array:
+		self.applyChanges()
+
+		costs = self._tables.get(movementType)
+		if costs is None:
+			costs = self._build(movementType)
+			self._tables[movementType] = costs
+
+		return costs
+
+	def costFor(self, movementType: UnitMovementType, fromIndex: int, toIndex: int) -> float:
+		neighborIndices = self.grid.geometry.neighborIndices
+		base = fromIndex * 6
+
+		for direction in range(6):
+			if neighborIndices[base + direction] == toIndex:
+				return self.costsFor(movementType)[base + direction]
+
+		return UnitMovementType.max.value
+
+	def _build(self, movementType: UnitMovementType) -> array:
+		size = self.grid.width * self.grid.height
+		costs = array('d', [UnitMovementType.max.value]) * (size * 6)
+
+		for index in range(size):
+			self._updateEdgesFrom(costs, movementType, index)
+
+		return costs
+
+	def _updateEdgesFrom(self, costs: array, movementType: UnitMovementType, index: int):
+		geometry = self.grid.geometry
+		tiles = self.grid.tiles.values
+		width = self.grid.width
+		fromTile = tiles[index // width][index % width]
+
+		for direction in range(6):
+			neighborIndex = geometry.neighborIndices[index * 6 + direction]
+			if neighborIndex < 0:
+				continue
+
+			toTile = tiles[neighborIndex // width][neighborIndex % width]
+			costs[index * 6 + direction] = toTile.movementCost(movementType, fromTile)
+
+	def applyChanges(self):
+		changes = self.grid.planes.movementChanges
+		if len(changes) == 0:
+			return
+
+		neighborIndices = self.grid.geometry.neighborIndices
+
+		for movementType, costs in self._tables.items():
+			for index in changes:
+				# edges out of the tile and edges from the neighbors into the tile
+				self._updateEdgesFrom(costs, movementType, index)
+
+				for direction in range(6):
+					neighborIndex = neighborIndices[index * 6 + direction]
+					if neighborIndex >= 0:
+						self._updateEdgesFrom(costs, movementType, neighborIndex)
+
+		for listener in self._listeners:
+			listener(changes)
+
+		changes.clear()
@@ -2,9 +2,11 @@
 """ generic A-Star path searching algorithm based on
 https://github.com/jrialland/python-astar/blob/master/astar/__init__.py"""
 
+import threading
 from abc import ABC, abstractmethod
+from array import array
 from heapq import heappush, heappop
-from typing import Iterable, Union, TypeVar, Generic
+from typing import Iterable, Union, TypeVar, Generic, Callable, Optional, List, Tuple
 
 # infinity as a constant
 Infinite = float("inf")
@@ -126,3 +128,154 @@ class AStar(ABC, Generic[T]):
 					heappush(open_set, neighbor)
 
 		return None
+
+
+class AStarScratch:
+	"""
+		reusable search buffers of the indexed A* for one map size
+
+		instead of clearing the buffers for every search, each search gets a new generation and a tile only
+		counts as visited / closed if its stamp matches the current generation
+	"""
+
+	def __init__(self, size: int):
+		self.generation = 0
+		self.inUse = False
+		self.visitedStamp = array('I', [0]) * size
+		self.closedStamp = array('I', [0]) * size
+		self.gscore = array('d', [0.0]) * size
+		self.fscore = array('d', [0.0]) * size
+		self.rscore = array('d', [0.0]) * size
+		self.cameFrom = array('i', [-1]) * size
+
+	def nextGeneration(self) -> int:
+		self.generation += 1
+
+		if self.generation >= 0xFFFFFFFF:
+			# wrap around - reset the stamps
+			self.visitedStamp = array('I', [0]) * len(self.visitedStamp)
+			self.closedStamp = array('I', [0]) * len(self.closedStamp)
+			self.generation = 1
+
+		return self.generation
+
+
+class IndexedAStar:
+	"""
+		A* on integer tile indices
+
+		uses a binary heap with lazy deletion (outdated heap entries are skipped when popped), array backed
+		g / f scores and closed stamps from a scratch buffer that is shared per map size (and thread)
+	"""
+	_scratchBuffers = threading.local()
+
+	def __init__(self, size: int, heuristic: Callable[[int, int], float]):
+		self.size = size
+		self.heuristic = heuristic
+		self.expansions: int = 0  # number of tiles closed by the last search
+
+	def _acquireScratch(self) -> AStarScratch:
+		# the buffers are per thread - searches of concurrent requests must not share the stamps and scores
+		buffers = getattr(IndexedAStar._scratchBuffers, 'bySize', None)
+
+		if buffers is None:
+			buffers = dict()
+			IndexedAStar._scratchBuffers.bySize = buffers
+
+		scratch = buffers.get(self.size)
+
+		if scratch is None:
+			scratch = AStarScratch(self.size)
+			buffers[self.size] = scratch
+
+		if scratch.inUse:
+			# nested search (e.g. from a data source) - use private buffers
+			return AStarScratch(self.size)
+
+		return scratch
+
+	def search(self, start: int, goal: int,
+	           neighbors: Callable[[int], Iterable[Tuple[int, float]]]) -> Optional[List[Tuple[int, float]]]:
+		"""
+			searches the cheapest path from start to goal
+
+			@param start: index of the start tile
+			@param goal: index of the goal tile
+			@param neighbors: returns (index, cost to enter) of the tiles that can be entered from a tile index
+			@return: list of (index, cost to enter) from start to goal or None if goal can't be reached
+		"""
+		self.expansions = 0
+
+		if start == goal:
+			return [(start, 0)]
+
+		scratch = self._acquireScratch()
+		scratch.inUse = True
+
+		try:
+			generation = scratch.nextGeneration()
+			visitedStamp = scratch.visitedStamp
+			closedStamp = scratch.closedStamp
+			gscore = scratch.gscore
+			fscore = scratch.fscore
+			rscore = scratch.rscore
+			cameFrom = scratch.cameFrom
+			heuristic = self.heuristic
+
+			visitedStamp[start] = generation
+			gscore[start] = 0.0
+			fscore[start] = heuristic(start, goal)
+			rscore[start] = -1.0
+			cameFrom[start] = -1
+
+			sequence = 0
+			openSet: list = [(fscore[start], sequence, start)]
+
+			while openSet:
+				currentF, _, current = heappop(openSet)
+
+				if closedStamp[current] == generation or currentF != fscore[current]:
+					# outdated entry
+					continue
+
+				if current == goal:
+					return self._reconstructPath(scratch, goal)
+
+				closedStamp[current] = generation
+				self.expansions += 1
+				currentG = gscore[current]
+
+				for neighbor, stepCost in neighbors(current):
+					if closedStamp[neighbor] == generation:
+						continue
+
+					tentativeG = currentG + stepCost
+
+					if visitedStamp[neighbor] == generation and tentativeG >= gscore[neighbor]:
+						continue
+
+					visitedStamp[neighbor] = generation
+					cameFrom[neighbor] = current
+					gscore[neighbor] = tentativeG
+					rscore[neighbor] = stepCost
+					neighborF = tentativeG + heuristic(neighbor, goal)
+					fscore[neighbor] = neighborF
+
+					sequence += 1
+					heappush(openSet, (neighborF, sequence, neighbor))
+
+			return None
+		finally:
+			scratch.inUse = False
+
+	@staticmethod
+	def _reconstructPath(scratch: AStarScratch, goal: int) -> List[Tuple[int, float]]:
+		path = []
+		current = goal
+
+		while current != -1:
+			path.append((current, scratch.rscore[current]))
+			current = scratch.cameFrom[current]
+
+		path.reverse()
+		return path
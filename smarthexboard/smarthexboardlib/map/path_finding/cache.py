@@ -0,0 +1,81 @@
+from typing import Optional, Tuple
+
+from smarthexboard.smarthexboardlib.map.base import HexPoint
+from smarthexboard.smarthexboardlib.map.path_finding.path import HexPath
+
+
+class PathCache:
+	"""
+		cache of shortest paths (owned by the game and cleared every turn)
+
+		paths are keyed by the movement profile of the data source (see AStarDataSource.cacheKey) and the
+		endpoints. All paths are dropped when a tile changes its movement costs, paths of data sources that
+		respect units are dropped when a unit is added, moved or removed. Paths that depend on the sight of a player
+		are keyed by its sight version (see TilePlanes.sightVersion) and are not found again once the player sees more.
+	"""
+
+	def __init__(self, grid):
+		self.grid = grid
+		self.hits: int = 0
+		self.misses: int = 0
+		self._paths = dict()
+		self._unitAwarePaths = dict()
+		self._movementVersion: int = grid.planes.movementVersion()
+		self._unitsVersion: int = grid.unitsVersion
+
+	def clear(self):
+		self._paths.clear()
+		self._unitAwarePaths.clear()
+
+	def statistics(self) -> dict:
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'paths': len(self._paths) + len(self._unitAwarePaths)
+		}
+
+	def _validate(self):
+		movementVersion = self.grid.planes.movementVersion()
+		if movementVersion != self._movementVersion:
+			self._movementVersion = movementVersion
+			self.clear()
+
+		if self.grid.unitsVersion != self._unitsVersion:
+			self._unitsVersion = self.grid.unitsVersion
+			self._unitAwarePaths.clear()
+
+	def lookup(self, profile: tuple, respectsUnits: bool, start: HexPoint, goal: HexPoint) -> Tuple[bool, Optional[HexPath]]:
+		"""
+			returns if a path between start and goal has been cached and a copy of that path (None if there is no path)
+
+			@param profile: movement profile of the data source
+			@param respectsUnits: True if the path depends on the location of units
+			@param start: start of the path
+			@param goal: goal of the path
+			@return: (found, path)
+		"""
+		self._validate()
+
+		paths = self._unitAwarePaths if respectsUnits else self._paths
+		entry = paths.get((profile, start, goal), False)
+
+		if entry is False:
+			self.misses += 1
+			return False, None
+
+		self.hits += 1
+
+		if entry is None:
+			return True, None
+
+		points, costs = entry
+		return True, HexPath(list(points), list(costs))
+
+	def store(self, profile: tuple, respectsUnits: bool, start: HexPoint, goal: HexPoint, path: Optional[HexPath]):
+		self._validate()
+
+		paths = self._unitAwarePaths if respectsUnits else self._paths
+		if path is None:
+			paths[(profile, start, goal)] = None
+		else:
+			paths[(profile, start, goal)] = (tuple(path.points()), tuple(path.costs()))
@@ -2,17 +2,28 @@ import sys
 from typing import Optional
 
 from smarthexboard.smarthexboardlib.game.unitTypes import UnitMapType
-from smarthexboard.smarthexboardlib.map.base import HexPoint
+from smarthexboard.smarthexboardlib.map.base import HexPoint, HexGeometry
 # from map.map import MapModel
-from smarthexboard.smarthexboardlib.map.path_finding.base import AStar
+from smarthexboard.smarthexboardlib.map.path_finding.base import AStar, IndexedAStar
+from smarthexboard.smarthexboardlib.map.path_finding.cache import PathCache
+from smarthexboard.smarthexboardlib.map.path_finding.hierarchical import PathHierarchy
 from smarthexboard.smarthexboardlib.map.path_finding.path import HexPath
 from smarthexboard.smarthexboardlib.map.types import UnitMovementType, TerrainType, FeatureType
 
 
 class AStarDataSource:
+	# True if the walkable tiles depend on the location of units
+	respectsUnits: bool = False
+
 	def __init__(self, grid, movement_type: UnitMovementType):
 		self.grid = grid
 		self.movement_type = movement_type
+		self.pathCache: Optional[PathCache] = None
+		self.hierarchy: Optional[PathHierarchy] = None
+
+	def cacheKey(self) -> Optional[tuple]:
+		"""movement profile used to cache the paths of this data source (None if the paths can't be cached)"""
+		return None
 
 	def walkableAdjacentTilesCoords(self, tile_coord: HexPoint) -> [HexPoint]:
 		pass
@@ -20,6 +31,14 @@ class AStarDataSource:
 	def costToMove(self, from_tile_coord: HexPoint, to_adjacent_tile_coord: HexPoint) -> float:
 		pass
 
+	def walkableAdjacentTileIndices(self, tile_index: int) -> [(int, float)]:
+		"""returns (index, cost to move) of the walkable neighbors of a tile index (used by the indexed A*)"""
+		geometry = self.grid.geometry
+		tile_coord = geometry.pointAt(tile_index)
+
+		return [(geometry.indexOf(neighbor), self.costToMove(tile_coord, neighbor))
+		        for neighbor in self.walkableAdjacentTilesCoords(tile_coord)]
+
 
 class MoveTypeIgnoreUnitsOptions:
 	def __init__(self, ignore_sight, can_embark, can_enter_ocean):
@@ -35,13 +54,36 @@ class MoveTypeIgnoreUnitsPathfinderDataSource(AStarDataSource):
 		self.player = player
 		self.options = options
 
+	def cacheKey(self) -> Optional[tuple]:
+		key = 'ignoreUnits', self.movement_type, self.options.can_embark, self.options.can_enter_ocean
+
+		if not self.options.ignore_sight:
+			# paths only cross tiles the player knows, so they are valid as long as the sight of the player is
+			playerHash = hash(self.player)
+			key += playerHash, self.grid.planes.sightVersion(playerHash)
+
+		return key
+
 	def walkableAdjacentTilesCoords(self, tile_coord: HexPoint) -> [HexPoint]:
-		walkable_coords = []
+		geometry = self.grid.geometry
+		return [geometry.pointAt(index) for index, _ in self.walkableAdjacentTileIndices(geometry.indexOf(tile_coord))]
+
+	def walkableAdjacentTileIndices(self, tile_index: int) -> [(int, float)]:
+		walkable_indices = []
+		geometry = self.grid.geometry
+		costs = self.grid.movementCosts.costsFor(self.movement_type)
+		base = tile_index * 6
+
+		for direction in range(6):
+			neighbor_index = geometry.neighborIndices[base + direction]
+			if neighbor_index < 0:
+				continue
 
-		for neighbor in tile_coord.neighbors():
-			if not self.grid.valid(neighbor):
+			cost = costs[base + direction]
+			if cost >= UnitMovementType.max.value:
 				continue
 
+			neighbor = geometry.pointAt(neighbor_index)
 			to_tile = self.grid.tileAt(neighbor)
 
 			if self.movement_type == UnitMovementType.walk:
@@ -68,18 +110,17 @@ class MoveTypeIgnoreUnitsPathfinderDataSource(AStarDataSource):
 				if not to_tile.isVisibleTo(self.player):
 					continue
 
-			from_tile = self.grid.tileAt(tile_coord)
+			walkable_indices.append((neighbor_index, cost))
 
-			if to_tile.movementCost(self.movement_type, from_tile) < UnitMovementType.max.value:
-				walkable_coords.append(neighbor)
-
-		return walkable_coords
+		return walkable_indices
 
 	def costToMove(self, from_tile_coord: HexPoint, to_adjacent_tile_coord: HexPoint) -> float:
-		from_tile = self.grid.tileAt(from_tile_coord)
-		to_tile = self.grid.tileAt(to_adjacent_tile_coord)
-
-		return to_tile.movementCost(self.movement_type, from_tile)
+		geometry = self.grid.geometry
+		return self.grid.movementCosts.costFor(
+			self.movement_type,
+			geometry.indexOf(from_tile_coord),
+			geometry.indexOf(to_adjacent_tile_coord)
+		)
 
 
 class MoveTypeUnitAwareOptions:
@@ -91,18 +132,43 @@ class MoveTypeUnitAwareOptions:
 
 
 class MoveTypeUnitAwarePathfinderDataSource(AStarDataSource):
+	respectsUnits: bool = True
+
 	def __init__(self, grid, movement_type: UnitMovementType, player, options: MoveTypeUnitAwareOptions):
 		super().__init__(grid, movement_type)
 		self.player = player
 		self.options = options
 
+	def cacheKey(self) -> Optional[tuple]:
+		key = 'unitAware', self.movement_type, self.options.unitMapType, self.options.can_embark, \
+			self.options.can_enter_ocean, self.player.leader, self.player.cityState
+
+		if not self.options.ignore_sight:
+			# paths only cross tiles the player knows, so they are valid as long as the sight of the player is
+			key += self.grid.planes.sightVersion(hash(self.player)),
+
+		return key
+
 	def walkableAdjacentTilesCoords(self, tile_coord: HexPoint) -> [HexPoint]:
-		walkable_coords = []
+		geometry = self.grid.geometry
+		return [geometry.pointAt(index) for index, _ in self.walkableAdjacentTileIndices(geometry.indexOf(tile_coord))]
+
+	def walkableAdjacentTileIndices(self, tile_index: int) -> [(int, float)]:
+		walkable_indices = []
+		geometry = self.grid.geometry
+		costs = self.grid.movementCosts.costsFor(self.movement_type)
+		base = tile_index * 6
+
+		for direction in range(6):
+			neighbor_index = geometry.neighborIndices[base + direction]
+			if neighbor_index < 0:
+				continue
 
-		for neighbor in tile_coord.neighbors():
-			if not self.grid.valid(neighbor):
+			cost = costs[base + direction]
+			if cost >= UnitMovementType.max.value:
 				continue
 
+			neighbor = geometry.pointAt(neighbor_index)
 			to_tile = self.grid.tileAt(neighbor)
 
 			if self.movement_type == UnitMovementType.walk:
@@ -145,18 +211,17 @@ class MoveTypeUnitAwarePathfinderDataSource(AStarDataSource):
 			if blocked:
 				continue
 
-			from_tile = self.grid.tileAt(tile_coord)
+			walkable_indices.append((neighbor_index, cost))
 
-			if to_tile.movementCost(self.movement_type, from_tile) < UnitMovementType.max.value:
-				walkable_coords.append(neighbor)
-
-		return walkable_coords
+		return walkable_indices
 
 	def costToMove(self, from_tile_coord: HexPoint, to_adjacent_tile_coord: HexPoint) -> float:
-		from_tile = self.grid.tileAt(from_tile_coord)
-		to_tile = self.grid.tileAt(to_adjacent_tile_coord)
-
-		return to_tile.movementCost(self.movement_type, from_tile)
+		geometry = self.grid.geometry
+		return self.grid.movementCosts.costFor(
+			self.movement_type,
+			geometry.indexOf(from_tile_coord),
+			geometry.indexOf(to_adjacent_tile_coord)
+		)
 
 
 class InfluencePathfinderDataSource(AStarDataSource):
@@ -210,6 +275,7 @@ class AStarPathfinder(AStar):
 
 	def __init__(self, data_source):
 		self.data_source = data_source
+		self.expansions: int = 0  # number of nodes expanded by the last indexed search
 
 	def heuristic_cost_estimate(self, current: HexPoint, goal: HexPoint):
 		return current.distance(goal)
@@ -233,8 +299,25 @@ class AStarPathfinder(AStar):
 		if not isinstance(to_point, HexPoint):
 			raise Exception(f'to_point {to_point} is no HexPoint but {type(to_point)}')
 
-		pts_or_none = self.astar(from_point, to_point, False)
+		pathCache: Optional[PathCache] = None
+		cacheKey: Optional[tuple] = None
+		if isinstance(self.data_source, AStarDataSource) and self.data_source.pathCache is not None:
+			cacheKey = self.data_source.cacheKey()
+
+			if cacheKey is not None:
+				pathCache = self.data_source.pathCache
+				found, cachedPath = pathCache.lookup(cacheKey, self.data_source.respectsUnits, from_point, to_point)
+
+				if found:
+					return cachedPath
+
+		geometry = getattr(self.data_source.grid, 'geometry', None) if isinstance(self.data_source, AStarDataSource) else None
+		if geometry is not None and geometry.valid(from_point.x, from_point.y) and geometry.valid(to_point.x, to_point.y):
+			pts_or_none = self._indexedShortestPath(geometry, from_point, to_point)
+		else:
+			pts_or_none = self.astar(from_point, to_point, False)
 
+		path: Optional[HexPath] = None
 		if pts_or_none is not None:
 			points = []
 			costs = []
@@ -242,9 +325,37 @@ class AStarPathfinder(AStar):
 				points.append(pt)
 				costs.append(max(0.0, cost))
 
-			return HexPath(points, costs)
+			path = HexPath(points, costs)
 
-		return None
+		if pathCache is not None:
+			pathCache.store(cacheKey, self.data_source.respectsUnits, from_point, to_point, path)
+
+		return path
+
+	def _indexedShortestPath(self, geometry: HexGeometry, from_point: HexPoint, to_point: HexPoint):
+		"""runs the indexed A* (or the hierarchical search if the data source has one) on the tiles of the grid"""
+		self.expansions = 0
+		start = geometry.indexOf(from_point)
+		goal = geometry.indexOf(to_point)
+
+		hierarchy: Optional[PathHierarchy] = self.data_source.hierarchy
+		if hierarchy is not None and not self.data_source.respectsUnits and self.data_source.cacheKey() is not None:
+			indices_or_none = hierarchy.search(self.data_source, start, goal, self._indexedSearch)
+			self.expansions += hierarchy.expansions
+		else:
+			indices_or_none = self._indexedSearch(start, goal)
+
+		if indices_or_none is None:
+			return None
+
+		return [(geometry.pointAt(index), cost) for index, cost in indices_or_none]
+
+	def _indexedSearch(self, start: int, goal: int):
+		geometry = self.data_source.grid.geometry
+		search = IndexedAStar(geometry.width * geometry.height, geometry.distance)
+		indices_or_none = search.search(start, goal, self.data_source.walkableAdjacentTileIndices)
+		self.expansions += search.expansions
+		return indices_or_none
 
 	def doesPathExist(self, from_point, to_point) -> bool:
 		return self.shortestPath(from_point, to_point) is not None
@@ -0,0 +1,327 @@
+from array import array
+from heapq import heappush, heappop
+from typing import Optional, List, Tuple, Callable, Dict
+
+from smarthexboard.smarthexboardlib.map.path_finding.base import IndexedAStar
+
+# infinity as a constant
+Infinite = float("inf")
+
+
+class ClusterGraph:
+	"""
+		abstract graph of the map for one movement profile (HPA*)
+
+		the map is split into square clusters. Where tiles of two neighboring clusters can be crossed, entrance
+		tiles are placed on both sides of the border. Entrances of one cluster are connected by the costs of the
+		cheapest paths inside the cluster (one Dijkstra tree per entrance), entrances of neighboring clusters by
+		the cost of the step over the border. Only the clusters around tiles that changed their movement costs
+		are rebuilt.
+	"""
+
+	def __init__(self, grid, clusterSize: int):
+		self.grid = grid
+		self.geometry = grid.geometry
+		self.clusterSize = clusterSize
+
+		width = self.geometry.width
+		height = self.geometry.height
+		clustersPerRow = (width + clusterSize - 1) // clusterSize
+		clustersPerColumn = (height + clusterSize - 1) // clusterSize
+		self.numberOfClusters = clustersPerRow * clustersPerColumn
+
+		self.clusterOf = array('i', [0]) * (width * height)
+		for index in range(width * height):
+			self.clusterOf[index] = ((index // width) // clusterSize) * clustersPerRow + (index % width) // clusterSize
+
+		# tile pairs (inside, outside) along the border of each pair of neighboring clusters
+		self._borderEdges: Dict[Tuple[int, int], List[Tuple[int, int]]] = dict()
+		self._bordersOf: List[set] = [set() for _ in range(self.numberOfClusters)]
+		neighborIndices = self.geometry.neighborIndices
+		for index in range(width * height):
+			cluster = self.clusterOf[index]
+			for direction in range(6):
+				neighborIndex = neighborIndices[index * 6 + direction]
+				if neighborIndex < 0 or self.clusterOf[neighborIndex] <= cluster:
+					continue
+
+				border = (cluster, self.clusterOf[neighborIndex])
+				self._borderEdges.setdefault(border, []).append((index, neighborIndex))
+				self._bordersOf[border[0]].add(border)
+				self._bordersOf[border[1]].add(border)
+
+		for edges in self._borderEdges.values():
+			edges.sort()
+
+		self._entrances: Dict[Tuple[int, int], List[Tuple[int, int]]] = dict()
+		self._interEdges: Dict[int, Dict[int, float]] = dict()
+		self._clusterNodes: List[List[int]] = [[] for _ in range(self.numberOfClusters)]
+		# entrance tile => (costs, parents, step costs) of the cheapest paths inside its cluster
+		self._trees: Dict[int, Tuple[dict, dict, dict]] = dict()
+		self._dirty = set(range(self.numberOfClusters))
+
+	def markChanged(self, indices):
+		"""marks the clusters of changed tiles (and the clusters of their neighbors) to be rebuilt"""
+		neighborIndices = self.geometry.neighborIndices
+
+		for index in indices:
+			self._dirty.add(self.clusterOf[index])
+
+			for direction in range(6):
+				neighborIndex = neighborIndices[index * 6 + direction]
+				if neighborIndex >= 0:
+					self._dirty.add(self.clusterOf[neighborIndex])
+
+	def update(self, data_source):
+		"""rebuilds the entrances and paths of the changed clusters"""
+		self.grid.movementCosts.applyChanges()
+
+		if len(self._dirty) == 0:
+			return
+
+		borders = set()
+		for cluster in self._dirty:
+			borders.update(self._bordersOf[cluster])
+
+		affectedClusters = set(self._dirty)
+		for border in borders:
+			self._buildEntrances(data_source, border)
+			affectedClusters.update(border)
+
+		for cluster in affectedClusters:
+			self._buildCluster(data_source, cluster)
+
+		self._dirty.clear()
+
+	def _buildEntrances(self, data_source, border: Tuple[int, int]):
+		for inside, outside in self._entrances.get(border, []):
+			self._interEdges.get(inside, dict()).pop(outside, None)
+			self._interEdges.get(outside, dict()).pop(inside, None)
+
+		# border steps that can be taken in both directions
+		crossings = dict()
+		for inside, outside in self._borderEdges[border]:
+			insideToOutside = dict(data_source.walkableAdjacentTileIndices(inside)).get(outside)
+			outsideToInside = dict(data_source.walkableAdjacentTileIndices(outside)).get(inside)
+
+			if insideToOutside is not None and outsideToInside is not None:
+				crossings.setdefault(inside, []).append((outside, insideToOutside, outsideToInside))
+
+		# one entrance per connected run of border tiles, two for long runs
+		neighborIndices = self.geometry.neighborIndices
+		entrances = []
+		remaining = set(crossings.keys())
+		while remaining:
+			run = []
+			stack = [remaining.pop()]
+			while stack:
+				inside = stack.pop()
+				run.append(inside)
+
+				for direction in range(6):
+					neighborIndex = neighborIndices[inside * 6 + direction]
+					if neighborIndex in remaining:
+						remaining.remove(neighborIndex)
+						stack.append(neighborIndex)
+
+			run.sort()
+			picks = [run[0], run[-1]] if len(run) >= 6 else [run[len(run) // 2]]
+
+			for inside in picks:
+				outside, insideToOutside, outsideToInside = crossings[inside][0]
+				entrances.append((inside, outside))
+				self._interEdges.setdefault(inside, dict())[outside] = insideToOutside
+				self._interEdges.setdefault(outside, dict())[inside] = outsideToInside
+
+		self._entrances[border] = entrances
+
+	def _buildCluster(self, data_source, cluster: int):
+		for node in self._clusterNodes[cluster]:
+			self._trees.pop(node, None)
+
+		nodes = set()
+		for border in self._bordersOf[cluster]:
+			for inside, outside in self._entrances.get(border, []):
+				nodes.add(inside if self.clusterOf[inside] == cluster else outside)
+
+		self._clusterNodes[cluster] = sorted(nodes)
+
+		for node in self._clusterNodes[cluster]:
+			self._trees[node] = self._dijkstra(data_source, node, cluster)
+
+	def _dijkstra(self, data_source, start: int, cluster: int) -> Tuple[dict, dict, dict]:
+		"""cheapest paths from start to all tiles of the cluster without leaving it"""
+		clusterOf = self.clusterOf
+		costs = {start: 0.0}
+		parents = {start: -1}
+		stepCosts = {start: -1.0}
+		closed = set()
+		openSet: list = [(0.0, start)]
+
+		while openSet:
+			currentCost, current = heappop(openSet)
+
+			if current in closed:
+				continue
+
+			closed.add(current)
+
+			for neighbor, stepCost in data_source.walkableAdjacentTileIndices(current):
+				if clusterOf[neighbor] != cluster or neighbor in closed:
+					continue
+
+				tentativeCost = currentCost + stepCost
+				if tentativeCost >= costs.get(neighbor, Infinite):
+					continue
+
+				costs[neighbor] = tentativeCost
+				parents[neighbor] = current
+				stepCosts[neighbor] = stepCost
+				heappush(openSet, (tentativeCost, neighbor))
+
+		return costs, parents, stepCosts
+
+	@staticmethod
+	def _segment(tree: Tuple[dict, dict, dict], target: int) -> List[Tuple[int, float]]:
+		"""steps of the tree from its root to target (without the root)"""
+		_, parents, stepCosts = tree
+		segment = []
+
+		while parents[target] != -1:
+			segment.append((target, stepCosts[target]))
+			target = parents[target]
+
+		segment.reverse()
+		return segment
+
+	def search(self, data_source, start: int, goal: int,
+	           exactSearch: Callable[[int, int], Optional[List[Tuple[int, float]]]]) -> Tuple[Optional[List[Tuple[int, float]]], int]:
+		"""
+			searches a path over the entrances of the clusters and refines it into tile steps
+
+			@param data_source: AStarDataSource with the movement profile of this graph
+			@param start: index of the start tile
+			@param goal: index of the goal tile
+			@param exactSearch: searches the exact path between two tile indices (used for the last leg)
+			@return: (list of (index, cost to enter) from start to goal or None, expanded nodes of the abstract search)
+		"""
+		self.update(data_source)
+
+		startCluster = self.clusterOf[start]
+		goalCluster = self.clusterOf[goal]
+		startTree = self._dijkstra(data_source, start, startCluster)
+		startCosts = startTree[0]
+
+		goalCosts = dict()
+		for node in self._clusterNodes[goalCluster]:
+			cost = self._trees[node][0].get(goal)
+			if cost is not None:
+				goalCosts[node] = cost
+
+		def neighbors(node: int) -> List[Tuple[int, float]]:
+			if node == start:
+				edges = [(other, startCosts[other]) for other in self._clusterNodes[startCluster]
+				         if other != start and other in startCosts]
+				if goal in startCosts:
+					edges.append((goal, startCosts[goal]))
+			else:
+				costs = self._trees[node][0]
+				edges = [(other, costs[other]) for other in self._clusterNodes[self.clusterOf[node]]
+				         if other != node and other in costs]
+				if node in goalCosts:
+					edges.append((goal, goalCosts[node]))
+
+			edges.extend(self._interEdges.get(node, dict()).items())
+			return edges
+
+		abstractSearch = IndexedAStar(len(self.clusterOf), self.geometry.distance)
+		abstractPath = abstractSearch.search(start, goal, neighbors)
+
+		if abstractPath is None:
+			return None, abstractSearch.expansions
+
+		path = [(start, -1.0)]
+		for step in range(1, len(abstractPath)):
+			fromNode = abstractPath[step - 1][0]
+			toNode, cost = abstractPath[step]
+
+			if toNode == goal and fromNode != start:
+				# last leg - exact search, it may leave the goal cluster
+				leg = exactSearch(fromNode, goal)
+				if leg is None:
+					return None, abstractSearch.expansions
+
+				path.extend(leg[1:])
+			elif fromNode == start and toNode in startCosts:
+				path.extend(self._segment(startTree, toNode))
+			elif fromNode != start and self.clusterOf[fromNode] == self.clusterOf[toNode] and toNode in self._trees[fromNode][0]:
+				path.extend(self._segment(self._trees[fromNode], toNode))
+			else:
+				path.append((toNode, cost))
+
+		return path, abstractSearch.expansions
+
+
+class PathHierarchy:
+	"""
+		hierarchical pathfinding (HPA*) for long routes, one ClusterGraph per movement profile
+
+		paths are near optimal: they pass the entrances of the clusters. Routes shorter than two clusters and
+		routes the abstract graph does not find are searched with the exact A*.
+	"""
+
+	def __init__(self, grid, clusterSize: int = 10):
+		self.grid = grid
+		self.clusterSize = clusterSize
+		self.expansions: int = 0  # number of abstract nodes expanded by the last search
+		self._graphs: Dict[tuple, ClusterGraph] = dict()
+		self._listening: bool = False
+
+	def __getstate__(self):
+		# graphs are rebuilt on demand
+		state = self.__dict__.copy()
+		state['_graphs'] = dict()
+		state['_listening'] = False
+		return state
+
+	def _onMovementChanges(self, indices):
+		for graph in self._graphs.values():
+			graph.markChanged(indices)
+
+	def graphFor(self, data_source) -> ClusterGraph:
+		if not self._listening:
+			self.grid.movementCosts.addChangeListener(self._onMovementChanges)
+			self._listening = True
+
+		profile = data_source.cacheKey()
+		graph = self._graphs.get(profile)
+
+		if graph is None:
+			graph = ClusterGraph(self.grid, self.clusterSize)
+			self._graphs[profile] = graph
+
+		return graph
+
+	def search(self, data_source, start: int, goal: int,
+	           exactSearch: Callable[[int, int], Optional[List[Tuple[int, float]]]]) -> Optional[List[Tuple[int, float]]]:
+		"""
+			searches a path between two tile indices
+
+			@param data_source: AStarDataSource whose paths can be cached (see AStarDataSource.cacheKey)
+			@param start: index of the start tile
+			@param goal: index of the goal tile
+			@param exactSearch: searches the exact path between two tile indices
+			@return: list of (index, cost to enter) from start to goal or None if goal can't be reached
+		"""
+		self.expansions = 0
+
+		if self.grid.geometry.distance(start, goal) < 2 * self.clusterSize:
+			return exactSearch(start, goal)
+
+		path, self.expansions = self.graphFor(data_source).search(data_source, start, goal, exactSearch)
+
+		if path is None:
+			# the entrances don't cover every crossing of the borders
+			return exactSearch(start, goal)
+
+		return path
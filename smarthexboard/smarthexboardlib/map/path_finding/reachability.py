@@ -0,0 +1,143 @@
+import sys
+from array import array
+from heapq import heappush, heappop
+from typing import Optional, List
+
+from smarthexboard.smarthexboardlib.map.base import HexPoint
+from smarthexboard.smarthexboardlib.map.path_finding.path import HexPath
+
+# infinity as a constant
+Infinite = float("inf")
+
+
+class ReachabilityMap:
+	"""
+		costs, turns and paths from one start tile to all tiles in a movement budget
+
+		runs a single Dijkstra expansion (instead of an A* search per target), so many targets of a unit can be
+		scored and their paths rebuilt from one search. The turns are counted like
+		AStarPathfinder.turnsToReachTarget does it along the path.
+	"""
+
+	def __init__(self, data_source, start: HexPoint, maxMoves: float, maxTurns: Optional[int] = None,
+	             maxCost: float = Infinite):
+		"""
+			expands from start until the budget is exhausted
+
+			@param data_source: AStarDataSource (bound to a map grid) that provides the walkable tiles and costs
+			@param start: start tile
+			@param maxMoves: moves of the unit per turn
+			@param maxTurns: tiles that need more turns are not expanded (None - no limit)
+			@param maxCost: tiles that cost more are not expanded
+		"""
+		self.geometry = data_source.grid.geometry
+		self.start = start
+		self.maxMoves = maxMoves
+
+		size = self.geometry.width * self.geometry.height
+		self._costs = array('d', [Infinite]) * size
+		self._stepCosts = array('d', [0.0]) * size
+		self._turns = array('i', [-1]) * size
+		self._parents = array('i', [-1]) * size
+
+		if maxMoves > 0:
+			self._expand(data_source, maxTurns if maxTurns is not None else sys.maxsize, maxCost)
+
+	def _expand(self, data_source, maxTurns: int, maxCost: float):
+		costs = self._costs
+		stepCosts = self._stepCosts
+		turns = self._turns
+		parents = self._parents
+		maxMoves = self.maxMoves
+
+		# cost of the current turn, when the turn is completed it restarts from zero
+		turnCosts = array('d', [0.0]) * len(costs)
+		closed = bytearray(len(costs))
+
+		startIndex = self.geometry.indexOf(self.start)
+		costs[startIndex] = 0.0
+		turns[startIndex] = 0
+		openSet: list = [(0.0, startIndex)]
+
+		while openSet:
+			currentCost, current = heappop(openSet)
+
+			if closed[current] or currentCost != costs[current]:
+				# outdated entry
+				continue
+
+			closed[current] = 1
+
+			for neighbor, stepCost in data_source.walkableAdjacentTileIndices(current):
+				if closed[neighbor]:
+					continue
+
+				tentativeCost = currentCost + stepCost
+				if tentativeCost >= costs[neighbor] or tentativeCost > maxCost:
+					continue
+
+				neighborTurns = turns[current]
+				neighborTurnCost = turnCosts[current] + stepCost
+				if neighborTurnCost >= maxMoves:
+					neighborTurns += 1
+					neighborTurnCost = 0.0
+
+				if neighborTurns > maxTurns:
+					continue
+
+				costs[neighbor] = tentativeCost
+				stepCosts[neighbor] = stepCost
+				turns[neighbor] = neighborTurns
+				turnCosts[neighbor] = neighborTurnCost
+				parents[neighbor] = current
+				heappush(openSet, (tentativeCost, neighbor))
+
+	def _indexOf(self, point: HexPoint) -> int:
+		if not self.geometry.valid(point.x, point.y):
+			return -1
+
+		return self.geometry.indexOf(point)
+
+	def canReach(self, point: HexPoint) -> bool:
+		index = self._indexOf(point)
+		return index != -1 and self._turns[index] != -1
+
+	def costTo(self, point: HexPoint) -> float:
+		"""movement cost to reach point (inf if it can't be reached)"""
+		index = self._indexOf(point)
+		return self._costs[index] if index != -1 else Infinite
+
+	def turnsTo(self, point: HexPoint) -> int:
+		"""turns needed to reach point (at least 1, sys.maxsize if it can't be reached)"""
+		index = self._indexOf(point)
+		if index == -1 or self._turns[index] == -1:
+			return sys.maxsize
+
+		return max(self._turns[index], 1)
+
+	def canReachIn(self, point: HexPoint, turns: int) -> bool:
+		"""same as Unit.canReachAt"""
+		if point == self.start:
+			return True
+
+		return self.turnsTo(point) <= turns
+
+	def reachablePoints(self) -> List[HexPoint]:
+		return [self.geometry.pointAt(index) for index, turns in enumerate(self._turns) if turns != -1]
+
+	def pathTo(self, point: HexPoint) -> Optional[HexPath]:
+		"""path from the start to point (None if it can't be reached)"""
+		index = self._indexOf(point)
+		if index == -1 or self._turns[index] == -1:
+			return None
+
+		points = []
+		costs = []
+		while index != -1:
+			points.append(self.geometry.pointAt(index))
+			costs.append(self._stepCosts[index])
+			index = self._parents[index]
+
+		points.reverse()
+		costs.reverse()
+		return HexPath(points, costs)
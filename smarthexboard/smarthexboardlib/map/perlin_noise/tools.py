@@ -28,14 +28,13 @@ def sample_vector(dimensions: int, seed: int) -> List[float]:
 	Returns:
 		List[float] - normalized random vector of given size
 	"""
-	state = random.getstate()
-	random.seed(seed)
+	# own generator - the global state is shared with other threads (e.g. parallel height maps)
+	generator = random.Random(seed)  # noqa: S311
 
 	vec = []
 	for _ in range(dimensions):
-		vec.append(random.uniform(-1, 1))  # noqa: S311
+		vec.append(generator.uniform(-1, 1))  # noqa: S311
 
-	random.setstate(state)
 	return vec
 
 
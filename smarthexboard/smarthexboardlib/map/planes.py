@@ -0,0 +1,193 @@
+from array import array
+from typing import Callable, Optional, Dict, List
+
+from smarthexboard.smarthexboardlib.map.base import HexPoint
+from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
+from smarthexboard.smarthexboardlib.map.types import TerrainType, FeatureType, ResourceType, RouteType
+
+
+class TilePlane:
+	"""
+		packed storage of one tile property for all tiles of a map
+
+		every tile only stores a 2 byte index into the palette of distinct values of this plane, so
+		enum values, flags and identifiers share one compact array instead of one attribute per Tile
+	"""
+
+	def __init__(self, size: int, default, identity: bool = False, changes: Optional[set] = None):
+		"""
+			constructs a plane with all values set to the default
+
+			@param size: number of tiles
+			@param default: initial value of each tile
+			@param identity: if True, values are distinguished by identity instead of equality (e.g. players)
+			@param changes: if given, the indices of changed tiles are added to this set
+		"""
+		self._identity = identity
+		self._changes = changes
+		self.palette = [default]
+		self._lookup = {self._keyOf(default): 0}
+		self.indices = array('H', [0]) * size
+		self.version: int = 0  # incremented whenever a value of a tile changes
+
+	def _keyOf(self, value):
+		return id(value) if self._identity else value
+
+	def paletteIndexOf(self, value) -> int:
+		key = self._keyOf(value)
+		paletteIndex = self._lookup.get(key)
+
+		if paletteIndex is None:
+			paletteIndex = len(self.palette)
+			self.palette.append(value)
+			self._lookup[key] = paletteIndex
+
+		return paletteIndex
+
+	def __getitem__(self, index: int):
+		return self.palette[self.indices[index]]
+
+	def __setitem__(self, index: int, value):
+		paletteIndex = self.paletteIndexOf(value)
+
+		if self.indices[index] != paletteIndex:
+			self.indices[index] = paletteIndex
+			self.version += 1
+
+			if self._changes is not None:
+				self._changes.add(index)
+
+	def __len__(self):
+		return len(self.indices)
+
+	def count(self, predicate: Callable) -> int:
+		"""
+			number of tiles whose value matches the predicate
+
+			the predicate is only evaluated once per distinct value
+		"""
+		return sum(self.indices.count(paletteIndex) for paletteIndex, value in enumerate(self.palette) if predicate(value))
+
+	def mask(self, predicate: Callable) -> bytearray:
+		"""returns a flag per tile (1 if the value of the tile matches the predicate, 0 otherwise)"""
+		table = bytes(1 if predicate(value) else 0 for value in self.palette)
+		return bytearray(table[paletteIndex] for paletteIndex in self.indices)
+
+	def __getstate__(self):
+		# the lookup of identity planes is keyed by id() which does not survive a save
+		state = self.__dict__.copy()
+		del state['_lookup']
+		return state
+
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+		self._lookup = {self._keyOf(value): paletteIndex for paletteIndex, value in enumerate(self.palette)}
+
+
+# maps every byte value to 1 if it is non-zero (see TilePlanes.visibleToAnyOf)
+_nonZeroTable = bytes([0]) + bytes([1]) * 255
+
+
+class TilePlanes:
+	"""
+		struct-of-arrays storage of the tile properties of a map
+
+		tiles of a MapModel are views over one index of these planes, bulk passes can read the planes directly
+	"""
+
+	def __init__(self, width: int, height: int):
+		size = width * height
+		self.width = width
+		self.height = height
+
+		# indices of tiles whose movement costs changed (consumed by the MovementCostTable of the map)
+		self.movementChanges = set()
+
+		self.terrain = TilePlane(size, TerrainType.ocean, changes=self.movementChanges)
+		self.hills = TilePlane(size, False, changes=self.movementChanges)
+		self.feature = TilePlane(size, FeatureType.none, changes=self.movementChanges)
+		self.resource = TilePlane(size, ResourceType.none)
+		self.route = TilePlane(size, RouteType.none, changes=self.movementChanges)
+		self.river = TilePlane(size, 0, changes=self.movementChanges)
+		self.improvement = TilePlane(size, ImprovementType.none)
+		self.owner = TilePlane(size, None, identity=True)
+		self.continent = TilePlane(size, None)
+
+		# per player (by hash of the player): discovered flag and visibility count of each tile
+		# the count is the number of sight sources (units, cities, ...) that currently see the tile
+		self.discovered: Dict[int, bytearray] = dict()
+		self.visibility: Dict[int, bytearray] = dict()
+		# per player (by hash): changes whenever a tile gets discovered or becomes visible / concealed to the player
+		self.sightVersions: Dict[int, int] = dict()
+
+	def __repr__(self):
+		return f'TilePlanes({self.width}, {self.height})'
+
+	def indexOf(self, point: HexPoint) -> int:
+		return point.y * self.width + point.x
+
+	def planes(self) -> [TilePlane]:
+		return [self.terrain, self.hills, self.feature, self.resource, self.route, self.river, self.improvement,
+		        self.owner, self.continent]
+
+	def movementVersion(self) -> int:
+		"""changes whenever a tile property that affects the movement costs changes"""
+		return self.terrain.version + self.hills.version + self.feature.version + self.route.version + \
+			self.river.version
+
+	def discoveredPlane(self, playerHash: int) -> bytearray:
+		plane = self.discovered.get(playerHash)
+
+		if plane is None:
+			plane = bytearray(self.width * self.height)
+			self.discovered[playerHash] = plane
+
+		return plane
+
+	def visibilityPlane(self, playerHash: int) -> bytearray:
+		plane = self.visibility.get(playerHash)
+
+		if plane is None:
+			plane = bytearray(self.width * self.height)
+			self.visibility[playerHash] = plane
+
+		return plane
+
+	def sightVersion(self, playerHash: int) -> int:
+		"""changes whenever the set of tiles discovered by or visible to the player changes"""
+		return self.sightVersions.get(playerHash, 0)
+
+	def sightChanged(self, playerHash: int):
+		self.sightVersions[playerHash] = self.sightVersions.get(playerHash, 0) + 1
+
+	def visibleToAnyOf(self, playerHashes: List[int]) -> bytearray:
+		"""returns a flag per tile (1 if the tile is visible to at least one of the players, 0 otherwise)"""
+		combined = 0
+
+		for playerHash in playerHashes:
+			plane = self.visibility.get(playerHash)
+			if plane is not None:
+				# non-zero bytes of the counts stay non-zero when or-ed as one big int
+				combined |= int.from_bytes(plane, 'little')
+
+		counts = combined.to_bytes(self.width * self.height, 'little')
+		return bytearray(counts.translate(_nonZeroTable))
+
+	def adopt(self, tile, index: int):
+		"""copies the values of a tile (with its own storage) into these planes and binds the tile to them"""
+		source: TilePlanes = tile._planes
+		sourceIndex: int = tile._planeIndex
+
+		for plane, sourcePlane in zip(self.planes(), source.planes()):
+			plane[index] = sourcePlane[sourceIndex]
+
+		for playerHash, sourcePlane in source.discovered.items():
+			self.discoveredPlane(playerHash)[index] = sourcePlane[sourceIndex]
+			self.sightChanged(playerHash)
+
+		for playerHash, sourcePlane in source.visibility.items():
+			self.visibilityPlane(playerHash)[index] = sourcePlane[sourceIndex]
+			self.sightChanged(playerHash)
+
+		tile._planes = self
+		tile._planeIndex = index
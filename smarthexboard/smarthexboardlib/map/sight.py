@@ -0,0 +1,82 @@
+from typing import List
+
+from smarthexboard.smarthexboardlib.map.base import HexPoint
+from smarthexboard.smarthexboardlib.map.types import FeatureType
+
+
+class SightTable:
+	"""
+		tiles that can be seen from each tile of a map
+
+		combines the line of sight templates of HexGeometry with one see through level per tile (see
+		Tile.seeThroughLevel). The visible tiles of a location are cached per sight and sentry promotion until the
+		hills or features of the map change.
+	"""
+
+	def __init__(self, grid):
+		self.grid = grid
+		self._levels = None
+		self._visibleIndices = dict()
+		self._version = -1
+
+	def __getstate__(self):
+		# levels and visible tiles are rebuilt on demand
+		state = self.__dict__.copy()
+		state['_levels'] = None
+		state['_visibleIndices'] = dict()
+		state['_version'] = -1
+		return state
+
+	def _update(self):
+		planes = self.grid.planes
+		version = planes.hills.version + planes.feature.version
+		if version == self._version:
+			return
+
+		# see through level per palette value of hills and feature
+		hillsLevels = bytes(1 if hills else 0 for hills in planes.hills.palette)
+		featureLevels = bytes(self._featureLevel(feature) for feature in planes.feature.palette)
+
+		self._levels = bytes(hillsLevels[hillsIndex] + featureLevels[featureIndex]
+		                     for hillsIndex, featureIndex in zip(planes.hills.indices, planes.feature.indices))
+		self._visibleIndices.clear()
+		self._version = version
+
+	@staticmethod
+	def _featureLevel(feature: FeatureType) -> int:
+		if feature == FeatureType.mountains:
+			return 3
+
+		if feature == FeatureType.forest or feature == FeatureType.rainforest:
+			return 1
+
+		return 0
+
+	def seeThroughLevels(self) -> bytes:
+		self._update()
+		return self._levels
+
+	def visibleIndicesFrom(self, location: HexPoint, sight: int, hasSentry: bool = False) -> List[int]:
+		"""indices of the tiles that can be seen from location (like Tile.canSeeTile)"""
+		self._update()
+
+		if not self.grid.valid(location):
+			return []
+
+		index = location.y * self.grid.width + location.x
+		key = (index, sight, hasSentry)
+		visibleIndices = self._visibleIndices.get(key)
+
+		if visibleIndices is None:
+			levels = self._levels
+			seeThruLevel = 2 if hasSentry else 1
+			visible = {targetIndex for targetIndex, rayIndices in self.grid.geometry.lineOfSight(location, sight)
+			           if all(levels[rayIndex] <= seeThruLevel for rayIndex in rayIndices)}
+
+			# in the order of location.areaWithRadius(sight) - like the tiles were visited before
+			width = self.grid.width
+			visibleIndices = [point.y * width + point.x for point in location.areaWithRadius(sight)
+			                  if self.grid.valid(point) and point.y * width + point.x in visible]
+			self._visibleIndices[key] = visibleIndices
+
+		return visibleIndices
@@ -7,7 +7,7 @@ from smarthexboard.smarthexboardlib.game.cityStates import CityStateType
 from smarthexboard.smarthexboardlib.game.flavors import FlavorType, Flavor
 from smarthexboard.smarthexboardlib.game.types import TechType, CivicType  # not good - map should not import game
 from smarthexboard.smarthexboardlib.map.base import ExtendedEnum, Size, HexPoint
-from smarthexboard.smarthexboardlib.core.base import InvalidEnumError, WeightedBaseList
+from smarthexboard.smarthexboardlib.core.base import InvalidEnumError, WeightedBaseList, memoizedData
 from smarthexboard.smarthexboardlib.utils.translation import gettext_lazy as _
 
 
@@ -78,6 +78,7 @@ class MapSize(ExtendedEnum):
 	def maxActiveReligions(self) -> int:
 		return self._data().maxActiveReligions
 
+	@memoizedData
 	def _data(self):
 		if self == MapSize.duel:
 			return MapSizeData(
@@ -156,6 +157,7 @@ class MapType(ExtendedEnum):
 	def title(self) -> str:
 		return self._data().name
 
+	@memoizedData
 	def _data(self) -> MapTypeData:
 		if self == MapType.empty:
 			return MapTypeData(
@@ -230,6 +232,7 @@ class YieldType(ExtendedEnum):
 
 		raise Exception(f'Cannot get YieldType from name: "{name}"')
 
+	@memoizedData
 	def _data(self) -> Optional[YieldTypeData]:
 		if self == YieldType.none:
 			return YieldTypeData(
@@ -471,6 +474,7 @@ class TerrainType(ExtendedEnum):
 	def riverYieldChange(self, yieldType: YieldType) -> int:
 		return 0
 
+	@memoizedData
 	def _data(self) -> TerrainData:
 		if self == TerrainType.desert:
 			return TerrainData(
@@ -762,6 +766,7 @@ class FeatureType(ExtendedEnum):
 
 		return 0
 
+	@memoizedData
 	def _data(self):
 		if self == FeatureType.none:
 			return FeatureData(
@@ -1404,6 +1409,7 @@ class ResourceType(ExtendedEnum):
 	def peakEra(self) -> Optional[EraType]:
 		return self._data().peakEra
 
+	@memoizedData
 	def _data(self) -> ResourceTypeData:
 		# default
 		if self == ResourceType.none:
@@ -2346,6 +2352,7 @@ class AppealLevel(ExtendedEnum):
 	def housing(self) -> int:
 		return self._data().housing
 
+	@memoizedData
 	def _data(self) -> AppealLevelData:
 		if self == AppealLevel.breathtaking:
 			return AppealLevelData('Breathtaking', 6)
@@ -2403,6 +2410,7 @@ class RouteType(ExtendedEnum):
 	def era(self) -> EraType:
 		return self._data().era
 
+	@memoizedData
 	def _data(self):
 		if self == RouteType.none:
 			return RouteTypeData(
@@ -0,0 +1,677 @@
+import hashlib
+import importlib
+import json
+import struct
+import zlib
+from array import array
+from enum import Enum
+from typing import Optional
+
+from smarthexboard.smarthexboardlib.game.game import GameModel
+from smarthexboard.smarthexboardlib.map.base import HexPoint
+from smarthexboard.smarthexboardlib.map.map import MapModel
+
+try:
+	import zstandard
+except ImportError:  # zstd is optional, zlib is always available
+	zstandard = None
+
+
+class BinaryCodecError(Exception):
+	pass
+
+
+class BinaryCompression:
+	none = 0
+	zlib = 1
+	zstd = 2
+
+
+# only the classes of these modules (and the builtin containers below) are created when loading
+_libModulePrefix = 'smarthexboard.smarthexboardlib.'
+_builtinClasses = {
+	'builtins:list': list,
+	'builtins:dict': dict,
+	'builtins:set': set,
+	'builtins:bytearray': bytearray,
+	'array:array': array
+}
+# builtin containers that are stored as records if more than one object refers to them
+_containerTypes = (list, dict, set, bytearray, array)
+_scalarTypes = (bool, int, float, str)
+
+
+def _className(cls) -> str:
+	return f'{cls.__module__}:{cls.__qualname__}'
+
+
+def _isPoint(value) -> bool:
+	"""points without other attributes are stored as values (see _GraphEncoder._encode)"""
+	return type(value) is HexPoint and value.__dict__.keys() == {'x', 'y'} and type(value.x) is int and \
+		type(value.y) is int
+
+
+def _digest(payload: bytes) -> bytes:
+	return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+class SaveState:
+	"""
+		what was persisted of a game: the records of the last snapshot / delta (see GameModelCodec.dumpsDelta)
+
+		the objects keep their record ids from save to save, so that only the records whose digest changed are
+		written as delta.
+	"""
+
+	def __init__(self, sequence: int = 0):
+		self.sequence = sequence
+		self.classes: list = []  # names of the classes of the records (module:qualname)
+		self.recordIds: dict = dict()  # id() of the persisted objects -> record id
+		self.digests: dict = dict()  # record id -> digest of the persisted record
+		self.nextId: int = 0
+
+
+class _GraphEncoder:
+	"""
+		encodes the object graph of a game (or map) into records
+
+		every object of the lib and every builtin container that is referenced more than once is a record (json of
+		the class index, the state of __getstate__ and the items of dicts, lists or sets, followed by the bytes of
+		byte arrays). Records refer to each other by record id, the root has record id 0. Everything else is stored
+		inline: scalars, enums, points, tuples, frozensets and the containers with one reference.
+	"""
+
+	def __init__(self, state: SaveState):
+		self._state = state
+		self._classIndices = dict()  # class -> index in the classes of the save state
+		self._objects = dict()  # id() -> object (referenced to keep the ids unique while encoding)
+		self._states = dict()  # id() -> state of the lib objects
+		self._references = dict()  # id() -> number of references of the builtin containers
+		self._recordIds = dict()  # id() -> record id
+		self._blobs = None  # byte arrays of the record being encoded
+
+	def encode(self, root) -> dict:
+		"""
+			@return: payload by record id - the save state is updated to the record ids of this encoding
+		"""
+		self._collect(root)
+
+		recordIds = self._state.recordIds
+		for key, value in self._objects.items():
+			if key in self._states or self._references[key] > 1:
+				recordId = recordIds.get(key)
+				if recordId is None:
+					recordId = self._state.nextId
+					self._state.nextId += 1
+
+				self._recordIds[key] = recordId
+
+		records = dict()
+		for key, recordId in self._recordIds.items():
+			records[recordId] = self._encodeRecord(key)
+
+		self._state.recordIds = dict(self._recordIds)
+		return records
+
+	def _collect(self, root):
+		"""finds the objects of the graph and counts the references of the builtin containers"""
+		stack = [root]
+		while len(stack) > 0:
+			value = stack.pop()
+			valueType = type(value)
+
+			if value is None or isinstance(value, Enum) or isinstance(value, _scalarTypes) or _isPoint(value):
+				continue
+
+			if valueType is tuple or valueType is frozenset:
+				stack.extend(value)
+				continue
+
+			key = id(value)
+			if valueType in _containerTypes:
+				count = self._references.get(key, 0) + 1
+				self._references[key] = count
+				if count == 1:
+					self._objects[key] = value
+					self._pushItems(stack, value)
+
+				continue
+
+			if key in self._objects:
+				continue
+
+			self._classIndex(valueType)
+			state = value.__getstate__()
+			if state is not None and not isinstance(state, dict):
+				raise BinaryCodecError(f'unsupported state of {_className(valueType)}: {type(state)}')
+
+			self._objects[key] = value
+			self._states[key] = state
+
+			if state is not None:
+				stack.extend(state.values())
+
+			self._pushItems(stack, value)
+
+	@staticmethod
+	def _pushItems(stack: list, value):
+		if isinstance(value, dict):
+			for itemKey, itemValue in dict.items(value):
+				stack.append(itemKey)
+				stack.append(itemValue)
+		elif isinstance(value, (list, set)):
+			stack.extend(value)
+
+	def _classIndex(self, cls) -> int:
+		index = self._classIndices.get(cls)
+
+		if index is None:
+			name = self._storedName(cls)
+			if name in self._state.classes:
+				index = self._state.classes.index(name)
+			else:
+				index = len(self._state.classes)
+				self._state.classes.append(name)
+
+			self._classIndices[cls] = index
+
+		return index
+
+	@staticmethod
+	def _storedName(cls) -> str:
+		"""name of the class that is created when loading an object of cls"""
+		name = _className(cls)
+		if name in _builtinClasses:
+			return name
+
+		# subclasses outside the lib (e.g. the mocks of the tests) are stored as their closest lib class
+		libClass = next((base for base in cls.__mro__ if base.__module__.startswith(_libModulePrefix)), None)
+		if libClass is None or '<locals>' in libClass.__qualname__:
+			raise BinaryCodecError(f'unsupported type: {name}')
+
+		if not issubclass(libClass, Enum) and issubclass(libClass, (tuple, frozenset, str, bytes, int, float, array)):
+			raise BinaryCodecError(f'unsupported base class of {name}')
+
+		return _className(libClass)
+
+	def _encodeRecord(self, key: int) -> bytes:
+		value = self._objects[key]
+		self._blobs = []
+
+		if key in self._states:
+			state = self._states[key]
+			record = [self._classIndex(type(value)), None if state is None else self._encode(state)]
+		else:
+			record = [self._classIndex(type(value)), None]
+
+		if isinstance(value, _containerTypes):
+			record.append(self._encodeItems(value))
+
+		blobs = self._blobs
+		self._blobs = None
+		return GameModelCodec._join([GameModelCodec._json(record)] + blobs)
+
+	def _encodeItems(self, value):
+		if isinstance(value, dict):
+			return [[self._encode(itemKey), self._encode(itemValue)] for itemKey, itemValue in dict.items(value)]
+		elif isinstance(value, list):
+			return [self._encode(item) for item in value]
+		elif isinstance(value, set):
+			return self._sorted(value)
+		elif isinstance(value, bytearray):
+			return self._blob(value)
+
+		return [value.typecode, self._blob(value)]
+
+	def _encode(self, value):
+		if value is None:
+			return None
+
+		valueType = type(value)
+		if isinstance(value, Enum):
+			return ['e', self._classIndex(valueType), value._name_]
+
+		if isinstance(value, _scalarTypes):
+			return value
+
+		if valueType is tuple:
+			return ['t', [self._encode(item) for item in value]]
+
+		if valueType is frozenset:
+			return ['f', self._sorted(value)]
+
+		if _isPoint(value):
+			return ['p', value.x, value.y]
+
+		recordId = self._recordIds.get(id(value))
+		if recordId is not None:
+			return ['r', recordId]
+
+		if valueType is dict:
+			if all(type(itemKey) is str for itemKey in value.keys()):
+				return {itemKey: self._encode(itemValue) for itemKey, itemValue in value.items()}
+
+			return ['d', self._encodeItems(value)]
+		elif valueType is list:
+			return ['l', self._encodeItems(value)]
+		elif valueType is set:
+			return ['s', self._encodeItems(value)]
+		elif valueType is bytearray:
+			return ['x', self._encodeItems(value)]
+		elif valueType is array:
+			return ['a', *self._encodeItems(value)]
+
+		raise BinaryCodecError(f'unsupported type: {_className(valueType)}')
+
+	def _sorted(self, items) -> list:
+		# the order of sets differs from process to process - sorted, so that unchanged sets have the same record
+		return sorted((self._encode(item) for item in items), key=GameModelCodec._json)
+
+	def _blob(self, value) -> int:
+		self._blobs.append(bytes(value))
+		return len(self._blobs) - 1
+
+
+class _GraphDecoder:
+	"""
+		creates the objects of the records of _GraphEncoder
+
+		the objects are created empty first. Their scalars, enums, points and references are set before the other
+		values, so that they can be hashed (e.g. players, points or cities as keys of dicts) while the dicts and sets
+		are filled. The objects get their complete state in the order of the encoded state, __setstate__ methods are
+		called last.
+	"""
+
+	def __init__(self, classes: list, records: dict):
+		self._classNames = classes
+		self._classes = dict()
+		self._records = records
+		self._objects = dict()  # record id -> object
+		self._blobs = None
+
+	def decode(self):
+		"""
+			@return: the root object and the save state of the records
+		"""
+		parsed = dict()
+		for recordId, payload in self._records.items():
+			parts = GameModelCodec._split(payload)
+			record = json.loads(parts[0])
+			cls = self._classOf(record[0])
+
+			if cls is bytearray:
+				obj = bytearray(parts[1 + record[2]])
+			elif cls is array:
+				obj = array(record[2][0], parts[1 + record[2][1]])
+			elif cls in _builtinClasses.values():
+				obj = cls()
+			else:
+				obj = cls.__new__(cls)
+
+			self._objects[recordId] = obj
+			parsed[recordId] = (record, parts[1:])
+
+		if 0 not in self._objects:
+			raise BinaryCodecError('binary data without root record')
+
+		# scalars, enums, points and references - needed to hash the objects
+		for recordId, (record, blobs) in parsed.items():
+			state = record[1]
+			if state is not None:
+				self._blobs = blobs
+				self._objects[recordId].__dict__.update(
+					{name: self._decode(value) for name, value in state.items() if self._isSimple(value)})
+
+		states = dict()
+		items = dict()
+		for recordId, (record, blobs) in parsed.items():
+			self._blobs = blobs
+			if record[1] is not None:
+				states[recordId] = self._decode(record[1])
+
+			if len(record) > 2 and type(self._objects[recordId]) not in (bytearray, array):
+				items[recordId] = self._decodeItems(self._objects[recordId], record[2])
+
+		hooks = []
+		for recordId, state in states.items():
+			obj = self._objects[recordId]
+			if getattr(type(obj), '__setstate__', None) is not None:
+				hooks.append(recordId)
+			else:
+				obj.__dict__.clear()
+				obj.__dict__.update(state)
+
+		for recordId, recordItems in items.items():
+			obj = self._objects[recordId]
+			if isinstance(obj, dict):
+				dict.update(obj, recordItems)
+			elif isinstance(obj, list):
+				list.extend(obj, recordItems)
+			elif isinstance(obj, set):
+				set.update(obj, recordItems)
+			else:
+				bytearray.extend(obj, recordItems)
+
+		for recordId in sorted(hooks, reverse=True):
+			obj = self._objects[recordId]
+			obj.__dict__.clear()
+			obj.__setstate__(states[recordId])
+
+		state = SaveState()
+		state.classes = list(self._classNames)
+		state.recordIds = {id(obj): recordId for recordId, obj in self._objects.items()}
+		state.digests = {recordId: _digest(payload) for recordId, payload in self._records.items()}
+		state.nextId = max(self._objects.keys()) + 1
+		return self._objects[0], state
+
+	def _classOf(self, index: int):
+		cls = self._classes.get(index)
+		if cls is not None:
+			return cls
+
+		name = self._classNames[index]
+		cls = _builtinClasses.get(name)
+		if cls is None:
+			moduleName, _, qualifiedName = name.partition(':')
+			if not moduleName.startswith(_libModulePrefix):
+				raise BinaryCodecError(f'unsupported type: {name}')
+
+			try:
+				cls = importlib.import_module(moduleName)
+				for attribute in qualifiedName.split('.'):
+					cls = getattr(cls, attribute)
+			except (ImportError, AttributeError):
+				raise BinaryCodecError(f'unknown type: {name}')
+
+			if not isinstance(cls, type):
+				raise BinaryCodecError(f'not a type: {name}')
+
+		self._classes[index] = cls
+		return cls
+
+	@staticmethod
+	def _isSimple(value) -> bool:
+		if not isinstance(value, list):
+			return not isinstance(value, dict)
+
+		tag = value[0]
+		if tag == 't':
+			return all(_GraphDecoder._isSimple(item) for item in value[1])
+
+		return tag in ('e', 'p', 'r')
+
+	def _decodeItems(self, obj, items):
+		if isinstance(obj, dict):
+			return [(self._decode(itemKey), self._decode(itemValue)) for itemKey, itemValue in items]
+		elif isinstance(obj, (list, set)):
+			return [self._decode(item) for item in items]
+
+		return self._blobs[items]
+
+	def _decode(self, value):
+		if isinstance(value, dict):
+			return {itemKey: self._decode(itemValue) for itemKey, itemValue in value.items()}
+
+		if not isinstance(value, list):
+			return value
+
+		tag = value[0]
+		if tag == 'r':
+			return self._objects[value[1]]
+		elif tag == 'e':
+			return self._classOf(value[1])[value[2]]
+		elif tag == 'p':
+			return HexPoint(value[1], value[2])
+		elif tag == 't':
+			return tuple(self._decode(item) for item in value[1])
+		elif tag == 'f':
+			return frozenset(self._decode(item) for item in value[1])
+		elif tag == 'l':
+			return [self._decode(item) for item in value[1]]
+		elif tag == 'd':
+			return {self._decode(itemKey): self._decode(itemValue) for itemKey, itemValue in value[1]}
+		elif tag == 's':
+			return {self._decode(item) for item in value[1]}
+		elif tag == 'x':
+			return bytearray(self._blobs[value[1]])
+		elif tag == 'a':
+			return array(value[1], self._blobs[value[2]])
+
+		raise BinaryCodecError(f'unknown value of binary game: {tag}')
+
+
+class GameModelCodec:
+	"""
+		versioned binary save format of a GameModel
+
+		layout: magic, version, compression and the named parts, each compressed on its own: a header (kind of the
+		data, classes of the records, record ids) and the records of the object graph of the game (see _GraphEncoder).
+		The format is lossless: the loaded game has the same state as the saved one, only the ui, the change log of
+		the map and the path cache start empty (see GameModel.__getstate__). Only classes of the lib are created when
+		loading.
+	"""
+	magic = b'SHBG'
+	version = 2
+
+	def __init__(self, compression: Optional[int] = None, level: int = 6):
+		if compression is None:
+			compression = BinaryCompression.zstd if zstandard is not None else BinaryCompression.zlib
+
+		if compression == BinaryCompression.zstd and zstandard is None:
+			raise BinaryCodecError('zstd compression needs the zstandard package')
+
+		self.compression = compression
+		self.level = level
+
+	# encoding
+
+	def dumps(self, gameModel: GameModel, state: Optional[SaveState] = None) -> bytes:
+		"""
+			snapshot of the game
+
+			@param gameModel: game to encode
+			@param state: if given, it is updated to the snapshot - the base of the next delta (see dumpsDelta)
+			@return: binary data
+		"""
+		state = state if state is not None else SaveState()
+		records = _GraphEncoder(state).encode(gameModel)
+
+		state.digests = {recordId: _digest(payload) for recordId, payload in records.items()}
+		state.sequence = 0
+		return self._packRecords('game', state, records, [])
+
+	def dumpsMap(self, mapModel: MapModel) -> bytes:
+		"""binary data of a map without a game (e.g. the pre-generated maps of the pool) - see loadsMap"""
+		state = SaveState()
+		return self._packRecords('map', state, _GraphEncoder(state).encode(mapModel), [])
+
+	def dumpsDelta(self, gameModel: GameModel, state: SaveState) -> Optional[bytes]:
+		"""
+			encodes the changes of the game since the state (which is advanced to the current state)
+
+			the whole game is encoded, but only the records whose digest differs from the state are written (and the
+			ids of the records that are gone)
+
+			@param gameModel: game to encode
+			@param state: state of the last snapshot / delta
+			@return: binary delta or None if nothing changed
+		"""
+		records = _GraphEncoder(state).encode(gameModel)
+
+		changed = dict()
+		digests = dict()
+		for recordId, payload in records.items():
+			digest = _digest(payload)
+			digests[recordId] = digest
+
+			if state.digests.get(recordId) != digest:
+				changed[recordId] = payload
+
+		removed = [recordId for recordId in state.digests.keys() if recordId not in records]
+
+		if len(changed) == 0 and len(removed) == 0:
+			return None
+
+		state.digests = digests
+		state.sequence += 1
+		return self._packRecords('delta', state, changed, removed)
+
+	def _packRecords(self, kind: str, state: SaveState, records: dict, removed: list) -> bytes:
+		header = {
+			'kind': kind,
+			'sequence': state.sequence,
+			'classes': state.classes,
+			'ids': list(records.keys()),
+			'removed': removed
+		}
+		return self._pack({'header': self._json(header), 'records': self._join(records.values())})
+
+	def _compress(self, payload: bytes) -> bytes:
+		if self.compression == BinaryCompression.zlib:
+			return zlib.compress(payload, self.level)
+		elif self.compression == BinaryCompression.zstd:
+			return zstandard.ZstdCompressor(level=self.level).compress(payload)
+
+		return payload
+
+	# decoding
+
+	def loads(self, data: bytes) -> GameModel:
+		return self.open(data).gameModel()
+
+	def loadsMap(self, data: bytes) -> MapModel:
+		"""loads a map of dumpsMap"""
+		header, records = self._unpackRecords(data)
+		if header['kind'] != 'map':
+			raise BinaryCodecError('not a binary map')
+
+		mapModel, _ = _GraphDecoder(header['classes'], records).decode()
+		return mapModel
+
+	def open(self, data: bytes) -> 'SavedGame':
+		"""binary game data that the deltas can be applied to before it is loaded"""
+		return SavedGame(self, data)
+
+	def _unpackRecords(self, data: bytes):
+		"""
+			@return: header and the payloads of the records by record id
+		"""
+		compression, parts = self._unpack(data)
+		header = json.loads(self._decompress(compression, parts['header']))
+		payloads = self._split(self._decompress(compression, parts['records']))
+		return header, dict(zip(header['ids'], payloads))
+
+	# container
+
+	def _pack(self, parts: dict) -> bytes:
+		data = bytearray(self.magic + struct.pack('<BBH', self.version, self.compression, len(parts)))
+		for name, part in parts.items():
+			encodedName = name.encode('utf-8')
+			compressed = self._compress(part)
+			data += struct.pack('<B', len(encodedName)) + encodedName
+			data += struct.pack('<I', len(compressed)) + compressed
+
+		return bytes(data)
+
+	def _unpack(self, data: bytes):
+		"""
+			@return: compression and the still compressed parts by name
+		"""
+		if data[:4] != self.magic:
+			raise BinaryCodecError('not a binary game')
+
+		version, compression = struct.unpack_from('<BB', data, 4)
+		if version != self.version:
+			raise BinaryCodecError(f'unsupported version of binary game: {version}')
+
+		count, = struct.unpack_from('<H', data, 6)
+		parts = dict()
+		offset = 8
+		for _ in range(count):
+			nameLength, = struct.unpack_from('<B', data, offset)
+			name = data[offset + 1:offset + 1 + nameLength].decode('utf-8')
+			offset += 1 + nameLength
+			length, = struct.unpack_from('<I', data, offset)
+			parts[name] = data[offset + 4:offset + 4 + length]
+			offset += 4 + length
+
+		return compression, parts
+
+	@staticmethod
+	def _join(parts) -> bytes:
+		payload = bytearray()
+		for part in parts:
+			payload += struct.pack('<I', len(part))
+			payload += part
+
+		return bytes(payload)
+
+	@staticmethod
+	def _split(payload: bytes) -> list:
+		parts = []
+		offset = 0
+		while offset < len(payload):
+			length, = struct.unpack_from('<I', payload, offset)
+			parts.append(payload[offset + 4:offset + 4 + length])
+			offset += 4 + length
+
+		return parts
+
+	@staticmethod
+	def _json(value) -> bytes:
+		return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+	@staticmethod
+	def _decompress(compression: int, payload: bytes) -> bytes:
+		if compression == BinaryCompression.zlib:
+			return zlib.decompress(payload)
+		elif compression == BinaryCompression.zstd:
+			if zstandard is None:
+				raise BinaryCodecError('zstd compression needs the zstandard package')
+
+			return zstandard.ZstdDecompressor().decompress(payload)
+		elif compression == BinaryCompression.none:
+			return payload
+
+		raise BinaryCodecError(f'unknown compression of binary game: {compression}')
+
+
+class SavedGame:
+	"""
+		binary game data (and the deltas applied to it)
+
+		deltas replace the records they changed and drop the records that are gone, the game is only decoded by
+		gameModel.
+	"""
+
+	def __init__(self, codec: GameModelCodec, data: bytes):
+		header, self.records = codec._unpackRecords(data)
+		if header['kind'] != 'game':
+			raise BinaryCodecError('not a binary game')
+
+		self._codec = codec
+		self.classes = header['classes']
+		self.sequence = header['sequence']
+
+	def applyDelta(self, data: bytes):
+		"""applies a binary delta (see GameModelCodec.dumpsDelta)"""
+		header, records = self._codec._unpackRecords(data)
+		if header['kind'] != 'delta':
+			raise BinaryCodecError('not a binary delta')
+
+		for recordId in header['removed']:
+			self.records.pop(recordId, None)
+
+		self.records.update(records)
+		self.classes = header['classes']
+		self.sequence = header['sequence']
+
+	def gameModel(self) -> GameModel:
+		"""the game with the save state of this data - the next delta continues it"""
+		gameModel, state = _GraphDecoder(self.classes, self.records).decode()
+		if not isinstance(gameModel, GameModel):
+			raise BinaryCodecError('not a binary game')
+
+		state.sequence = self.sequence
+		gameModel.saveState = state
+		return gameModel
@@ -89,10 +89,13 @@ class GameModelSchema(Schema):
 		for city in tmp_game._map._cities:
 			if city.tmp_leader == LeaderType.cityState:
 				city.leader = LeaderType.cityState
-				city.player = tmp_game.cityStatePlayerFor(city.tmp_leader)
+				city.player = tmp_game.cityStatePlayerFor(city.tmp_cityState)
 			else:
 				city.player = tmp_game.playerFor(city.tmp_leader)
 
+		# the players of the cities changed
+		tmp_game._map.rebuildIndexes()
+
 		return tmp_game
 
 	class Meta:
@@ -147,12 +147,10 @@ class TileSchema(Schema):
 				raise TypeError(f'Invalid wonder type: {type(wonderValue)} for tile {data["point"]}')
 
 		if 'visible' in data:
-			for key, value in data['visible'].items():
-				deserialized_tile.visible[key] = value
+			deserialized_tile.visible = data['visible']
 
 		if 'discovered' in data:
-			for key, value in data['discovered'].items():
-				deserialized_tile.discovered[key] = value
+			deserialized_tile.discovered = data['discovered']
 
 		# raise Exception(f'Tile deserialization not implemented yet - {data}')
 		return deserialized_tile
@@ -204,7 +202,7 @@ class CitySchema(Schema):
 	lastTurnFoodHarvested = fields.Float(attribute='_lastTurnFoodHarvestedValue')
 	lastTurnGarrisonAssigned = fields.Int(attribute='_lastTurnGarrisonAssigned')
 
-	player = fields.Nested(PlayerSchema(only=("leader",)))  # fields.Function(lambda obj: hash(obj.player))
+	player = fields.Nested(PlayerSchema(only=("leader", "cityState")))  # fields.Function(lambda obj: hash(obj.player))
 	originalLeader = EnumField(LeaderType, attribute='originalLeaderValue')
 	originalCityState = EnumField(CityStateType, attribute='originalCityStateValue', allow_none=True)
 	previousLeader = EnumField(LeaderType, attribute='previousLeaderValue', allow_none=True)
@@ -270,6 +268,7 @@ class CitySchema(Schema):
 		)
 
 		deserialized_city.tmp_leader = data['originalLeaderValue']
+		deserialized_city.tmp_cityState = data['player'].get('cityState') if 'player' in data else None
 
 		return deserialized_city
 
@@ -81,6 +81,83 @@ Map.prototype.fromJson = function(json_dict) {
     this.cities = []
 }
 
+/**
+ * replaces the tiles and units of a chunk of the map
+ *
+ * @param {Object} json_dict chunk of the map: x, y, width, height, tiles as [terrain, isHills, feature, resource, quantity] and units
+ */
+Map.prototype.applyChunk = function(json_dict) {
+
+    const x0 = json_dict['x'];
+    const y0 = json_dict['y'];
+    const width = json_dict['width'];
+    const height = json_dict['height'];
+
+    for (let j = 0; j < height; j++) {
+        for (let i = 0; i < width; i++) {
+            const tile_values = json_dict['tiles'][j * width + i];
+            const point = new HexPoint(x0 + i, y0 + j);
+
+            this.tiles[point.x][point.y] = new Tile(TerrainType.fromString(tile_values[0]));
+            this.modifyHillsAt(tile_values[1], point);
+            this.modifyFeatureAt(FeatureType.fromString(tile_values[2]), point);
+            this.modifyResourceAt(ResourceType.fromString(tile_values[3]), point);
+        }
+    }
+
+    // replace the units of the chunk
+    this.units = this.units.filter(function (elem) {
+        return elem.location.x < x0 || elem.location.x >= x0 + width || elem.location.y < y0 || elem.location.y >= y0 + height;
+    });
+
+    const units_json = json_dict['units'];
+    for (let i = 0; i < units_json.length; i++) {
+        const unitObj = new Unit();
+        unitObj.fromJson(units_json[i]);
+        this.units.push(unitObj);
+    }
+}
+
+/**
+ * replaces the changed tiles and the units and cities at the changed points
+ *
+ * @param {Object} json_dict map diff: points, tiles as [x, y, terrain, isHills, feature, resource, quantity], units and cities
+ */
+Map.prototype.applyDiff = function(json_dict) {
+
+    const points = json_dict['points'].map(function (values) {
+        return values[0] + ',' + values[1];
+    });
+
+    for (let i = 0; i < json_dict['tiles'].length; i++) {
+        const tile_values = json_dict['tiles'][i];
+        const point = new HexPoint(tile_values[0], tile_values[1]);
+
+        this.tiles[point.x][point.y] = new Tile(TerrainType.fromString(tile_values[2]));
+        this.modifyHillsAt(tile_values[3], point);
+        this.modifyFeatureAt(FeatureType.fromString(tile_values[4]), point);
+        this.modifyResourceAt(ResourceType.fromString(tile_values[5]), point);
+    }
+
+    const isChanged = function (elem) {
+        return points.includes(elem.location.x + ',' + elem.location.y);
+    };
+
+    this.units = this.units.filter(elem => !isChanged(elem));
+    for (let i = 0; i < json_dict['units'].length; i++) {
+        const unitObj = new Unit();
+        unitObj.fromJson(json_dict['units'][i]);
+        this.units.push(unitObj);
+    }
+
+    this.cities = this.cities.filter(elem => !isChanged(elem));
+    for (let i = 0; i < json_dict['cities'].length; i++) {
+        const cityObj = new City();
+        cityObj.fromJson(json_dict['cities'][i]);
+        this.cities.push(cityObj);
+    }
+}
+
 Map.prototype.copy = function(map) {
     this.rows = map.rows;
 	this.cols = map.cols;
@@ -548,6 +548,8 @@ function initUI() {
 
 let generation_check_timer;
 let update_check_timer;
+let map_chunk_etags = {};  // etag by chunk key 'x,y'
+let map_turn = 0;  // turn of the map state the client knows
 
 // to be called when you want to stop a timer
 function abortGenerationTimer() {
@@ -593,6 +595,7 @@ function checkGameUpdate() {
             // $('#refresh_status').text(response.status);
             if (response.human_active === true) {
                 fetchGameInfo();
+                fetchMapDiff();
             }
         },
         error: function(xhr, textStatus, exception) {
@@ -664,6 +667,11 @@ function loadMap(game_id) {
             // create canvas with this size
             setupCanvas(mapObj.canvasSize());
 
+            // remember the state of the chunks to only load the changed ones later
+            map_chunk_etags = {};
+            map_turn = 0;
+            refreshMapChunks(false);
+
             changeUIState(UIState.game);
 
             /* start update status */
@@ -676,6 +684,85 @@ function loadMap(game_id) {
     });
 }
 
+/**
+ * loads the tiles, units and cities that changed since the last known turn - or the changed chunks if the server
+ * does not know the changes
+ */
+function fetchMapDiff() {
+    $.ajax({
+        type:"GET",
+        dataType: "json",
+        url: "/smarthexboard/" + game_id + "/map/diff/" + map_turn + "?timestamp=" + Date.now(),
+        success: function(json_obj) {
+            map_turn = json_obj.turn;
+
+            if (json_obj.full === true) {
+                refreshMapChunks(true);
+                return;
+            }
+
+            console.log('loaded map diff of game: ' + game_id + ' with ' + json_obj.points.length + ' changed points');
+            renderer.map.applyDiff(json_obj);
+
+            // full map rendering
+            renderer.render();
+        },
+        error: function(xhr, textStatus, exception) {
+            handleError(xhr, textStatus, exception);
+        }
+    });
+}
+
+/**
+ * compares the etags of the map chunks with the known ones and loads the changed chunks
+ *
+ * @param {boolean} fetchChanged load the changed chunks - otherwise only the etags are remembered
+ */
+function refreshMapChunks(fetchChanged) {
+    $.ajax({
+        type:"GET",
+        dataType: "json",
+        url: "/smarthexboard/" + game_id + "/map/chunks?timestamp=" + Date.now(),
+        success: function(json_obj) {
+            json_obj.chunks.forEach(function(chunk) {
+                const key = chunk.x + ',' + chunk.y;
+
+                if (map_chunk_etags[key] === chunk.etag) {
+                    return;
+                }
+
+                if (fetchChanged) {
+                    loadMapChunk(chunk.x, chunk.y, chunk.etag);
+                } else {
+                    map_chunk_etags[key] = chunk.etag;
+                }
+            });
+        },
+        error: function(xhr, textStatus, exception) {
+            handleError(xhr, textStatus, exception);
+        }
+    });
+}
+
+function loadMapChunk(chunk_x, chunk_y, etag) {
+    $.ajax({
+        type:"GET",
+        dataType: "json",
+        url: "/smarthexboard/" + game_id + "/map/chunk/" + chunk_x + "/" + chunk_y,
+        success: function(json_obj) {
+            console.log('loaded map chunk ' + chunk_x + ', ' + chunk_y + ' of game: ' + game_id);
+            map_chunk_etags[chunk_x + ',' + chunk_y] = etag;
+            renderer.map.applyChunk(json_obj);
+
+            // full map rendering
+            renderer.render();
+        },
+        error: function(xhr, textStatus, exception) {
+            handleError(xhr, textStatus, exception);
+        }
+    });
+}
+
 function moveUnit(from_point, to_point, unit_map_type) {
     const formData = new FormData();
     formData.append('game_id', game_id);
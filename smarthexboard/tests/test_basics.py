@@ -216,6 +216,14 @@ class TestAssets(unittest.TestCase):
 		for terrain in list(TerrainType):
 			_ = terrain.title()
 
+	def test_memoized_data(self):
+		self.assertIs(TerrainType.grass._data(), TerrainType.grass._data())
+		self.assertIs(UnitType.warrior._data(), UnitType.warrior._data())
+
+		uncachedData = TerrainType._data.__wrapped__(TerrainType.grass)
+		self.assertIsNot(uncachedData, TerrainType.grass._data())
+		self.assertEqual(uncachedData.name, TerrainType.grass._data().name)
+
 	def test_feature_data(self):
 		for feature in list(FeatureType):
 			_ = feature.title()
@@ -133,6 +133,27 @@ class TestDiplomaticAI(unittest.TestCase):
 		# then
 		self.assertFalse(canSend)
 
+	def test_doRevokeDelegation_conceals_capital(self):
+		# given
+		self.playerAlexander.doFirstContactWith(self.playerTrajan, self.simulation)
+
+		capital = City("Capital", HexPoint(12, 12), isCapital=True, player=self.playerTrajan)
+		self.simulation.addCity(capital)
+
+		self.playerAlexander.treasury.changeGoldBy(60)
+		self.playerAlexander.diplomacyAI.doSendDelegationTo(self.playerTrajan, self.simulation)
+		sightedTiles = self.mapModel.numberOfVisibleTilesTo(self.playerAlexander)
+
+		# when
+		for point in HexPoint(12, 12).areaWithRadius(1):
+			self.mapModel.tileAt(point).setHills(True)
+		self.playerAlexander.diplomacyAI.doRevokeDelegation(self.playerTrajan, self.simulation)
+
+		# then
+		self.assertGreater(sightedTiles, 0)
+		self.assertEqual(self.mapModel.numberOfVisibleTilesTo(self.playerAlexander), 0)
+		self.assertFalse(self.playerAlexander.diplomacyAI.hasSentDelegationTo(self.playerTrajan))
+
 	def test_canSendDelegationTo_blocking_civic(self):
 		# given
 		self.playerAlexander.doFirstContactWith(self.playerTrajan, self.simulation)
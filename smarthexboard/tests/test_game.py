@@ -11,6 +11,7 @@ from smarthexboard.smarthexboardlib.game.game import GameModel
 from smarthexboard.smarthexboardlib.game.generation import UserInterfaceImpl, GameGenerator
 from smarthexboard.smarthexboardlib.game.players import Player
 from smarthexboard.smarthexboardlib.game.states.builds import BuildType
+from smarthexboard.smarthexboardlib.game.states.ui import MapChangeLog
 from smarthexboard.smarthexboardlib.game.states.victories import VictoryType
 from smarthexboard.smarthexboardlib.game.types import TechType, CivicType
 from smarthexboard.smarthexboardlib.game.unitTypes import UnitType, UnitActivityType, UnitAutomationType
@@ -233,6 +234,32 @@ class TestPlayerStrategies(unittest.TestCase):
 		self.assertEqual(player.militaryAI.adopted(MilitaryStrategyType.eradicateBarbarians), True)
 
 
+class TestMapChangeLog(unittest.TestCase):
+	def test_changed_since(self):
+		# GIVEN
+		changeLog = MapChangeLog(turn=3)
+		changeLog.record(HexPoint(1, 1))
+		changeLog.setTurn(4)
+		changeLog.record(HexPoint(2, 2))
+
+		# WHEN / THEN
+		self.assertEqual(changeLog.changedSince(3), {HexPoint(1, 1), HexPoint(2, 2)})
+		self.assertEqual(changeLog.changedSince(4), {HexPoint(2, 2)})
+		self.assertIsNone(changeLog.changedSince(2))
+
+	def test_forgets_old_turns(self):
+		# GIVEN
+		changeLog = MapChangeLog(turn=0)
+		changeLog.record(HexPoint(1, 1))
+
+		# WHEN
+		changeLog.setTurn(MapChangeLog.maxTurns)
+
+		# THEN
+		self.assertIsNone(changeLog.changedSince(0))
+		self.assertEqual(changeLog.changedSince(1), set())
+
+
 class TestSimulation(unittest.TestCase):
 	def test_found_capital(self):
 		# GIVEN
@@ -1,6 +1,10 @@
 """ unittest module """
 import logging
+import random
+import sys
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 from smarthexboard.smarthexboardlib.game.baseTypes import HandicapType
 from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
@@ -13,15 +17,18 @@ from smarthexboard.smarthexboardlib.game.types import TechType, CivicType
 from smarthexboard.smarthexboardlib.game.unitTypes import UnitType
 from smarthexboard.smarthexboardlib.game.units import Unit
 from smarthexboard.smarthexboardlib.map.areas import Continent
-from smarthexboard.smarthexboardlib.map.base import Array2D, HexDirection, HexPoint, HexCube, HexArea, BoundingBox, Size
-from smarthexboard.smarthexboardlib.map.generation import HeightMap, MapOptions, MapGenerator
+from smarthexboard.smarthexboardlib.map.base import Array2D, HexDirection, HexPoint, HexCube, HexArea, BoundingBox, Size, \
+	HexGeometry
+from smarthexboard.smarthexboardlib.map.generation import HeightMap, MapOptions, MapGenerator, ContinentFinder, OceanFinder
 from smarthexboard.smarthexboardlib.map.improvements import ImprovementType
 from smarthexboard.smarthexboardlib.map.map import Tile, FlowDirection, MapModel, River
 from smarthexboard.smarthexboardlib.map.path_finding.finder import AStarPathfinder, MoveTypeIgnoreUnitsOptions, \
 	MoveTypeIgnoreUnitsPathfinderDataSource
+from smarthexboard.smarthexboardlib.map.path_finding.hierarchical import PathHierarchy
 from smarthexboard.smarthexboardlib.map.path_finding.path import HexPath
+from smarthexboard.smarthexboardlib.map.perlin_noise.perlinNoise import PerlinNoise
 from smarthexboard.smarthexboardlib.map.types import MapSize, MapType, TerrainType, FeatureType, ResourceType, \
-	UnitMovementType, AppealLevel
+	UnitMovementType, AppealLevel, RouteType
 from smarthexboard.tests.test_utils import MapModelMock
 
 
@@ -174,6 +181,33 @@ class TestHexPoint(unittest.TestCase):
 		self.assertEqual(len(area2._points), 19)  # 1 + 6 + 12
 
 
+class TestHexGeometry(unittest.TestCase):
+	def test_neighbors(self):
+		geometry = HexGeometry.forSize(30, 10)
+
+		self.assertEqual(geometry.neighbors(HexPoint(27, 5)), HexPoint(27, 5).neighbors())
+		self.assertEqual(geometry.neighbors(HexPoint(0, 0)), [HexPoint(1, 0), HexPoint(1, 1), HexPoint(0, 1)])
+		self.assertIs(geometry.neighbors(HexPoint(27, 5))[0], geometry.point(26, 4))
+
+	def test_distance(self):
+		geometry = HexGeometry.forSize(30, 10)
+		hex1 = HexPoint(3, 2)
+		hex2 = HexPoint(17, 5)
+
+		self.assertEqual(geometry.distance(geometry.indexOf(hex1), geometry.indexOf(hex2)), 15)
+		self.assertEqual(geometry.distance(geometry.indexOf(hex2), geometry.indexOf(hex1)), 15)
+
+	def test_ring_and_disk(self):
+		geometry = HexGeometry.forSize(30, 10)
+		center = HexPoint(10, 5)
+
+		for radius in range(4):
+			self.assertEqual(set(geometry.disk(center, radius)), set(HexArea(center, radius).points()))
+			self.assertEqual(len(geometry.ring(center, radius)), max(1, 6 * radius))
+
+		self.assertEqual(len(geometry.disk(HexPoint(0, 0), 1)), 4)
+
+
 class TestHexPath(unittest.TestCase):
 	def test_constructor(self):
 		# GIVEN
@@ -505,11 +539,20 @@ class TestHeightMap(unittest.TestCase):
 		height_map1.values[2][2] = 0.9
 		self.assertEqual(height_map1.findThresholdAbove(0.5), 0.5)
 
+	def test_noiseGrid(self):
+		"""Test that the vectorized noise matches the noise of each coordinate"""
+		noise = PerlinNoise(octaves=8, seed=1234)
+		xs = [float(x) / 12.0 for x in range(12)]
+		ys = [float(y) / 10.0 for y in range(10)]
+
+		grid = noise.noiseGrid(xs, ys)
+
+		for y_index, y in enumerate(ys):
+			for x_index, x in enumerate(xs):
+				self.assertEqual(grid[y_index][x_index], noise.noise([x, y]))
 
-class TestTile(unittest.TestCase):
-	def setUp(self):
-		Tile.resetRiverCache()
 
+class TestTile(unittest.TestCase):
 	def test_constructor(self):
 		"""Test that the tile constructor versions work"""
 		tile = Tile(HexPoint(3, 2), TerrainType.tundra)
@@ -1014,6 +1057,268 @@ class TestMap(unittest.TestCase):
 		self.assertEqual(hills1before, False)
 		self.assertEqual(mapModel.isHillsAt(1, 1), True)
 
+	def test_planes(self):
+		# GIVEN
+		mapModel = MapModelMock(10, 10, TerrainType.grass)
+		tile = mapModel.tileAt(HexPoint(3, 2))
+		index = mapModel.indexFor(HexPoint(3, 2))
+
+		# WHEN
+		tile.setFeature(FeatureType.forest)
+		tile._resourceValue = ResourceType.iron
+		mapModel.modifyTerrainAt(HexPoint(1, 1), TerrainType.ocean)
+		mapModel.updateStatistics()
+
+		# THEN
+		self.assertEqual(mapModel.planes.feature[index], FeatureType.forest)
+		self.assertEqual(mapModel.planes.resource[index], ResourceType.iron)
+		self.assertEqual(mapModel.planes.terrain.count(lambda terrain: terrain == TerrainType.grass), 99)
+		self.assertEqual(mapModel.numberOfLandPlots(), 99)
+		self.assertEqual(mapModel.numberOfTiles(), 100)
+
+	def test_planes_adopt(self):
+		# GIVEN
+		tile = Tile(HexPoint(0, 0), TerrainType.desert)
+		tile.setHills(True)
+		tile.setOwner(Player(LeaderType.alexander))
+		planes = MapModel(2, 2).planes
+
+		# WHEN
+		planes.adopt(tile, 3)
+
+		# THEN
+		self.assertEqual(planes.terrain[3], TerrainType.desert)
+		self.assertEqual(planes.hills[3], True)
+		self.assertEqual(planes.owner[3], tile.owner())
+		self.assertEqual(tile.terrain(), TerrainType.desert)
+
+	def test_visibility_planes(self):
+		# GIVEN
+		mapModel = MapModelMock(10, 10, TerrainType.grass)
+		playerAlexander = Player(LeaderType.alexander)
+		playerTrajan = Player(LeaderType.trajan)
+		tile = mapModel.tileAt(HexPoint(3, 2))
+		index = mapModel.indexFor(HexPoint(3, 2))
+
+		# WHEN
+		tile.sightBy(playerAlexander)
+		tile.sightBy(playerAlexander)
+		tile.concealTo(playerAlexander)
+		tile.concealTo(playerTrajan)
+		mapModel.tileAt(HexPoint(4, 2)).discovered = {hash(playerAlexander): True, hash(playerTrajan): False}
+
+		# THEN
+		self.assertEqual(tile.isVisibleTo(playerAlexander), True)
+		self.assertEqual(tile.isVisibleTo(playerTrajan), False)
+		self.assertEqual(tile.visible, {hash(playerAlexander): True})
+		self.assertEqual(mapModel.numberOfVisibleTilesTo(playerAlexander), 1)
+		self.assertEqual(mapModel.numberOfDiscoveredTilesBy(playerAlexander), 1)
+		self.assertEqual(mapModel.numberOfDiscoveredTilesBy(playerTrajan), 0)
+		visibleToAny = mapModel.visibleToAnyOf([playerAlexander, playerTrajan])
+		self.assertEqual(visibleToAny.count(1), 1)
+		self.assertEqual(visibleToAny[index], 1)
+
+		tile.concealTo(playerAlexander)
+		self.assertEqual(tile.isVisibleTo(playerAlexander), False)
+		self.assertEqual(tile.isVisibleToAny(), False)
+
+	def test_sight_sources_do_not_overflow(self):
+		# GIVEN
+		mapModel = MapModelMock(10, 10, TerrainType.grass)
+		playerAlexander = Player(LeaderType.alexander)
+		tile = mapModel.tileAt(HexPoint(3, 2))
+		for _ in range(255):
+			tile.sightBy(playerAlexander)
+
+		# WHEN / THEN
+		with self.assertRaises(Exception):
+			tile.sightBy(playerAlexander)
+
+		for _ in range(254):
+			tile.concealTo(playerAlexander)
+		self.assertEqual(tile.isVisibleTo(playerAlexander), True)
+		tile.concealTo(playerAlexander)
+		self.assertEqual(tile.isVisibleTo(playerAlexander), False)
+
+	def test_visible_tiles_from(self):
+		# GIVEN
+		random.seed(42)
+		mapModel = MapModelMock(20, 16, TerrainType.grass)
+		for point in mapModel.points():
+			tile = mapModel.tileAt(point)
+			tile.setHills(random.random() < 0.2)
+			tile.setFeature(random.choice([FeatureType.none, FeatureType.none, FeatureType.forest, FeatureType.mountains]))
+
+		def visibleTilesByWalking(location, sight, hasSentry):
+			currentTile = mapModel.tileAt(location)
+			return [tile for tile in mapModel.tilesIn(location.areaWithRadius(sight))
+			        if tile.canSeeTile(currentTile, None, sight, hasSentry, mapModel)]
+
+		for location in [HexPoint(0, 0), HexPoint(7, 6), HexPoint(8, 7), HexPoint(19, 15)]:
+			for sight in range(1, 5):
+				for hasSentry in [False, True]:
+					# WHEN
+					visibleTiles = mapModel.visibleTilesFrom(location, sight, hasSentry)
+
+					# THEN
+					self.assertEqual(visibleTiles, visibleTilesByWalking(location, sight, hasSentry))
+
+		# WHEN
+		visibleBefore = len(mapModel.visibleTilesFrom(HexPoint(8, 7), 4))
+		for point in HexPoint(8, 7).areaWithRadius(1):
+			mapModel.tileAt(point).setFeature(FeatureType.mountains)
+
+		# THEN
+		self.assertLessEqual(len(mapModel.visibleTilesFrom(HexPoint(8, 7), 4)), 7)
+		self.assertGreater(visibleBefore, 7)
+
+	def test_unit_indexes(self):
+		# GIVEN
+		mapModel = MapModelMock(10, 10, TerrainType.grass)
+		playerAlexander = Player(LeaderType.alexander)
+		playerTrajan = Player(LeaderType.trajan)
+		warrior = Unit(HexPoint(1, 1), UnitType.warrior, playerAlexander)
+		settler = Unit(HexPoint(1, 1), UnitType.settler, playerAlexander)
+		archer = Unit(HexPoint(3, 3), UnitType.archer, playerTrajan)
+
+		# WHEN
+		mapModel.addUnit(warrior)
+		mapModel.addUnit(settler)
+		mapModel.addUnit(archer)
+		mapModel.moveUnit(warrior, HexPoint(2, 1))
+		mapModel.removeUnit(archer)
+
+		# THEN
+		mapModel.checkIndexes()
+		self.assertEqual(mapModel.unitsAt(HexPoint(1, 1)), [settler])
+		self.assertEqual(mapModel.unitsAt(HexPoint(2, 1)), [warrior])
+		self.assertEqual(mapModel.unitsAt(HexPoint(3, 3)), [])
+		self.assertEqual(warrior.location, HexPoint(2, 1))
+		self.assertEqual(len(mapModel.unitsOf(playerAlexander)), 2)
+		self.assertEqual(mapModel.unitsOf(playerTrajan), [])
+
+	def test_unit_indexes_inconsistent(self):
+		# GIVEN
+		mapModel = MapModelMock(10, 10, TerrainType.grass)
+		warrior = Unit(HexPoint(1, 1), UnitType.warrior, Player(LeaderType.alexander))
+		mapModel.addUnit(warrior)
+
+		# WHEN
+		warrior.location = HexPoint(2, 2)
+
+		# THEN
+		with self.assertRaises(Exception):
+			mapModel.checkIndexes()
+
+	def test_movement_cost_table(self):
+		# GIVEN
+		mapModel = MapModelMock(10, 10, TerrainType.grass)
+		mapModel.modifyFeatureAt(HexPoint(3, 3), FeatureType.forest)
+		costs = mapModel.movementCosts.costsFor(UnitMovementType.walk)
+		self.assertEqual(costs, mapModel.movementCosts.costsFor(UnitMovementType.walk))
+
+		# WHEN
+		mapModel.modifyFeatureAt(HexPoint(3, 3), FeatureType.none)
+		mapModel.modifyTerrainAt(HexPoint(5, 5), TerrainType.ocean)
+		mapModel.tileAt(HexPoint(6, 6)).setRoute(RouteType.ancientRoad)
+		mapModel.tileAt(HexPoint(2, 3)).setRiver(River('Spree'), FlowDirection.west)
+
+		# THEN
+		geometry = mapModel.geometry
+		costs = mapModel.movementCosts.costsFor(UnitMovementType.walk)
+		for point in mapModel.points():
+			fromIndex = geometry.indexOf(point)
+			fromTile = mapModel.tileAt(point)
+
+			for neighbor in point.neighbors():
+				if not mapModel.valid(neighbor):
+					continue
+
+				toIndex = geometry.indexOf(neighbor)
+				expected = mapModel.tileAt(neighbor).movementCost(UnitMovementType.walk, fromTile)
+				self.assertEqual(mapModel.movementCosts.costFor(UnitMovementType.walk, fromIndex, toIndex), expected)
+
+		fromIndex = geometry.indexOf(HexPoint(5, 4))
+		self.assertIn(UnitMovementType.max.value, costs[fromIndex * 6:fromIndex * 6 + 6])  # (5, 5) is ocean
+
+
+def _sweepDistanceToCoast(plots: Array2D) -> list:
+	"""former implementation of MapGenerator._prepareDistanceToCoast (reference for the regression tests)"""
+	distances = [[sys.maxsize] * plots.width for _ in range(plots.height)]
+
+	action_happened = True
+	while action_happened:
+		action_happened = False
+
+		for x in range(plots.width):
+			for y in range(plots.height):
+				if distances[y][x] == sys.maxsize:
+					if plots.values[y][x] == TerrainType.sea:
+						distances[y][x] = 0
+						action_happened = True
+					else:
+						distance = sys.maxsize
+
+						for neighbor in HexPoint(x, y).neighbors():
+							if 0 <= neighbor.x < plots.width and 0 <= neighbor.y < plots.height:
+								distance = min(distance, distances[neighbor.y][neighbor.x] + 1)
+
+						if distance < sys.maxsize:
+							distances[y][x] = distance
+							action_happened = True
+
+	return distances
+
+
+def _replaceLabels(mapModel, isMember) -> list:
+	"""former identifier replacement of ContinentFinder / OceanFinder (reference for the regression tests)"""
+	notAnalyzed = -2
+	noArea = -1
+	labels = [[notAnalyzed] * mapModel.width for _ in range(mapModel.height)]
+
+	def labelAt(point: HexPoint) -> int:
+		return labels[point.y][point.x] if mapModel.valid(point) else notAnalyzed
+
+	def evaluated(value) -> bool:
+		return value != notAnalyzed and value != noArea
+
+	def replace(oldLabel: int, newLabel: int):
+		for row in labels:
+			for x in range(len(row)):
+				if row[x] == oldLabel:
+					row[x] = newLabel
+
+	for x in range(mapModel.width):
+		for y in range(mapModel.height):
+			point = HexPoint(x, y)
+
+			if not isMember(mapModel.tileAt(point).terrain()):
+				labels[y][x] = noArea
+				continue
+
+			north = labelAt(point.neighbor(HexDirection.north))
+			northWest = labelAt(point.neighbor(HexDirection.northWest))
+			southWest = labelAt(point.neighbor(HexDirection.southWest))
+
+			if evaluated(north):
+				labels[y][x] = north
+			elif evaluated(northWest):
+				labels[y][x] = northWest
+			elif evaluated(southWest):
+				labels[y][x] = southWest
+			else:
+				used = {label for row in labels for label in row}
+				labels[y][x] = next((label for label in range(256) if label not in used), noArea)
+
+			if evaluated(north) and evaluated(northWest) and north != northWest:
+				replace(northWest, north)
+			elif evaluated(northWest) and evaluated(southWest) and northWest != southWest:
+				replace(northWest, southWest)
+			elif evaluated(north) and evaluated(southWest) and north != southWest:
+				replace(north, southWest)
+
+	return labels
+
 
 class TestMapGenerator(unittest.TestCase):
 
@@ -1036,6 +1341,68 @@ class TestMapGenerator(unittest.TestCase):
 		self.assertEqual(grid.height, 22)
 		self.assertEqual(self.last_state_value, 1.0)
 
+	def test_seed(self):
+		"""Test that the MapGenerator generates the same map for the same seed - also with parallel stages"""
+
+		def _mapValues(mapModel):
+			tiles = [(tile.terrain(), tile.feature(), tile.resourceFor(None), tile.isHills(), tile.isRiver())
+					 for tile in [mapModel.tileAt(point) for point in mapModel.points()]]
+			locations = [(location.location, location.leader) for location in mapModel.startLocations]
+			return tiles, locations
+
+		options = MapOptions(mapSize=MapSize.duel, mapType=MapType.continents, leader=LeaderType.trajan, seed=42)
+		mapModel1 = MapGenerator(options).generate(lambda state: None)
+
+		options = MapOptions(mapSize=MapSize.duel, mapType=MapType.continents, leader=LeaderType.trajan, seed=42)
+		with ThreadPoolExecutor(max_workers=2) as executor:
+			mapModel2 = MapGenerator(options, executor=executor).generate(lambda state: None)
+
+		options = MapOptions(mapSize=MapSize.duel, mapType=MapType.continents, leader=LeaderType.trajan, seed=43)
+		mapModel3 = MapGenerator(options).generate(lambda state: None)
+
+		self.assertEqual(_mapValues(mapModel1), _mapValues(mapModel2))
+		self.assertNotEqual(_mapValues(mapModel1), _mapValues(mapModel3))
+
+	def test_distanceToCoast_regression(self):
+		for mapSize in list(MapSize):
+			for seed in range(3):
+				# GIVEN
+				random.seed(seed)
+				options = MapOptions(mapSize=mapSize, mapType=MapType.continents, leader=LeaderType.trajan)
+				generator = MapGenerator(options)
+				heightMap = HeightMap(generator.width, generator.height)
+				generator._fillFromElevation(heightMap, heightMap.findThresholdAbove(0.40))
+
+				# WHEN
+				generator._prepareDistanceToCoast()
+
+				# THEN
+				self.assertEqual(generator.distance_to_coast.values, _sweepDistanceToCoast(generator.plots))
+
+	def test_continentsAndOceans_regression(self):
+		for mapSize in list(MapSize):
+			for seed in range(3):
+				# GIVEN
+				random.seed(seed)
+				heightMap = HeightMap(mapSize.size().width(), mapSize.size().height())
+				threshold = heightMap.findThresholdAbove(0.40)
+				mapModel = MapModel(mapSize.size().width(), mapSize.size().height())
+				for point in mapModel.points():
+					terrain = TerrainType.grass if heightMap.values[point.y][point.x] > threshold else TerrainType.ocean
+					mapModel.modifyTerrainAt(point, terrain)
+
+				# WHEN
+				continentFinder = ContinentFinder(mapModel.width, mapModel.height)
+				continents = continentFinder.executeOn(mapModel)
+				oceanFinder = OceanFinder(mapModel.width, mapModel.height)
+				oceanFinder.executeOn(mapModel)
+
+				# THEN
+				self.assertEqual(continentFinder.continentIdentifiers.values, _replaceLabels(mapModel, lambda terrain: terrain.isLand()))
+				self.assertEqual(oceanFinder.oceanIdentifiers.values, _replaceLabels(mapModel, lambda terrain: terrain.isWater()))
+				self.assertEqual(sum(len(continent.points) for continent in continents), heightMap.values.size - sum(
+					1 for point in mapModel.points() if mapModel.tileAt(point).isWater()))
+
 
 class TestPathfinding(unittest.TestCase):
 	def test_path(self):
@@ -1072,6 +1439,143 @@ class TestPathfinding(unittest.TestCase):
 		for i, n in enumerate(target_path):
 			self.assertEqual(n, path.points()[i])
 
+	def test_indexed_astar(self):
+		# GIVEN
+		grid = MapModel(10, 10)
+		for pt in grid.points():
+			grid.modifyTerrainAt(pt, TerrainType.grass)
+
+		for pt in [HexPoint(3, 1), HexPoint(3, 2), HexPoint(3, 3), HexPoint(3, 4), HexPoint(3, 5)]:
+			grid.modifyTerrainAt(pt, TerrainType.ocean)  # wall that needs to be bypassed
+
+		grid.modifyFeatureAt(HexPoint(4, 6), FeatureType.forest)
+
+		player = Player(leader=LeaderType.trajan, human=True)
+		datasource_options = MoveTypeIgnoreUnitsOptions(ignore_sight=True, can_embark=False, can_enter_ocean=False)
+		datasource = MoveTypeIgnoreUnitsPathfinderDataSource(grid, UnitMovementType.walk, player, datasource_options)
+		finder = AStarPathfinder(datasource)
+
+		# WHEN
+		path = finder.shortestPath(HexPoint(1, 3), HexPoint(5, 3))
+		generic_path = finder.astar(HexPoint(1, 3), HexPoint(5, 3))
+		same_path = finder.shortestPath(HexPoint(1, 3), HexPoint(1, 3))
+		no_path = finder.shortestPath(HexPoint(1, 3), HexPoint(3, 3))
+
+		# THEN
+		self.assertIsNotNone(path)
+		self.assertEqual(path.points()[0], HexPoint(1, 3))
+		self.assertEqual(path.points()[-1], HexPoint(5, 3))
+		self.assertEqual(sum(path.costs()), sum(cost for _, cost in list(generic_path)[1:]))
+		self.assertNotIn(HexPoint(3, 3), path.points())
+		self.assertEqual(same_path.points(), [HexPoint(1, 3)])
+		self.assertIsNone(no_path)
+
+		# each thread searches with its own scratch buffers
+		with ThreadPoolExecutor(max_workers=4) as executor:
+			paths = list(executor.map(lambda _: finder.shortestPath(HexPoint(1, 3), HexPoint(5, 3)), range(40)))
+
+		self.assertTrue(all(threadPath.points() == path.points() for threadPath in paths))
+
+	def test_path_cache(self):
+		# GIVEN
+		mapModel = MapModelMock(10, 10, TerrainType.grass)
+
+		player = Player(leader=LeaderType.trajan, human=True)
+		player.initialize()
+
+		simulation = GameModel(
+			victoryTypes=[VictoryType.domination],
+			handicap=HandicapType.chieftain,
+			turnsElapsed=0,
+			players=[player],
+			map=mapModel
+		)
+
+		playerScout = Unit(HexPoint(5, 5), UnitType.scout, player)
+		simulation.addUnit(playerScout)
+
+		ignoreUnitsFinder = AStarPathfinder(simulation.ignoreUnitsPathfinderDataSource(
+			UnitMovementType.walk, player, canEmbark=False, canEnterOcean=False))
+		unitAwareFinder = AStarPathfinder(simulation.unitAwarePathfinderDataSource(playerScout))
+
+		# WHEN
+		path1 = ignoreUnitsFinder.shortestPath(HexPoint(0, 0), HexPoint(2, 3))
+		path1.addCost(1.0)  # modifying a returned path must not modify the cache
+		path2 = ignoreUnitsFinder.shortestPath(HexPoint(0, 0), HexPoint(2, 3))
+		_ = unitAwareFinder.shortestPath(HexPoint(5, 5), HexPoint(2, 3))
+		_ = unitAwareFinder.shortestPath(HexPoint(5, 5), HexPoint(2, 3))
+
+		# THEN
+		self.assertEqual(path1.points(), path2.points())
+		self.assertEqual(len(path2.costs()), len(path2.points()))
+		self.assertEqual(simulation.pathCacheStatistics()['hits'], 2)
+		self.assertEqual(simulation.pathCacheStatistics()['misses'], 2)
+
+		# WHEN - a unit moves
+		simulation.moveUnit(playerScout, HexPoint(5, 4))
+		_ = ignoreUnitsFinder.shortestPath(HexPoint(0, 0), HexPoint(2, 3))
+		_ = unitAwareFinder.shortestPath(HexPoint(5, 5), HexPoint(2, 3))
+
+		# THEN - only the unit aware path needs to be searched again
+		self.assertEqual(simulation.pathCacheStatistics()['hits'], 3)
+		self.assertEqual(simulation.pathCacheStatistics()['misses'], 3)
+
+		# WHEN - a tile changes its movement cost
+		mapModel.modifyFeatureAt(HexPoint(1, 1), FeatureType.mountains)
+		path3 = ignoreUnitsFinder.shortestPath(HexPoint(0, 0), HexPoint(2, 3))
+
+		# THEN
+		self.assertEqual(simulation.pathCacheStatistics()['misses'], 4)
+		self.assertNotIn(HexPoint(1, 1), path3.points())
+
+	def test_path_cache_of_sight_dependent_paths(self):
+		# GIVEN
+		mapModel = MapModelMock(10, 10, TerrainType.grass)
+
+		player = Player(leader=LeaderType.trajan, human=True)
+		player.initialize()
+
+		simulation = GameModel(
+			victoryTypes=[VictoryType.domination],
+			handicap=HandicapType.chieftain,
+			turnsElapsed=0,
+			players=[player],
+			map=mapModel
+		)
+
+		for pt in mapModel.points():
+			if pt.x < 5:
+				mapModel.tileAt(pt).discoverBy(player, simulation)
+				mapModel.tileAt(pt).sightBy(player)
+
+		datasource = simulation.ignoreUnitsPathfinderDataSource(
+			UnitMovementType.walk, player, canEmbark=False, canEnterOcean=False)
+		datasource.options.ignore_sight = False
+		finder = AStarPathfinder(datasource)
+
+		# WHEN
+		path1 = finder.shortestPath(HexPoint(0, 0), HexPoint(4, 4))
+		path2 = finder.shortestPath(HexPoint(0, 0), HexPoint(4, 4))
+		noPath = finder.shortestPath(HexPoint(0, 0), HexPoint(7, 4))
+
+		# THEN
+		self.assertEqual(path1.points(), path2.points())
+		self.assertIsNone(noPath)
+		self.assertEqual(simulation.pathCacheStatistics()['hits'], 1)
+		self.assertEqual(simulation.pathCacheStatistics()['misses'], 2)
+
+		# WHEN - the player sees more tiles
+		for pt in mapModel.points():
+			if pt.x >= 5:
+				mapModel.tileAt(pt).discoverBy(player, simulation)
+				mapModel.tileAt(pt).sightBy(player)
+
+		path3 = finder.shortestPath(HexPoint(0, 0), HexPoint(7, 4))
+
+		# THEN
+		self.assertIsNotNone(path3)
+		self.assertEqual(simulation.pathCacheStatistics()['misses'], 3)
+
 	def test_turnsToReachTarget(self):
 		# GIVEN
 		mapModel = MapModelMock(10, 10, TerrainType.grass)
@@ -1103,6 +1607,101 @@ class TestPathfinding(unittest.TestCase):
 		self.assertAlmostEqual(turns, 1)
 		self.assertEqual(exist, True)
 
+	def test_reachabilityMap(self):
+		# GIVEN
+		mapModel = MapModelMock(10, 10, TerrainType.grass)
+		mapModel.modifyFeatureAt(HexPoint(1, 2), FeatureType.mountains)
+		mapModel.modifyFeatureAt(HexPoint(4, 4), FeatureType.forest)
+		mapModel.modifyFeatureAt(HexPoint(5, 3), FeatureType.rainforest)
+		mapModel.modifyTerrainAt(HexPoint(6, 6), TerrainType.ocean)
+
+		player = Player(leader=LeaderType.trajan, human=True)
+		player.initialize()
+
+		simulation = GameModel(
+			victoryTypes=[VictoryType.domination],
+			handicap=HandicapType.chieftain,
+			turnsElapsed=0,
+			players=[player],
+			map=mapModel
+		)
+
+		playerWarrior = Unit(HexPoint(5, 5), UnitType.warrior, player)
+		simulation.addUnit(playerWarrior)
+
+		finder = AStarPathfinder(simulation.unitAwarePathfinderDataSource(playerWarrior))
+
+		# WHEN
+		reachabilityMap = playerWarrior.reachabilityMap(3, simulation)
+
+		# THEN
+		for point in mapModel.points():
+			turns = playerWarrior.turnsToReach(point, simulation)
+
+			if turns <= 3:
+				self.assertEqual(reachabilityMap.turnsTo(point), turns)
+				self.assertEqual(reachabilityMap.pathTo(point).cost(), finder.shortestPath(HexPoint(5, 5), point).cost())
+			else:
+				self.assertFalse(reachabilityMap.canReach(point))
+
+		self.assertFalse(reachabilityMap.canReach(HexPoint(6, 6)))
+		self.assertEqual(reachabilityMap.pathTo(HexPoint(5, 5)).points(), [HexPoint(5, 5)])
+		self.assertEqual(reachabilityMap.pathTo(HexPoint(5, 3)).points()[0], HexPoint(5, 5))
+		self.assertEqual(reachabilityMap.pathTo(HexPoint(5, 3)).points()[-1], HexPoint(5, 3))
+
+	def test_hierarchical_pathfinding(self):
+		# GIVEN
+		mapModel = MapModelMock(40, 30, TerrainType.grass)
+		for y in range(0, 26):
+			mapModel.modifyTerrainAt(HexPoint(20, y), TerrainType.ocean)  # wall with a gap in the south
+
+		player = Player(leader=LeaderType.trajan, human=True)
+		datasource_options = MoveTypeIgnoreUnitsOptions(ignore_sight=True, can_embark=False, can_enter_ocean=False)
+		datasource = MoveTypeIgnoreUnitsPathfinderDataSource(mapModel, UnitMovementType.walk, player, datasource_options)
+		finder = AStarPathfinder(datasource)
+
+		hierarchical_datasource = MoveTypeIgnoreUnitsPathfinderDataSource(mapModel, UnitMovementType.walk, player, datasource_options)
+		hierarchical_datasource.hierarchy = PathHierarchy(mapModel, clusterSize=5)
+		hierarchical_finder = AStarPathfinder(hierarchical_datasource)
+
+		# WHEN
+		path = finder.shortestPath(HexPoint(2, 2), HexPoint(37, 2))
+		hierarchical_path = hierarchical_finder.shortestPath(HexPoint(2, 2), HexPoint(37, 2))
+
+		# THEN
+		self.assertEqual(hierarchical_path.points()[0], HexPoint(2, 2))
+		self.assertEqual(hierarchical_path.points()[-1], HexPoint(37, 2))
+		for fromPoint, toPoint in zip(hierarchical_path.points(), hierarchical_path.points()[1:]):
+			self.assertEqual(fromPoint.distance(toPoint), 1)
+			self.assertTrue(mapModel.tileAt(toPoint).isLand())
+
+		self.assertGreaterEqual(hierarchical_path.cost(), path.cost())
+		self.assertLess(hierarchical_finder.expansions, finder.expansions)
+
+		# WHEN
+		for y in range(26, 30):
+			mapModel.modifyTerrainAt(HexPoint(20, y), TerrainType.ocean)
+		mapModel.modifyTerrainAt(HexPoint(20, 10), TerrainType.grass)  # move the gap to the center
+		hierarchical_path = hierarchical_finder.shortestPath(HexPoint(2, 2), HexPoint(37, 2))
+
+		# THEN
+		self.assertIn(HexPoint(20, 10), hierarchical_path.points())
+		self.assertEqual(hierarchical_path.points()[-1], HexPoint(37, 2))
+
+		# games only use the hierarchy on the map sizes that opted in
+		for mapSizes, mapSize, usesHierarchy in [([], MapSize.standard, False), ([MapSize.standard], MapSize.duel, False),
+												 ([MapSize.standard], MapSize.standard, True)]:
+			with patch.object(GameModel, 'hierarchicalPathfindingMapSizes', mapSizes):
+				simulation = GameModel(
+					victoryTypes=[VictoryType.domination],
+					handicap=HandicapType.chieftain,
+					turnsElapsed=0,
+					players=[player],
+					map=MapModelMock(mapSize, TerrainType.grass)
+				)
+				datasource = simulation.ignoreUnitsPathfinderDataSource(UnitMovementType.walk, player, False, False)
+				self.assertEqual(datasource.hierarchy is not None, usesHierarchy)
+
 	def test_unitMovement(self):
 		# GIVEN
 		mapModel = MapModelMock(10, 10, TerrainType.shore)
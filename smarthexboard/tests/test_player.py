@@ -7,6 +7,7 @@ from django.utils.translation.trans_real import get_language, translation
 from django.utils.translation import gettext as _
 
 from smarthexboard.smarthexboardlib.game.baseTypes import HandicapType
+from smarthexboard.smarthexboardlib.game.cityStates import CityStateType
 from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
 from smarthexboard.smarthexboardlib.game.game import GameModel
 from smarthexboard.smarthexboardlib.game.generation import UserInterfaceImpl
@@ -16,7 +17,9 @@ from smarthexboard.smarthexboardlib.game.types import TechType
 from smarthexboard.smarthexboardlib.game.unitTypes import UnitType
 from smarthexboard.smarthexboardlib.game.units import Unit
 from smarthexboard.smarthexboardlib.game.wonders import WonderType
+from smarthexboard.smarthexboardlib.map.areas import Continent
 from smarthexboard.smarthexboardlib.map.base import HexPoint
+from smarthexboard.smarthexboardlib.serialisation.binary import GameModelCodec
 from smarthexboard.tests.test_utils import MapModelMock
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
@@ -182,3 +185,39 @@ class TestPlayer(unittest.TestCase):
 		# THEN
 		self.assertEqual(_('TXT_KEY_CITY_NAME_AIGAI'), firstCityName)
 		self.assertEqual(_('TXT_KEY_CITY_NAME_ALEXANDRIA'), secondCityName)
+
+	def test_binary_round_trip(self):
+		# GIVEN
+		# the continent references the map, which has dicts keyed by the (partially restored) player
+		self.playerTrajan.markSettledOnContinent(Continent(1, 'Continent 1', self.mapModel))
+		self.playerAlexander.doFirstContactWith(self.playerTrajan, self.simulation)
+		codec = GameModelCodec()
+
+		# WHEN
+		simulation = codec.loads(codec.dumps(self.simulation))
+
+		# THEN
+		playerAlexander = simulation.playerFor(LeaderType.alexander)
+		self.assertEqual(hash(playerAlexander), hash(self.playerAlexander))
+		self.assertEqual(len(simulation.unitsOf(simulation.playerFor(LeaderType.trajan))), 1)
+
+	def test_player_lookups(self):
+		# GIVEN
+		playerCityState = Player(LeaderType.cityState, human=False)
+		playerCityState.initialize()
+		self.simulation.players.append(playerCityState)
+		hashBefore = hash(playerCityState)
+
+		# WHEN
+		playerCityState.cityState = CityStateType.auckland
+
+		# THEN
+		self.assertNotEqual(hashBefore, hash(playerCityState))
+		self.assertEqual(self.playerAlexander, self.simulation.playerFor(LeaderType.alexander))
+		self.assertIsNone(self.simulation.playerFor(LeaderType.victoria))
+		self.assertEqual(playerCityState, self.simulation.cityStatePlayerFor(CityStateType.auckland))
+		self.assertEqual(playerCityState, self.simulation.playerForHash(str(hash(playerCityState))))
+		self.assertIsNone(self.simulation.playerForHash(hashBefore))
+		self.assertEqual(1, self.simulation.slotOf(self.playerAlexander))
+		self.assertEqual(3, self.simulation.slotOf(playerCityState))
+		self.assertEqual(self.playerTrajan, self.simulation.playerForSlot(2))
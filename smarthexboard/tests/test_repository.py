@@ -8,6 +8,7 @@ from django.test import TestCase
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
 django.setup()
 
+from smarthexboard.models import GameData, GameDataDelta
 from smarthexboard.repositories import GameDataRepository
 from smarthexboard.smarthexboardlib.game.baseTypes import HandicapType
 from smarthexboard.smarthexboardlib.game.cityStates import CityStateType
@@ -16,11 +17,15 @@ from smarthexboard.smarthexboardlib.game.game import GameModel
 from smarthexboard.smarthexboardlib.game.generation import UserInterfaceImpl
 from smarthexboard.smarthexboardlib.game.players import Player
 from smarthexboard.smarthexboardlib.game.states.victories import VictoryType
+from smarthexboard.smarthexboardlib.map.base import HexPoint
+from smarthexboard.smarthexboardlib.map.types import TerrainType, FeatureType
+from smarthexboard.smarthexboardlib.serialisation.game import GameModelSchema
 from smarthexboard.tests.test_utils import MapModelMock
 
 
 class TestRepository(TestCase):
 	def setUp(self) -> None:
+		GameDataRepository.hotStore.clear()
 		self.mapModel = MapModelMock.duelMap()
 
 		# players
@@ -47,6 +52,10 @@ class TestRepository(TestCase):
 		# add UI
 		self.simulation.userInterface = UserInterfaceImpl()
 
+	def tearDown(self):
+		# the games of the test database are gone after the test
+		GameDataRepository.hotStore.clear()
+
 	@pytest.mark.django_db
 	def test_not_in_cache_and_db(self):
 		game_id = f'{random.randint(1, 10000)}'
@@ -67,3 +76,163 @@ class TestRepository(TestCase):
 
 		in_cache = GameDataRepository._inCache(game_id)
 		self.assertTrue(in_cache, "Game model should be in cache after storing")
+
+	@pytest.mark.django_db
+	def test_store_deltas(self):
+		# GIVEN
+		game_id = GameDataRepository._storeToDatabase(None, self.simulation)
+		snapshotSize = len(GameData.objects.get(id=game_id).snapshot)
+
+		# WHEN
+		self.simulation.tileAt(HexPoint(3, 4)).setTerrain(TerrainType.desert)
+		self.simulation.tileAt(HexPoint(5, 5)).setFeature(FeatureType.forest)
+		self.simulation.currentTurn = 5
+		GameDataRepository._storeToDatabase(game_id, self.simulation)
+		GameDataRepository._storeToDatabase(game_id, self.simulation)  # nothing changed
+
+		# THEN
+		deltas = GameDataDelta.objects.filter(game_id=game_id)
+		self.assertEqual(deltas.count(), 1)
+		self.assertLess(len(deltas[0].content), snapshotSize)
+
+		obj = GameDataRepository._fetchFromDatabase(game_id)
+		self.assertEqual(obj.currentTurn, 5)
+		self.assertEqual(obj.tileAt(HexPoint(3, 4)).terrain(), TerrainType.desert)
+		self.assertEqual(obj.tileAt(HexPoint(5, 5)).feature(), FeatureType.forest)
+		self.assertEqual(GameModelSchema().dumps(obj), GameModelSchema().dumps(self.simulation))
+
+	@pytest.mark.django_db
+	def test_store_compacts_deltas(self):
+		# GIVEN
+		game_id = GameDataRepository._storeToDatabase(None, self.simulation)
+
+		# WHEN
+		for turn in range(GameDataRepository.compaction_interval + 1):
+			self.simulation.currentTurn = turn + 1
+			GameDataRepository._storeToDatabase(game_id, self.simulation)
+
+		# THEN
+		self.assertEqual(GameData.objects.get(id=game_id).sequence, 0)
+		self.assertEqual(GameDataDelta.objects.filter(game_id=game_id).count(), 0)
+		self.assertEqual(GameDataRepository._fetchFromDatabase(game_id).currentTurn, GameDataRepository.compaction_interval + 1)
+
+	@pytest.mark.django_db
+	def test_fetch_reuses_hot_game(self):
+		# GIVEN
+		game_id = GameDataRepository.store(None, self.simulation)
+		hits = GameDataRepository.metrics()['hits']
+
+		# WHEN
+		obj = GameDataRepository.fetch(game_id)
+
+		# THEN
+		self.assertIs(obj, self.simulation)
+		self.assertEqual(GameDataRepository.metrics()['hits'], hits + 1)
+		self.assertGreater(GameDataRepository.metrics()['resident_bytes'], 0)
+
+	def test_lock_is_released_when_unused(self):
+		# GIVEN
+		store = GameDataRepository.hotStore
+
+		# WHEN
+		with GameDataRepository.lock('42'):
+			with GameDataRepository.lock('42'):
+				lockedGames = list(store._locks.keys())
+
+		# THEN
+		self.assertEqual(lockedGames, [42])
+		self.assertEqual(store._locks, {})
+		self.assertEqual(store._lockUsers, {})
+
+	@pytest.mark.django_db
+	def test_fetch_removes_game_changed_by_another_process(self):
+		# GIVEN
+		game_id = GameDataRepository.store(None, self.simulation)
+		changedGame = GameDataRepository._fetchFromDatabase(game_id)
+		changedGame.currentTurn = 5
+		GameDataRepository._storeToDatabase(game_id, changedGame)  # written by another process
+
+		# WHEN
+		obj = GameDataRepository.fetch(game_id)
+
+		# THEN
+		self.assertIsNot(obj, self.simulation)
+		self.assertEqual(obj.currentTurn, 5)
+
+	@pytest.mark.django_db
+	def test_fetch_of_hot_game_does_not_query_database(self):
+		# GIVEN
+		game_id = GameDataRepository.store(None, self.simulation)
+
+		# WHEN
+		with self.assertNumQueries(0):
+			obj = GameDataRepository.fetch(game_id)
+
+		# THEN
+		self.assertIs(obj, self.simulation)
+
+	@pytest.mark.django_db
+	def test_release_writes_game(self):
+		# GIVEN
+		game_id = GameDataRepository.store(None, self.simulation)
+		self.simulation.currentTurn = 4
+		# not part of the json document of the game
+		greatPerson = self.simulation.greatPersons.current[0]
+		self.simulation.greatPersons.spawned.append(greatPerson)
+		GameDataRepository.store(game_id, self.simulation)
+
+		# WHEN
+		GameDataRepository.release(game_id)
+		sequenceAfterRelease = GameData.objects.get(id=game_id).sequence
+		obj = GameDataRepository.fetch(game_id)
+		obj.currentTurn = 5
+		GameDataRepository._storeToDatabase(game_id, obj)
+
+		# THEN
+		self.assertEqual(sequenceAfterRelease, 1)
+		self.assertIsNot(obj, self.simulation)
+		self.assertEqual(obj.greatPersons.spawned, [greatPerson])
+		self.assertEqual(GameData.objects.get(id=game_id).sequence, 2)
+		loaded = GameDataRepository._fetchFromDatabase(game_id)
+		self.assertEqual(loaded.currentTurn, 5)
+		self.assertEqual(loaded.greatPersons.spawned, [greatPerson])
+
+	@pytest.mark.django_db
+	def test_store_writes_behind(self):
+		# GIVEN
+		game_id = GameDataRepository.store(None, self.simulation)
+		GameDataRepository.write_behind_interval = 3600.0
+
+		# WHEN
+		try:
+			self.simulation.currentTurn = 7
+			GameDataRepository.store(game_id, self.simulation)
+			storedTurn = GameDataRepository._fetchFromDatabase(game_id).currentTurn
+			GameDataRepository.flush(game_id)
+		finally:
+			GameDataRepository.write_behind_interval = 5.0
+
+		# THEN
+		self.assertEqual(storedTurn, 0)
+		self.assertEqual(GameDataRepository._fetchFromDatabase(game_id).currentTurn, 7)
+
+	@pytest.mark.django_db
+	def test_evicts_least_recently_used(self):
+		# GIVEN
+		store = GameDataRepository.hotStore
+		store.max_games = 1
+		first_id = GameDataRepository.store(None, self.simulation)
+		self.simulation.currentTurn = 3
+		store.put(int(first_id), self.simulation, dirty=True)
+
+		# WHEN
+		try:
+			second_id = GameDataRepository.store(None, GameDataRepository._fetchFromDatabase(first_id))
+		finally:
+			store.max_games = 16
+
+		# THEN
+		self.assertFalse(GameDataRepository._inCache(first_id))
+		self.assertTrue(GameDataRepository._inCache(second_id))
+		self.assertEqual(GameDataRepository.metrics()['evictions'], 1)
+		self.assertEqual(GameDataRepository._fetchFromDatabase(first_id).currentTurn, 3)  # written on eviction
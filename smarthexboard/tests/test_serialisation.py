@@ -6,11 +6,13 @@ from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
 from smarthexboard.smarthexboardlib.game.generation import GameGenerator, UserInterfaceImpl
 from smarthexboard.smarthexboardlib.game.governments import GovernmentType
 from smarthexboard.smarthexboardlib.game.states.victories import VictoryType
-from smarthexboard.smarthexboardlib.map.base import HexPoint
+from smarthexboard.smarthexboardlib.map.base import HexPoint, HexDirection
 from smarthexboard.smarthexboardlib.map.evaluators import MapAnalyzer
 from smarthexboard.smarthexboardlib.map.generation import MapOptions, MapGenerator
 from smarthexboard.smarthexboardlib.map.map import Tile, MapModel
 from smarthexboard.smarthexboardlib.map.types import TerrainType, MapSize, FeatureType, MapType
+from smarthexboard.smarthexboardlib.serialisation.binary import GameModelCodec, BinaryCompression, BinaryCodecError, \
+	SaveState
 from smarthexboard.smarthexboardlib.serialisation.game import GameModelSchema
 from smarthexboard.smarthexboardlib.serialisation.map import TileSchema, MapModelSchema
 from smarthexboard.tests.test_utils import MapModelMock
@@ -133,3 +135,146 @@ class TestSerialisation(unittest.TestCase):
 		# self.assertEqual(json_str, json_str2)
 
 		obj.update()
+
+	def test_binary_game_round_trip(self):
+		# GIVEN
+		options = MapOptions(MapSize.duel, MapType.continents, LeaderType.qin)
+		mapModel = MapGenerator(options).generate(lambda state: None)
+		gameModel = GameGenerator().generate(mapModel, HandicapType.king)
+
+		humanPlayer = gameModel.humanPlayer()
+		for point in [HexPoint(3, 4), HexPoint(4, 4), HexPoint(5, 4)]:
+			mapModel.tileAt(point).discoverBy(humanPlayer, gameModel)
+			mapModel.tileAt(point).sightBy(humanPlayer)
+		mapModel.tileAt(HexPoint(5, 4)).concealTo(humanPlayer)
+		mapModel.tileAt(HexPoint(3, 4)).sightBy(humanPlayer)
+
+		codec = GameModelCodec(BinaryCompression.zlib)
+
+		# WHEN
+		content = codec.dumps(gameModel)
+		obj = codec.loads(content)
+
+		# THEN
+		# lossless: the loaded game is encoded to the same records
+		self.assertIsNone(codec.dumpsDelta(obj, obj.saveState))
+		json_str = GameModelSchema().dumps(gameModel)
+		self.assertLess(len(content), len(json_str) // 5)
+		self.assertDictEqual(GameModelSchema().dump(obj), GameModelSchema().dump(gameModel))
+		self.assertTrue(obj.tileAt(HexPoint(3, 4)).isVisibleTo(obj.humanPlayer()))
+		# the units of the player may see the tile as well
+		self.assertEqual(
+			obj.tileAt(HexPoint(5, 4)).isVisibleTo(obj.humanPlayer()),
+			gameModel.tileAt(HexPoint(5, 4)).isVisibleTo(humanPlayer)
+		)
+		self.assertTrue(obj.tileAt(HexPoint(5, 4)).isDiscoveredBy(obj.humanPlayer()))
+
+		# two sight sources
+		obj.tileAt(HexPoint(3, 4)).concealTo(obj.humanPlayer())
+		self.assertTrue(obj.tileAt(HexPoint(3, 4)).isVisibleTo(obj.humanPlayer()))
+
+		with self.assertRaises(BinaryCodecError):
+			codec.loads(json_str.encode('utf-8'))
+
+	def test_binary_map_round_trip(self):
+		# GIVEN
+		options = MapOptions(MapSize.duel, MapType.continents, LeaderType.qin)
+		mapModel = MapGenerator(options).generate(lambda state: None)
+		codec = GameModelCodec(BinaryCompression.zlib)
+
+		# WHEN
+		content = codec.dumpsMap(mapModel)
+		obj = codec.loadsMap(content)
+
+		# THEN
+		self.assertDictEqual(MapModelSchema().dump(obj), MapModelSchema().dump(mapModel))
+		with self.assertRaises(BinaryCodecError):
+			codec.loadsMap(codec.dumps(GameGenerator().generate(mapModel, HandicapType.king)))
+
+	def test_binary_delta_of_changes(self):
+		# GIVEN
+		options = MapOptions(MapSize.duel, MapType.continents, LeaderType.qin)
+		mapModel = MapGenerator(options).generate(lambda state: None)
+		gameModel = GameGenerator().generate(mapModel, HandicapType.king)
+
+		codec = GameModelCodec(BinaryCompression.zlib)
+		state = SaveState()
+		content = codec.dumps(gameModel, state)
+		unchangedDelta = codec.dumpsDelta(gameModel, state)
+
+		# WHEN
+		unit = mapModel.unitsOf(gameModel.humanPlayer())[0]
+		mapModel.moveUnit(unit, unit.location.neighbor(HexDirection.north))
+		tile = mapModel.tileAt(HexPoint(3, 4))
+		feature = FeatureType.marsh if tile.feature() == FeatureType.forest else FeatureType.forest
+		tile.setFeature(feature)
+		tile.sightBy(gameModel.humanPlayer())
+		tile.sightBy(gameModel.humanPlayer())
+		delta = codec.dumpsDelta(gameModel, state)
+
+		# THEN
+		self.assertIsNone(unchangedDelta)
+		self.assertIsNotNone(delta)
+		self.assertEqual(state.sequence, 1)
+		self.assertLess(len(delta), len(content) // 2)
+		self.assertIsNone(codec.dumpsDelta(gameModel, state))
+
+		savedGame = codec.open(content)
+		savedGame.applyDelta(delta)
+		self.assertEqual(savedGame.sequence, 1)
+		obj = savedGame.gameModel()
+		# the loaded game continues the deltas
+		self.assertIsNone(codec.dumpsDelta(obj, obj.saveState))
+		self.assertDictEqual(GameModelSchema().dump(obj), GameModelSchema().dump(gameModel))
+		self.assertEqual(obj.unitsOf(obj.humanPlayer())[0].location, unit.location)
+		loadedTile = obj.tileAt(HexPoint(3, 4))
+		self.assertEqual(loadedTile.feature(), feature)
+		loadedTile.concealTo(obj.humanPlayer())
+		self.assertTrue(loadedTile.isVisibleTo(obj.humanPlayer()))
+
+	def test_binary_round_trip_keeps_sight_of_moved_unit(self):
+		# GIVEN
+		options = MapOptions(MapSize.duel, MapType.continents, LeaderType.qin)
+		mapModel = MapGenerator(options).generate(lambda state: None)
+		gameModel = GameGenerator().generate(mapModel, HandicapType.king)
+		gameModel.userInterface = UserInterfaceImpl()
+
+		codec = GameModelCodec(BinaryCompression.zlib)
+		obj = codec.loads(codec.dumps(gameModel))
+		obj.userInterface = UserInterfaceImpl()
+
+		# WHEN
+		for game in [gameModel, obj]:
+			unit = game.unitsOf(game.humanPlayer())[0]
+			unit.setLocation(unit.location.neighbor(HexDirection.north), simulation=game)
+
+		# THEN
+		# the loaded unit conceals the tiles it saw before the move
+		self.assertIsNotNone(obj.unitsOf(obj.humanPlayer())[0].sightedPoints())
+		self.assertEqual(
+			obj._map.planes.visibilityPlane(hash(obj.humanPlayer())),
+			mapModel.planes.visibilityPlane(hash(gameModel.humanPlayer()))
+		)
+
+	def test_json_round_trip_rebuilds_sight(self):
+		# GIVEN
+		options = MapOptions(MapSize.duel, MapType.continents, LeaderType.qin)
+		mapModel = MapGenerator(options).generate(lambda state: None)
+		gameModel = GameGenerator().generate(mapModel, HandicapType.king)
+		gameModel.userInterface = UserInterfaceImpl()
+
+		# the json document only has whether the tiles are visible
+		obj = GameModelSchema().loads(GameModelSchema().dumps(gameModel))
+		obj.userInterface = UserInterfaceImpl()
+
+		# WHEN
+		obj.rebuildSight()
+		for game in [gameModel, obj]:
+			unit = game.unitsOf(game.humanPlayer())[0]
+			unit.setLocation(unit.location.neighbor(HexDirection.north), simulation=game)
+
+		# THEN
+		self.assertEqual(
+			obj._map.planes.visibilityPlane(hash(obj.humanPlayer())),
+			mapModel.planes.visibilityPlane(hash(gameModel.humanPlayer()))
+		)
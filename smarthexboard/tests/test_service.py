@@ -6,15 +6,17 @@ from urllib.parse import urlencode
 
 import django
 import pytest
+from django.core.cache import cache
 from django.test import Client, TestCase
 from parameterized import parameterized
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
 django.setup()
 
-from smarthexboard.models import GameGenerationData, GameGenerationState
-from smarthexboard.repositories import GameDataRepository
-from smarthexboard.services import generate_game
+from setup.settings import MAP_POOL_SIZE
+from smarthexboard.models import GameData, GameGenerationState
+from smarthexboard.repositories import GameDataRepository, GameGenerationRepository, MapPoolRepository
+from smarthexboard.services import generate_game, update_game, fill_map_pool
 from smarthexboard.smarthexboardlib.game.baseTypes import HandicapType
 from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
 from smarthexboard.smarthexboardlib.game.game import GameModel
@@ -28,6 +30,9 @@ from smarthexboard.tests.test_utils import MapModelMock
 
 
 class TestGenerationRequest(TestCase):
+	def tearDown(self):
+		# the games of the test database are gone after the test
+		GameDataRepository.hotStore.clear()
 
 	@pytest.mark.django_db
 	def test_completely_invalid_generate_game_request(self):
@@ -134,9 +139,9 @@ class TestGenerationRequest(TestCase):
 		sleep(1)
 
 		# check that there is an entry in the database
-		game_generation = GameGenerationData.objects.filter(pk=game_id).first()
-		if game_generation is None:
-			self.fail(f'GameGenerationData not found in db for game_id: {game_id}')
+		game_data = GameData.objects.filter(pk=game_id).first()
+		if game_data is None:
+			self.fail(f'GameData not found in db for game_id: {game_id}')
 
 		# 2 - check status
 		testing_count = 0
@@ -178,6 +183,11 @@ class TestGenerationRequest(TestCase):
 		while not human_active and iteration < 20:
 			ts = time()
 			response = client.get(f'/smarthexboard/{game_id}/update?timestamp={int(ts * 1000)}')
+			if response.status_code == 202:
+				# fake the async update - not working with the test currently
+				update_game(game_id)
+				response = client.get(f'/smarthexboard/{game_id}/update?timestamp={int(ts * 1000)}')
+
 			self.assertEqual(response.status_code, 200)
 			json_object = json.loads(response.content)
 			game_id_status = json_object['game_id']
@@ -203,9 +213,41 @@ class TestGenerationRequest(TestCase):
 		self.assertLess(humanTiles, MapSize.tiny.numberOfTiles())
 		self.assertGreater(humanTiles, 0)
 
+	@pytest.mark.django_db
+	def test_game_generation_uses_map_pool(self):
+		"""Test that the game generation takes a pre-generated map of the pool"""
+		fill_map_pool(MapSize.duel, MapType.continents)
+		self.assertEqual(MapPoolRepository.count(MapSize.duel, MapType.continents), MAP_POOL_SIZE)
+		self.assertFalse(MapPoolRepository.startRefill(MapSize.duel, MapType.continents))  # full
+
+		game_id = '123457'
+		generate_game(game_id, LeaderType.trajan, HandicapType.settler, MapSize.duel, MapType.continents)
+
+		self.assertEqual(MapPoolRepository.count(MapSize.duel, MapType.continents), MAP_POOL_SIZE - 1)
+		self.assertEqual(GameGenerationRepository.fetchStatus(game_id)['state'], GameGenerationState.READY)
+
+		game = GameDataRepository.fetch(game_id)
+		self.assertEqual(game.humanPlayer().leader, LeaderType.trajan)
+		self.assertEqual(len([player for player in game.players if player.leader == LeaderType.trajan]), 1)
+
+
+	def test_map_pool_refill_is_started_once(self):
+		"""Test that only one refill of the map pool is started at a time"""
+		MapPoolRepository.finishRefill(MapSize.duel, MapType.earth)
+
+		self.assertTrue(MapPoolRepository.startRefill(MapSize.duel, MapType.earth))
+		self.assertFalse(MapPoolRepository.startRefill(MapSize.duel, MapType.earth))
+
+		MapPoolRepository.finishRefill(MapSize.duel, MapType.earth)
+		self.assertTrue(MapPoolRepository.startRefill(MapSize.duel, MapType.earth))
+		MapPoolRepository.finishRefill(MapSize.duel, MapType.earth)
+
 
 class TestGamePlayRequest(unittest.TestCase):
 	def setUp(self):
+		# the cached pages outlive the test database that hands out the same game ids again
+		cache.clear()
+
 		# prepare game
 		grid = MapModelMock(10, 10, TerrainType.grass)
 		grid.modifyFeatureAt(HexPoint(1, 2), FeatureType.mountains)  # put a mountain into the path
@@ -231,6 +273,9 @@ class TestGamePlayRequest(unittest.TestCase):
 
 		self.game_id = GameDataRepository.store(None, self.simulation)
 
+	def tearDown(self):
+		GameDataRepository.hotStore.unload()
+
 	@pytest.mark.django_db
 	def test_unit_move_request_no_game(self):
 		"""Test that the unit move"""
@@ -389,5 +434,123 @@ class TestGamePlayRequest(unittest.TestCase):
 		self.assertEqual(game_id, str(self.game_id))
 
 
+	@pytest.mark.django_db
+	def test_map_chunks_request(self):
+		"""Test that the chunks of the map are listed with etags"""
+		client = Client()
+		response = client.get(f'/smarthexboard/{self.game_id}/map/chunks')
+
+		json_object = json.loads(response.content)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(json_object['width'], 10)
+		self.assertEqual(len(json_object['chunks']), 1)
+
+	@pytest.mark.django_db
+	def test_map_chunk_request_not_modified(self):
+		"""Test that a chunk is only sent if its etag changed"""
+		client = Client()
+		response = client.get(f'/smarthexboard/{self.game_id}/map/chunk/0/0')
+
+		json_object = json.loads(response.content)
+		etag = response['ETag']
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(len(json_object['tiles']), 100)
+
+		response = client.get(f'/smarthexboard/{self.game_id}/map/chunk/0/0', headers={'If-None-Match': etag})
+		self.assertEqual(response.status_code, 304)
+
+		response = client.get(f'/smarthexboard/{self.game_id}/map/chunk/1/0')
+		self.assertEqual(response.status_code, 404)
+
+	@pytest.mark.django_db
+	def test_map_diff_request(self):
+		"""Test that the map diff contains the points of moved units"""
+		self.simulation._map.discover(self.simulation.humanPlayer(), self.simulation)
+		self.simulation.moveUnit(self.warrior, HexPoint(2, 3))
+
+		client = Client()
+		response = client.get(f'/smarthexboard/{self.game_id}/map/diff/0')
+
+		json_object = json.loads(response.content)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertFalse(json_object['full'])
+		self.assertIn([2, 2], json_object['points'])
+		self.assertIn([2, 3], json_object['points'])
+		# the units added in the first turn are part of the changes as well
+		self.assertEqual(sorted((unit['x'], unit['y']) for unit in json_object['units']), [(1, 1), (2, 3)])
+
+	@pytest.mark.django_db
+	def test_map_diff_request_of_loaded_game(self):
+		"""Test that the changes of the current turn are not known after the game is loaded from the database"""
+		self.simulation.moveUnit(self.warrior, HexPoint(2, 3))
+		turn = self.simulation.currentTurn
+
+		GameDataRepository.flush(self.game_id)
+		GameDataRepository.release(self.game_id, flush=False)
+
+		client = Client()
+		response = client.get(f'/smarthexboard/{self.game_id}/map/diff/{turn}')
+
+		self.assertEqual(response.status_code, 200)
+		self.assertTrue(json.loads(response.content)['full'])
+
+		response = client.get(f'/smarthexboard/{self.game_id}/map/diff/{turn + 1}')
+
+		self.assertEqual(response.status_code, 200)
+		self.assertFalse(json.loads(response.content)['full'])
+
+	@pytest.mark.django_db
+	def test_update_request_runs_in_background(self):
+		"""Test that the ai turns are processed once by a background task"""
+		# the ai needs a map of a regular size
+		grid = MapModelMock(MapSize.duel, TerrainType.grass)
+		simulation = GameModel(
+			victoryTypes=[VictoryType.science],
+			handicap=HandicapType.settler,
+			turnsElapsed=0,
+			players=[Player(LeaderType.barbar, human=False), self.player, self.simulation.humanPlayer()],
+			map=grid
+		)
+		simulation.addUnit(Unit(location=HexPoint(1, 1), unitType=UnitType.scout, player=self.player))
+		simulation.addUnit(Unit(location=HexPoint(2, 2), unitType=UnitType.warrior, player=simulation.humanPlayer()))
+		self.game_id = GameDataRepository.store(None, simulation)
+
+		client = Client()
+		response = client.get(f'/smarthexboard/{self.game_id}/update')
+		self.assertEqual(response.status_code, 202)
+		self.assertEqual(json.loads(response.content)['status'], 'Running')
+
+		# a second request does not start another processing
+		response = client.get(f'/smarthexboard/{self.game_id}/update')
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(json.loads(response.content)['status'], 'Running')
+
+		# the game is not changed (or kept) by the web process meanwhile
+		self.assertFalse(GameDataRepository._inCache(self.game_id))
+		data = {'game_id': self.game_id, 'unit_type': 'combat', 'old_location': '2,2', 'new_location': '2,3'}
+		response = client.post(f'/smarthexboard/move_unit', data)
+		self.assertEqual(response.status_code, 400)
+		self.assertEqual(json.loads(response.content)['errors'], [f'Game with id {self.game_id} currently updating.'])
+
+		response = client.get(f'/smarthexboard/{self.game_id}/update/status')
+		self.assertEqual(json.loads(response.content)['status'], 'Running')
+
+		# fake the async update
+		update_game(self.game_id)
+
+		response = client.get(f'/smarthexboard/{self.game_id}/update/status')
+		json_object = json.loads(response.content)
+		self.assertEqual(json_object['status'], 'Ready')
+		self.assertEqual(json_object['progress'], 1.0)
+
+		response = client.get(f'/smarthexboard/{self.game_id}/update')
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(json.loads(response.content)['status'], 'Ready')
+		self.assertEqual(GameDataRepository.fetch(self.game_id).currentTurn, json_object['current_turn'])
+
+
 if __name__ == '__main__':
 	unittest.main()
@@ -5,7 +5,7 @@ import pytest
 from smarthexboard.smarthexboardlib.game.ai.militaryTypes import TacticalDominanceTerritoryType, TacticalDominanceType, \
 	TacticalTargetType
 from smarthexboard.smarthexboardlib.game.ai.tactics import TacticalAnalysisCell, TacticalDominanceZone, TacticalTarget, \
-	TacticalAnalysisMap
+	TacticalAnalysisMap, TacticalUnitIndex
 from smarthexboard.smarthexboardlib.game.baseTypes import HandicapType
 from smarthexboard.smarthexboardlib.game.cities import City
 from smarthexboard.smarthexboardlib.game.civilizations import LeaderType
@@ -702,6 +702,23 @@ class TestTacticalAnalysisMap(unittest.TestCase):
 
 		self.assertEqual(cell2.defenseModifier(), 0)
 
+	def test_unitIndex(self):
+		# given
+		playerTrajan = Player(LeaderType.trajan, human=False)
+		playerTrajan.initialize()
+
+		units = [Unit(HexPoint(x, y), UnitType.warrior, playerTrajan) for y in range(0, 20, 3) for x in range(0, 20, 2)]
+		unitIndex = TacticalUnitIndex(units, 5)
+
+		for location in [HexPoint(0, 0), HexPoint(7, 8), HexPoint(12, 13), HexPoint(19, 19)]:
+			for distance in [0, 2, 5]:
+				# when
+				unitsWithin = unitIndex.unitsWithin(location, distance)
+
+				# then
+				expected = [unit for unit in units if unit.location.distance(location) <= distance]
+				self.assertEqual(unitsWithin, expected)
+
 	def test_refreshFor_normal(self):
 		# given
 		mapModel = MapModelMock.duelMap()
@@ -189,6 +189,27 @@ class TestUnit(unittest.TestCase):
 		self.assertEqual(sightGalleyNormal, 2)
 		self.assertEqual(sightGalleySpyglass, 3)
 
+	def test_sight_is_balanced(self):
+		# GIVEN
+		scout = Unit(HexPoint(5, 5), UnitType.scout, self.playerTrajan)
+		self.simulation.addUnit(scout)
+		self.simulation.sightAt(scout.location, scout.sight(), scout, self.playerTrajan)
+		self.simulation.tileAt(HexPoint(8, 7)).sightBy(self.playerTrajan)
+
+		# WHEN
+		self.assertTrue(scout.doPromote(UnitPromotionType.ranger, self.simulation))
+		self.assertTrue(scout.doPromote(UnitPromotionType.sentry, self.simulation))
+		self.assertTrue(scout.doPromote(UnitPromotionType.spyglass, self.simulation))
+		sightedTiles = self.mapModel.numberOfVisibleTilesTo(self.playerTrajan)
+		for point in HexPoint(5, 5).areaWithRadius(1):
+			self.mapModel.tileAt(point).setFeature(FeatureType.mountains)
+		self.simulation.concealAt(scout.location, scout.sight(), scout, self.playerTrajan)
+
+		# THEN
+		self.assertGreater(sightedTiles, 1)
+		self.assertEqual(self.mapModel.numberOfVisibleTilesTo(self.playerTrajan), 1)
+		self.assertTrue(self.simulation.tileAt(HexPoint(8, 7)).isVisibleTo(self.playerTrajan))
+
 	def test_eq(self):
 		# GIVEN
 		scout = Unit(HexPoint(5, 5), UnitType.scout, self.playerTrajan)
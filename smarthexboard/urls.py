@@ -13,8 +13,12 @@ urlpatterns = [
     path('create', views.game_create, name='game_create'),
     path('<str:game_id>/create/status', views.game_create_status, name='game_create_status'),
     path('<str:game_id>/map', views.game_map, name='game_map'),
+    path('<str:game_id>/map/chunks', views.game_map_chunks, name='game_map_chunks'),
+    path('<str:game_id>/map/chunk/<int:chunk_x>/<int:chunk_y>', views.game_map_chunk, name='game_map_chunk'),
+    path('<str:game_id>/map/diff/<int:since_turn>', views.game_map_diff, name='game_map_diff'),
     path('<str:game_id>/info', views.game_info, name='game_info'),
     path('<str:game_id>/update', views.game_update, name='game_update'),
+    path('<str:game_id>/update/status', views.game_update_status, name='game_update_status'),
     path('<str:game_id>/turn', views.game_turn, name='game_turn'),
 
     # game action api
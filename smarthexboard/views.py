@@ -1,15 +1,20 @@
+import hashlib
+import json
 import random
+from datetime import timedelta
 from typing import Optional
 
-from django.core.cache import cache
+from django.db.models import Q
 from django.http import HttpResponse, JsonResponse
 from django.template import loader
+from django.utils import timezone
+from django.views.decorators.cache import cache_control, never_cache
 from django_q.tasks import async_task
 
-from setup.settings import DEBUG
+from setup.settings import DEBUG, Q_CLUSTER
 from smarthexboard.forms import CreateGameForm, UnitMoveForm, UnitActionForm, FoundCityForm, CityInfoForm
-from smarthexboard.models import GameGenerationData, GameGenerationState
-from smarthexboard.repositories import GameDataRepository
+from smarthexboard.models import GameGenerationState, GameTurnData
+from smarthexboard.repositories import GameDataRepository, GameGenerationRepository
 from smarthexboard.utils import parseUnitMapType, parseLocation, parseUnitType, is_integer
 from .smarthexboardlib.game.baseTypes import HandicapType
 from .smarthexboardlib.game.cities import City
@@ -19,7 +24,10 @@ from .smarthexboardlib.game.states.builds import BuildType
 from .smarthexboardlib.game.unitTypes import UnitType, UnitMapType
 from .smarthexboardlib.game.units import Unit
 from .smarthexboardlib.map.types import TerrainType, FeatureType, ResourceType, MapType, MapSize
-from .smarthexboardlib.serialisation.game import GameModelSchema
+
+
+# the ai turns of a game are processed again if the background task did not report progress for this time (in seconds)
+GAME_TURN_TIMEOUT = Q_CLUSTER['timeout']
 
 
 class InvalidMethodResponse(JsonResponse):
@@ -156,6 +164,7 @@ def game_create(request):
 			mapType: MapType = form.mapTypeValue()
 
 			print(f'generate_game({game_id}, {leader}, {handicap}, {mapSize}, {mapType})')
+			GameGenerationRepository.storeStatus(game_id, GameGenerationState.OPEN, 0.0)
 			# game_id, leader: LeaderType, handicap: HandicapType, mapSize: MapSize, mapType: MapType
 			async_task("smarthexboard.services.generate_game", game_id, leader, handicap, mapSize, mapType)
 
@@ -180,15 +189,20 @@ def game_create_status(request, game_id: str):
 		}
 		return JsonResponse(json_payload, status=400)
 
-	game_generation = GameGenerationData.objects.filter(id=game_id).first()
+	game_generation = GameGenerationRepository.fetchStatus(game_id)
 	if game_generation is None:
+		# the generation status is only kept for a while
+		if GameDataRepository.inCacheOrDB(game_id):
+			json_payload = {'game_id': game_id, 'status': GameGenerationState.READY.label, 'progress': 1.0}
+			return JsonResponse(json_payload, status=200)
+
 		json_payload = {'id': game_id, 'status': f'Cannot find game generation with id: {game_id}'}
 		return JsonResponse(json_payload, status=404)
 
 	json_payload = {
 		'game_id': game_id,
-		'status': GameGenerationState(game_generation.state).label,
-		'progress': game_generation.progress
+		'status': game_generation['state'].label,
+		'progress': game_generation['progress']
 	}
 	return JsonResponse(json_payload, status=200)
 
@@ -199,137 +213,321 @@ def game_map(request, game_id: str):
 		return JsonResponse(json_payload, status=400)
 
 	if not GameDataRepository.inCacheOrDB(game_id):
-		game_generation = GameGenerationData.objects.filter(id=game_id).first()
+		game_generation = GameGenerationRepository.fetchStatus(game_id)
 		if game_generation is None:
 			json_payload = {'game_id': game_id, 'status': f'Cannot find game generated with id: {game_id}'}
 			return JsonResponse(json_payload, status=404)
 
-		current_state = GameGenerationState(game_generation.state)
-		if current_state != GameGenerationState.READY:
-			json_payload = {'game_id': game_id, 'status': f'Game with {game_id} is not ready yet: {current_state}'}
-			return JsonResponse(json_payload, status=400)
-
-		game_str: str = game_generation.game
-		obj = GameModelSchema().loads(game_str)
-		GameDataRepository.store(game_id, obj)
+		current_state = game_generation['state']
+		json_payload = {'game_id': game_id, 'status': f'Game with {game_id} is not ready yet: {current_state}'}
+		return JsonResponse(json_payload, status=400)
 
-		GameGenerationData.objects.filter(id=game_id).delete()
-	else:
+	with GameDataRepository.lock(game_id):
 		obj = GameDataRepository.fetch(game_id)
 
-	map_dict = obj._map.to_dict(human=obj.humanPlayer())
+		map_dict = obj._map.to_dict(human=obj.humanPlayer())
 
-	# convert json string to dict
-	json_payload = map_dict
-	return JsonResponse(json_payload, status=200)
+		# convert json string to dict
+		json_payload = map_dict
+		return JsonResponse(json_payload, status=200)
 
 
-def game_info(request, game_id: str):
-	game = GameDataRepository.fetch(game_id)
+def _map_chunk_etag(chunk_dict: dict) -> str:
+	content = json.dumps(chunk_dict, separators=(',', ':'), sort_keys=True)
+	return '"' + hashlib.sha1(content.encode('utf-8')).hexdigest()[:20] + '"'
 
-	if game is None:
-		json_payload = {'game_id': game_id, 'status': f'Game with id {game_id} not found in db or cache.'}
+
+@never_cache
+def game_map_chunks(request, game_id: str):
+	"""
+		@param request: incoming request with the optional viewport in tiles: x, y, width, height
+		@param game_id: id of the game
+		@return: JsonResponse with the chunks of the map that intersect the viewport and their etags
+	"""
+	if not is_integer(game_id):
+		json_payload = {'id': game_id, 'status': 'Invalid request: not a valid game_id format'}
 		return JsonResponse(json_payload, status=400)
 
-	humanPlayer = game.humanPlayer()
-	human_dict = humanPlayer.to_dict(game)
-	otherPlayers = []
+	with GameDataRepository.lock(game_id):
+		game = GameDataRepository.fetch(game_id)
 
-	for loopPlayer in game.players:
-		if humanPlayer == loopPlayer:
-			continue
+		if game is None:
+			json_payload = {'game_id': game_id, 'status': f'Game with id {game_id} not found in db or cache.'}
+			return JsonResponse(json_payload, status=404)
 
-		if not loopPlayer.isAlive():
-			continue
+		mapModel = game._map
+		viewport = [request.GET.get(name, default) for name, default in
+		            [('x', 0), ('y', 0), ('width', mapModel.width), ('height', mapModel.height)]]
 
-		if loopPlayer.diplomacyAI.hasMetWith(humanPlayer):
-			otherPlayers.append(loopPlayer.to_dict())
+		if not all(is_integer(value) for value in viewport):
+			json_payload = {'game_id': game_id, 'status': 'Invalid request: not a valid viewport'}
+			return JsonResponse(json_payload, status=400)
 
-	# convert JSON string to dict
-	json_payload = {
-		'turn': game.currentTurn,
-		'turnYear': game.turnYear(),
-		'human': human_dict,
-		'others': otherPlayers
-	}
-	return JsonResponse(json_payload, status=200)
+		x, y, width, height = [int(float(value)) for value in viewport]
+		chunkCount = mapModel.chunkCount()
+		chunkSize = mapModel.chunkSize
+		humanPlayer = game.humanPlayer()
 
+		chunks = []
+		for chunkY in range(max(y // chunkSize, 0), min((y + height - 1) // chunkSize + 1, chunkCount.height())):
+			for chunkX in range(max(x // chunkSize, 0), min((x + width - 1) // chunkSize + 1, chunkCount.width())):
+				chunk_dict = mapModel.to_chunk_dict(chunkX, chunkY, human=humanPlayer)
+				chunks.append({'x': chunkX, 'y': chunkY, 'etag': _map_chunk_etag(chunk_dict)})
 
-def game_update(request, game_id: str):
-	game = GameDataRepository.fetch(game_id)
-	cache_key = f'game_updating_{game_id}'
+		json_payload = {
+			'width': mapModel.width,
+			'height': mapModel.height,
+			'chunkSize': chunkSize,
+			'chunks': chunks
+		}
+		return JsonResponse(json_payload, status=200)
 
-	if game is None:
-		json_payload = {'game_id': game_id, 'status': f'Game with id {game_id} not found in db or cache.'}
-		return JsonResponse(json_payload, status=400)
 
-	if cache.get(cache_key) is not None:
-		json_payload = {'game_id': game_id, 'status': f'Game with id {game_id} currently updating.'}
+@cache_control(private=True, no_cache=True)  # the client revalidates its copy with the etag
+def game_map_chunk(request, game_id: str, chunk_x: int, chunk_y: int):
+	"""
+		@param request: incoming request, answered with 304 if If-None-Match holds the etag of the chunk
+		@param game_id: id of the game
+		@param chunk_x: x index of the chunk
+		@param chunk_y: y index of the chunk
+		@return: JsonResponse with the tiles and units of the chunk (see MapModel.to_chunk_dict)
+	"""
+	if not is_integer(game_id):
+		json_payload = {'id': game_id, 'status': 'Invalid request: not a valid game_id format'}
 		return JsonResponse(json_payload, status=400)
 
-	game.userInterface = UserInterfaceImpl()
+	with GameDataRepository.lock(game_id):
+		game = GameDataRepository.fetch(game_id)
 
-	humanPlayer = game.humanPlayer()
+		if game is None:
+			json_payload = {'game_id': game_id, 'status': f'Game with id {game_id} not found in db or cache.'}
+			return JsonResponse(json_payload, status=404)
 
-	if humanPlayer.hasProcessedAutoMoves() and humanPlayer.turnFinished():
-		json_payload = {'game_id': game_id, 'status': f'Game turn for human is finished.'}
-		return JsonResponse(json_payload, status=400)
+		chunkCount = game._map.chunkCount()
+		if not (0 <= chunk_x < chunkCount.width() and 0 <= chunk_y < chunkCount.height()):
+			json_payload = {'game_id': game_id, 'status': f'Chunk {chunk_x}, {chunk_y} is not on the map.'}
+			return JsonResponse(json_payload, status=404)
 
-	cache.set(cache_key, True)
-	# print(f'start updating {game_id}')
-	game.update()
-	cache.delete(cache_key)
-	# print(f'stop updating {game_id}')
+		chunk_dict = game._map.to_chunk_dict(chunk_x, chunk_y, human=game.humanPlayer())
+		etag = _map_chunk_etag(chunk_dict)
 
-	currentPlayerName = ''
-	if game.activePlayer() is not None:
-		if game.activePlayer().isCityState():
-			currentPlayerName = f'PLAYER_CITYSTATE_{game.activePlayer().cityState.title().upper()}'
+		if request.headers.get('If-None-Match') == etag:
+			response = HttpResponse(status=304)
 		else:
-			currentPlayerName = f'PLAYER_{game.activePlayer().leader.name.upper()}'
+			response = JsonResponse(chunk_dict, status=200)
+
+		response['ETag'] = etag
+		return response
+
+
+@never_cache
+def game_map_diff(request, game_id: str, since_turn: int):
+	"""
+		@param request: incoming request
+		@param game_id: id of the game
+		@param since_turn: turn of the last map state the client knows
+		@return: JsonResponse with the tiles, units and cities visible to the human that changed since since_turn
+			or full: True if the changes are not known (the client needs to reload the map)
+	"""
+	if not is_integer(game_id):
+		json_payload = {'id': game_id, 'status': 'Invalid request: not a valid game_id format'}
+		return JsonResponse(json_payload, status=400)
+
+	with GameDataRepository.lock(game_id):
+		game = GameDataRepository.fetch(game_id)
+
+		if game is None:
+			json_payload = {'game_id': game_id, 'status': f'Game with id {game_id} not found in db or cache.'}
+			return JsonResponse(json_payload, status=404)
+
+		points = game.mapChangeLog.changedSince(since_turn)
+
+		if points is None:
+			json_payload = {'game_id': game_id, 'turn': game.currentTurn, 'full': True}
+			return JsonResponse(json_payload, status=200)
+
+		json_payload = game._map.to_diff_dict(points, human=game.humanPlayer())
+		json_payload['game_id'] = game_id
+		json_payload['turn'] = game.currentTurn
+		json_payload['full'] = False
+		return JsonResponse(json_payload, status=200)
+
+
+def game_info(request, game_id: str):
+	with GameDataRepository.lock(game_id):
+		game = GameDataRepository.fetch(game_id)
+
+		if game is None:
+			json_payload = {'game_id': game_id, 'status': f'Game with id {game_id} not found in db or cache.'}
+			return JsonResponse(json_payload, status=400)
+
+		humanPlayer = game.humanPlayer()
+		human_dict = humanPlayer.to_dict(game)
+		otherPlayers = []
+
+		for loopPlayer in game.players:
+			if humanPlayer == loopPlayer:
+				continue
+
+			if not loopPlayer.isAlive():
+				continue
 
-	GameDataRepository.store(game_id, game)
+			if loopPlayer.diplomacyAI.hasMetWith(humanPlayer):
+				otherPlayers.append(loopPlayer.to_dict())
 
+		# convert JSON string to dict
+		json_payload = {
+			'turn': game.currentTurn,
+			'turnYear': game.turnYear(),
+			'human': human_dict,
+			'others': otherPlayers
+		}
+		return JsonResponse(json_payload, status=200)
+
+
+def _game_update_payload(game_id: str, game_turn: GameTurnData) -> dict:
+	return {
+		'game_id': game_id,
+		'status': GameGenerationState(game_turn.state).label,
+		'player': game_turn.player,
+		'phase': game_turn.phase,
+		'progress': game_turn.progress,
+		'current_turn': game_turn.current_turn,
+		'current_player': game_turn.current_player,
+		'human_active': game_turn.human_active if game_turn.state == GameGenerationState.READY else False
+	}
+
+
+def _game_turn_running(game_id: str) -> bool:
+	"""the ai turns of the game are processed by the background task - the game must not be changed meanwhile"""
+	stale_time = timezone.now() - timedelta(seconds=GAME_TURN_TIMEOUT)
+	return GameTurnData.objects\
+		.filter(id=game_id, state=GameGenerationState.RUNNING, updated_at__gt=stale_time)\
+		.exists()
+
+
+def _game_turn_running_response(game_id: str, status: str) -> JsonResponse:
 	json_payload = {
 		'game_id': game_id,
-		'current_turn': game.currentTurn,
-		'current_player': currentPlayerName,
-		'human_active': humanPlayer.turnActive
-		# notifications to human?
+		'status': status,
+		'errors': [f'Game with id {game_id} currently updating.']
 	}
-	return JsonResponse(json_payload, status=200)
+	return JsonResponse(json_payload, status=400)
 
 
-def game_turn(request, game_id: str):
-	game = GameDataRepository.fetch(game_id)
+@never_cache
+def game_update(request, game_id: str):
+	"""
+		starts the background processing of the AI turns or reports its progress / result
 
-	if game is None:
-		json_payload = {'game_id': game_id, 'status': f'Game with {game_id} not found in db or cache.'}
+		@param request: incoming request
+		@param game_id: id of the game
+		@return: JsonResponse with:
+			200: the progress of the running processing or the result of the finished processing
+			202: when the processing was started
+			400: when the game was not found or the human needs to end the turn
+	"""
+	if not is_integer(game_id):
+		json_payload = {'id': game_id, 'status': 'Invalid request: not a valid game_id format'}
 		return JsonResponse(json_payload, status=400)
 
-	game.userInterface = UserInterfaceImpl()
+	game_turn = GameTurnData.objects.filter(id=game_id).first()
+	stale_time = timezone.now() - timedelta(seconds=GAME_TURN_TIMEOUT)
+
+	if game_turn is not None and game_turn.state == GameGenerationState.RUNNING and game_turn.updated_at > stale_time:
+		return JsonResponse(_game_update_payload(game_id, game_turn), status=200)
+
+	with GameDataRepository.lock(game_id):
+		if game_turn is not None and game_turn.state == GameGenerationState.READY:
+			# the result is reported once - the background task wrote the game to the database
+			GameTurnData.objects.filter(id=game_id, state=GameGenerationState.READY)\
+				.update(state=GameGenerationState.OPEN)
+
+			return JsonResponse(_game_update_payload(game_id, game_turn), status=200)
 
-	humanPlayer = game.humanPlayer()
+		game = GameDataRepository.fetch(game_id)
 
-	if humanPlayer.hasProcessedAutoMoves() and humanPlayer.turnFinished():
-		json_payload = {'game_id': game_id, 'status': f'Game turn for human is finished.'}
+		if game is None:
+			json_payload = {'game_id': game_id, 'status': f'Game with id {game_id} not found in db or cache.'}
+			return JsonResponse(json_payload, status=400)
+
+		humanPlayer = game.humanPlayer()
+
+		if humanPlayer.hasProcessedAutoMoves() and humanPlayer.turnFinished():
+			json_payload = {'game_id': game_id, 'status': 'Game turn for human is finished.'}
+			return JsonResponse(json_payload, status=400)
+
+		# atomic: only one request can move the turn data to running
+		GameTurnData.objects.get_or_create(id=game_id)
+		started = GameTurnData.objects.filter(id=game_id)\
+			.filter(~Q(state=GameGenerationState.RUNNING) | Q(updated_at__lte=stale_time))\
+			.update(state=GameGenerationState.RUNNING, player='', phase='', progress=0.0, current_turn=game.currentTurn,
+			        human_active=False, updated_at=timezone.now())
+
+		if started == 0:
+			json_payload = {'game_id': game_id, 'status': f'Game with id {game_id} currently updating.'}
+			return JsonResponse(json_payload, status=400)
+
+		# the background task loads the game from the database - this process must not keep (and change) its copy
+		GameDataRepository.release(game_id)
+		async_task("smarthexboard.services.update_game", game_id)
+
+	return JsonResponse(_game_update_payload(game_id, GameTurnData.objects.get(id=game_id)), status=202)
+
+
+@never_cache
+def game_update_status(request, game_id: str):
+	"""
+		@param request: incoming request
+		@param game_id: id of the game
+		@return: JsonResponse with the progress of the background processing of the AI turns (player, phase, progress)
+	"""
+	if not is_integer(game_id):
+		json_payload = {'id': game_id, 'status': 'Invalid request: not a valid game_id format'}
 		return JsonResponse(json_payload, status=400)
 
-	if humanPlayer.isTurnActive():
-		humanPlayer.setProcessedAutoMovesTo(True)
-		humanPlayer.setEndTurnTo(True, game)
-		humanPlayer.finishTurn()
-	else:
-		raise Exception('unknown')
+	game_turn = GameTurnData.objects.filter(id=game_id).first()
+	if game_turn is None:
+		json_payload = {'game_id': game_id, 'status': f'Cannot find game update with id: {game_id}'}
+		return JsonResponse(json_payload, status=404)
 
-	GameDataRepository.store(game_id, game)
+	return JsonResponse(_game_update_payload(game_id, game_turn), status=200)
 
-	json_payload = {
-		'game_id': game_id,
-		'current_turn': game.currentTurn
-		# notifications to human?
-	}
-	return JsonResponse(json_payload, status=200)
+
+def game_turn(request, game_id: str):
+	with GameDataRepository.lock(game_id):
+		if _game_turn_running(game_id):
+			return _game_turn_running_response(game_id, 'Cannot finish turn.')
+
+		game = GameDataRepository.fetch(game_id)
+
+		if game is None:
+			json_payload = {'game_id': game_id, 'status': f'Game with {game_id} not found in db or cache.'}
+			return JsonResponse(json_payload, status=400)
+
+		game.userInterface = UserInterfaceImpl(game.mapChangeLog)
+
+		humanPlayer = game.humanPlayer()
+
+		if humanPlayer.hasProcessedAutoMoves() and humanPlayer.turnFinished():
+			json_payload = {'game_id': game_id, 'status': 'Game turn for human is finished.'}
+			return JsonResponse(json_payload, status=400)
+
+		if humanPlayer.isTurnActive():
+			humanPlayer.setProcessedAutoMovesTo(True)
+			humanPlayer.setEndTurnTo(True, game)
+			humanPlayer.finishTurn()
+		else:
+			raise Exception('unknown')
+
+		GameDataRepository.store(game_id, game)
+
+		json_payload = {
+			'game_id': game_id,
+			'current_turn': game.currentTurn
+			# notifications to human?
+		}
+		return JsonResponse(json_payload, status=200)
 
 
 def game_move_unit(request):
@@ -358,92 +556,96 @@ def game_move_unit(request):
 				}
 				return JsonResponse(json_payload, status=404)
 
-			game = GameDataRepository.fetch(game_id)
-
-			game.userInterface = UserInterfaceImpl()
-
-			humanPlayer = game.humanPlayer()
+			with GameDataRepository.lock(game_id):
+				if _game_turn_running(game_id):
+					return _game_turn_running_response(game_id, 'Cannot move unit.')
+
+				game = GameDataRepository.fetch(game_id)
+
+				game.userInterface = UserInterfaceImpl(game.mapChangeLog)
+
+				humanPlayer = game.humanPlayer()
+
+				if humanPlayer is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot move unit.',
+						'errors': ['Cannot find human player in game.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				unit_type: str = form.cleaned_data['unit_type']
+				old_location: str = form.cleaned_data['old_location']
+				new_location: str =form.cleaned_data['new_location']
+
+				unit_map_type = parseUnitMapType(unit_type)
+				old_loc = parseLocation(old_location)
+				new_loc = parseLocation(new_location)
+
+				print(f'try to move {unit_map_type} unit from: {old_loc} to {new_loc}')
+
+				if unit_map_type is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot move unit.',
+						'errors': [f'Could not parse unit map type from {unit_type}.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				if old_loc is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot move unit.',
+						'errors': [f'Could not parse location from {old_location}.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				if new_loc is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot move unit.',
+						'errors': [f'Could not parse location from {new_location}.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				unit: Optional[Unit] = game.unitAt(location=old_loc, unitMapType=unit_map_type)
+				# print(f'unit: {unit}')
+
+				if unit is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot move unit.',
+						'errors': [f'Could find {unit_map_type} unit at {old_loc}.']}
+					return JsonResponse(json_payload, status=404)
+
+				if unit.player != humanPlayer:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot move unit.',
+						'errors': [f'Cannot move units from another player. The unit you are trying to move is from {unit.player.name()}.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				# move the unit
+				ret: bool = unit.doMoveOnto(new_loc, game)
+
+				if not ret:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot move unit.',
+						'errors': [f'Unit {unit} could not be moved from {old_loc} to {new_loc}.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				GameDataRepository.store(game_id, game)
 
-			if humanPlayer is None:
 				json_payload = {
 					'game_id': game_id,
-					'status': 'Cannot move unit.',
-					'errors': ['Cannot find human player in game.']
+					'current_turn': game.currentTurn,
+					'moves': unit.movesLeft(),
+					# notifications to human?
 				}
-				return JsonResponse(json_payload, status=400)
-
-			unit_type: str = form.cleaned_data['unit_type']
-			old_location: str = form.cleaned_data['old_location']
-			new_location: str =form.cleaned_data['new_location']
-
-			unit_map_type = parseUnitMapType(unit_type)
-			old_loc = parseLocation(old_location)
-			new_loc = parseLocation(new_location)
-
-			print(f'try to move {unit_map_type} unit from: {old_loc} to {new_loc}')
-
-			if unit_map_type is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot move unit.',
-					'errors': [f'Could not parse unit map type from {unit_type}.']
-				}
-				return JsonResponse(json_payload, status=400)
-
-			if old_loc is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot move unit.',
-					'errors': [f'Could not parse location from {old_location}.']
-				}
-				return JsonResponse(json_payload, status=400)
-
-			if new_loc is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot move unit.',
-					'errors': [f'Could not parse location from {new_location}.']
-				}
-				return JsonResponse(json_payload, status=400)
-
-			unit: Optional[Unit] = game.unitAt(location=old_loc, unitMapType=unit_map_type)
-			# print(f'unit: {unit}')
-
-			if unit is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot move unit.',
-					'errors': [f'Could find {unit_map_type} unit at {old_loc}.']}
-				return JsonResponse(json_payload, status=404)
-
-			if unit.player != humanPlayer:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot move unit.',
-					'errors': [f'Cannot move units from another player. The unit you are trying to move is from {unit.player.name()}.']
-				}
-				return JsonResponse(json_payload, status=400)
-
-			# move the unit
-			ret: bool = unit.doMoveOnto(new_loc, game)
-
-			if not ret:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot move unit.',
-					'errors': [f'Unit {unit} could not be moved from {old_loc} to {new_loc}.']
-				}
-				return JsonResponse(json_payload, status=400)
-
-			GameDataRepository.store(game_id, game)
-
-			json_payload = {
-				'game_id': game_id,
-				'current_turn': game.currentTurn,
-				'moves': unit.movesLeft(),
-				# notifications to human?
-			}
-			return JsonResponse(json_payload, status=200)
+				return JsonResponse(json_payload, status=200)
 		else:
 			json_payload = {
 				'status': 'Form not valid',
@@ -477,86 +679,87 @@ def game_actions(request):
 				}
 				return JsonResponse(json_payload, status=404)
 
-			game = GameDataRepository.fetch(game_id)
-
-			game.userInterface = UserInterfaceImpl()
-
-			humanPlayer = game.humanPlayer()
-
-			if humanPlayer is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot get unit actions.',
-					'errors': ['Cannot find human player in game.']
-				}
-				return JsonResponse(json_payload, status=400)
+			with GameDataRepository.lock(game_id):
+				game = GameDataRepository.fetch(game_id)
+
+				game.userInterface = UserInterfaceImpl(game.mapChangeLog)
+
+				humanPlayer = game.humanPlayer()
+
+				if humanPlayer is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot get unit actions.',
+						'errors': ['Cannot find human player in game.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				unit_type_str: str = form.cleaned_data['unit_type']
+				location_str: str = form.cleaned_data['location']
+
+				unit_type: UnitType = parseUnitType(unit_type_str)
+				unit_map_type: UnitMapType = unit_type.unitMapType()
+				location = parseLocation(location_str)
+
+				# print(f'try get unit actions {unit_type} unit at: {location}')
+
+				if location is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot get unit actions.',
+						'errors': [f'Could not parse location from {location_str}.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				unit: Optional[Unit] = game.unitAt(location=location, unitMapType=unit_map_type)
+
+				if unit is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot move unit.',
+						'errors': [f'Could find {unit_map_type} unit at {location}.']}
+					return JsonResponse(json_payload, status=404)
+
+				action_list = list()
+
+				# if unit.canMove():
+				#	action_list.append('ACTION_MOVE')
+				if unit.canHeal(game):
+					action_list.append('ACTION_HEAL')
+				if unit.canFoundAt(location, game):
+					action_list.append('ACTION_FOUND_CITY')
+				if unit.canAttack():
+					action_list.append('ACTION_ATTACK')
+				if unit.canAttackRanged():
+					action_list.append('ACTION_ATTACK_RANGED')
+				if unit.canPillageAt(location, game):
+					action_list.append('ACTION_PILLAGE')
+
+				for build in list(BuildType):
+					if unit.canBuild(build, location, True, True, game):
+						action_list.append(f'ACTION_BUILD_{build.name().upper()}')
+						break
 
-			unit_type_str: str = form.cleaned_data['unit_type']
-			location_str: str = form.cleaned_data['location']
+				if unit.canEverEmbark():
+					for embark_location in location.neighbors():
+						if unit.canEmbarkInto(embark_location, game):
+							action_list.append('ACTION_EMBARK')
+							break
 
-			unit_type: UnitType = parseUnitType(unit_type_str)
-			unit_map_type: UnitMapType = unit_type.unitMapType()
-			location = parseLocation(location_str)
+				if len(unit.gainedPromotions()) > 0:
+					action_list.append('ACTION_PROMOTE')
 
-			# print(f'try get unit actions {unit_type} unit at: {location}')
+				action_list.append('ACTION_SKIP')
+				action_list.append('ACTION_SLEEP')
+				action_list.append('ACTION_DISBAND')
 
-			if location is None:
 				json_payload = {
 					'game_id': game_id,
-					'status': 'Cannot get unit actions.',
-					'errors': [f'Could not parse location from {location_str}.']
+					'current_turn': game.currentTurn,
+					'action_list': action_list
+					# notifications to human?
 				}
-				return JsonResponse(json_payload, status=400)
-
-			unit: Optional[Unit] = game.unitAt(location=location, unitMapType=unit_map_type)
-
-			if unit is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot move unit.',
-					'errors': [f'Could find {unit_map_type} unit at {location}.']}
-				return JsonResponse(json_payload, status=404)
-
-			action_list = list()
-
-			# if unit.canMove():
-			#	action_list.append('ACTION_MOVE')
-			if unit.canHeal(game):
-				action_list.append('ACTION_HEAL')
-			if unit.canFoundAt(location, game):
-				action_list.append('ACTION_FOUND_CITY')
-			if unit.canAttack():
-				action_list.append('ACTION_ATTACK')
-			if unit.canAttackRanged():
-				action_list.append('ACTION_ATTACK_RANGED')
-			if unit.canPillageAt(location, game):
-				action_list.append('ACTION_PILLAGE')
-
-			for build in list(BuildType):
-				if unit.canBuild(build, location, True, True, game):
-					action_list.append(f'ACTION_BUILD_{build.name().upper()}')
-					break
-
-			if unit.canEverEmbark():
-				for embark_location in location.neighbors():
-					if unit.canEmbarkInto(embark_location, game):
-						action_list.append('ACTION_EMBARK')
-						break
-
-			if len(unit.gainedPromotions()) > 0:
-				action_list.append('ACTION_PROMOTE')
-
-			action_list.append('ACTION_SKIP')
-			action_list.append('ACTION_SLEEP')
-			action_list.append('ACTION_DISBAND')
-
-			json_payload = {
-				'game_id': game_id,
-				'current_turn': game.currentTurn,
-				'action_list': action_list
-				# notifications to human?
-			}
-			return JsonResponse(json_payload, status=200)
+				return JsonResponse(json_payload, status=200)
 		else:
 			json_payload = {
 				'status': 'Form not valid',
@@ -590,68 +793,72 @@ def game_found_city(request):
 				}
 				return JsonResponse(json_payload, status=404)
 
-			game = GameDataRepository.fetch(game_id)
+			with GameDataRepository.lock(game_id):
+				if _game_turn_running(game_id):
+					return _game_turn_running_response(game_id, 'Cannot found city.')
 
-			game.userInterface = UserInterfaceImpl()
+				game = GameDataRepository.fetch(game_id)
 
-			humanPlayer = game.humanPlayer()
+				game.userInterface = UserInterfaceImpl(game.mapChangeLog)
 
-			if humanPlayer is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot get unit actions.',
-					'errors': ['Cannot find human player in game.']
-				}
-				return JsonResponse(json_payload, status=400)
+				humanPlayer = game.humanPlayer()
 
-			# unit_type_str: str = form.cleaned_data['unit_type']
-			location_str: str = form.cleaned_data['location']
-			city_name: str = form.cleaned_data['city_name']
+				if humanPlayer is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot get unit actions.',
+						'errors': ['Cannot find human player in game.']
+					}
+					return JsonResponse(json_payload, status=400)
 
-			# unit_type: UnitType = UnitType. # parseUnitType(unit_type_str)
-			unit_map_type: UnitMapType = UnitMapType.civilian  # unit_type.unitMapType()
-			location = parseLocation(location_str)
+				# unit_type_str: str = form.cleaned_data['unit_type']
+				location_str: str = form.cleaned_data['location']
+				city_name: str = form.cleaned_data['city_name']
 
-			# print(f'try to get unit actions {unit_type} unit at: {location}')
+				# unit_type: UnitType = UnitType. # parseUnitType(unit_type_str)
+				unit_map_type: UnitMapType = UnitMapType.civilian  # unit_type.unitMapType()
+				location = parseLocation(location_str)
 
-			if location is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot found city.',
-					'errors': [f'Could not parse location from {location_str}.']
-				}
-				return JsonResponse(json_payload, status=400)
+				# print(f'try to get unit actions {unit_type} unit at: {location}')
 
-			unit: Optional[Unit] = game.unitAt(location=location, unitMapType=unit_map_type)
+				if location is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot found city.',
+						'errors': [f'Could not parse location from {location_str}.']
+					}
+					return JsonResponse(json_payload, status=400)
 
-			if unit is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot found city.',
-					'errors': [f'Could find {unit_map_type} unit at {location}.']}
-				return JsonResponse(json_payload, status=404)
+				unit: Optional[Unit] = game.unitAt(location=location, unitMapType=unit_map_type)
 
-			if not unit.canFoundAt(location, game):
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot found city.',
-					'errors': [f'Unit {unit} cannot found city at {location}.']
-				}
-				return JsonResponse(json_payload, status=400)
+				if unit is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot found city.',
+						'errors': [f'Could find {unit_map_type} unit at {location}.']}
+					return JsonResponse(json_payload, status=404)
 
-			print(f'INFO: Found city "{city_name}" at {location}.')
-			found = unit.doFoundWith(city_name, game)
+				if not unit.canFoundAt(location, game):
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot found city.',
+						'errors': [f'Unit {unit} cannot found city at {location}.']
+					}
+					return JsonResponse(json_payload, status=400)
 
-			GameDataRepository.store(game_id, game)
+				print(f'INFO: Found city "{city_name}" at {location}.')
+				found = unit.doFoundWith(city_name, game)
 
-			json_payload = {
-				'game_id': game_id,
-				'current_turn': game.currentTurn,
-				'player': unit.player.identifier(),
-				'found': found
-				# notifications to human?
-			}
-			return JsonResponse(json_payload, status=200)
+				GameDataRepository.store(game_id, game)
+
+				json_payload = {
+					'game_id': game_id,
+					'current_turn': game.currentTurn,
+					'player': unit.player.identifier(),
+					'found': found
+					# notifications to human?
+				}
+				return JsonResponse(json_payload, status=200)
 		else:
 			json_payload = {
 				'status': 'Form not valid',
@@ -685,57 +892,58 @@ def game_city_info(request):
 				}
 				return JsonResponse(json_payload, status=404)
 
-			game = GameDataRepository.fetch(game_id)
-
-			game.userInterface = UserInterfaceImpl()
-
-			humanPlayer = game.humanPlayer()
-
-			if humanPlayer is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot find city info.',
-					'errors': ['Cannot find human player in game.']
-				}
-				return JsonResponse(json_payload, status=400)
-
-			location_str: str = form.cleaned_data['location']
-			location = parseLocation(location_str)
-
-			# print(f'try to get unit actions {unit_type} unit at: {location}')
-
-			if location is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot find city info.',
-					'errors': [f'Could not parse location from {location_str}.']
-				}
-				return JsonResponse(json_payload, status=400)
-
-			city: Optional[City] = game.cityAt(location=location)
-			if city is None:
-				json_payload = {
-					'game_id': game_id,
-					'status': 'Cannot find city info.',
-					'errors': [f'Could not find city at {location}.']
-				}
-				return JsonResponse(json_payload, status=404)
+			with GameDataRepository.lock(game_id):
+				game = GameDataRepository.fetch(game_id)
+
+				game.userInterface = UserInterfaceImpl(game.mapChangeLog)
+
+				humanPlayer = game.humanPlayer()
+
+				if humanPlayer is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot find city info.',
+						'errors': ['Cannot find human player in game.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				location_str: str = form.cleaned_data['location']
+				location = parseLocation(location_str)
+
+				# print(f'try to get unit actions {unit_type} unit at: {location}')
+
+				if location is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot find city info.',
+						'errors': [f'Could not parse location from {location_str}.']
+					}
+					return JsonResponse(json_payload, status=400)
+
+				city: Optional[City] = game.cityAt(location=location)
+				if city is None:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot find city info.',
+						'errors': [f'Could not find city at {location}.']
+					}
+					return JsonResponse(json_payload, status=404)
+
+				if city.player != humanPlayer:
+					json_payload = {
+						'game_id': game_id,
+						'status': 'Cannot find city info.',
+						'errors': [f'City {city} is not owned by human player.']
+					}
+					return JsonResponse(json_payload, status=400)
 
-			if city.player != humanPlayer:
 				json_payload = {
 					'game_id': game_id,
-					'status': 'Cannot find city info.',
-					'errors': [f'City {city} is not owned by human player.']
+					'current_turn': game.currentTurn,
+					'player': city.player.identifier(),
+					'info': city.infoDict(game),
 				}
-				return JsonResponse(json_payload, status=400)
-
-			json_payload = {
-				'game_id': game_id,
-				'current_turn': game.currentTurn,
-				'player': city.player.identifier(),
-				'info': city.infoDict(game),
-			}
-			return JsonResponse(json_payload, status=200)
+				return JsonResponse(json_payload, status=200)
 		else:
 			json_payload = {
 				'status': 'Form not valid',